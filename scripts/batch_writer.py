@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+scripts/batch_writer.py
+
+Etapa de escritura de archivos por lotes. Crea el directorio de salida una
+sola vez, resuelve los nombres repetidos dentro de una misma corrida con un
+sufijo del hash del contenido (dos vacantes distintas con el mismo
+cargo_empresa_fecha.yaml ya no se sobrescriben) y escribe en segundo plano con
+un pool de hilos, cada archivo en un temporal que luego se renombra de forma
+atómica (nunca queda un YAML a medio escribir).
+
+Los archivos de corridas anteriores con el mismo nombre se reemplazan, como
+antes: el sufijo solo se agrega cuando el nombre ya se usó en esta corrida
+con un contenido distinto. Un contenido idéntico a uno ya escrito con el
+mismo nombre no se vuelve a escribir.
+
+Uso:
+  with BatchWriter('vacantes_yaml') as writer:
+      path = writer.submit('data_analyst_acme_2025-01-01.yaml', contenido)
+  writer.stats   # {'written': 10, 'renamed': 1, 'duplicates': 0}
+"""
+import hashlib
+import os
+import uuid
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Optional
+
+DEFAULT_WRITER_WORKERS = 4
+
+# Escrituras en curso por hilo antes de esperar a las más antiguas (acota la memoria)
+MAX_PENDING_PER_WORKER = 64
+
+# Caracteres del hash usados como sufijo en nombres repetidos
+SUFFIX_LENGTH = 8
+
+
+def content_digest(data: bytes) -> str:
+    """Hash del contenido de un archivo."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def atomic_write(path: Path, data: bytes):
+    """Escribe en un temporal del mismo directorio y lo renombra sobre path."""
+    # Nombre corto: el del destino puede estar cerca del límite de largo
+    tmp_path = path.with_name(f'.{uuid.uuid4().hex}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class InlineExecutor(Executor):
+    """Executor que ejecuta cada tarea al enviarla, en el hilo que llama (workers=0)."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class BatchWriter:
+    """Escritor en segundo plano con nombres sin colisiones y renombrado atómico."""
+
+    def __init__(self, output_dir, workers: int = DEFAULT_WRITER_WORKERS, encoding: str = 'utf-8'):
+        """
+        Args:
+            output_dir: Directorio de salida (se crea una vez)
+            workers: Hilos de escritura
+            encoding: Codificación de los archivos
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.encoding = encoding
+        self.stats = {'written': 0, 'renamed': 0, 'duplicates': 0}
+        self._claimed: Dict[str, str] = {}
+        self._pending: Deque[Future] = deque()
+        self._max_pending = max(1, workers) * MAX_PENDING_PER_WORKER
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='writer')
+
+    def resolve(self, filename: str, digest: str) -> Optional[str]:
+        """
+        Nombre final para un contenido, reservándolo para esta corrida.
+
+        Returns:
+            El nombre (con sufijo de hash si ya estaba tomado por otro
+            contenido) o None si ese mismo contenido ya se escribió con él
+        """
+        stem, ext = os.path.splitext(filename)
+        for candidate in (filename, f'{stem}_{digest[:SUFFIX_LENGTH]}{ext}', f'{stem}_{digest}{ext}'):
+            claimed = self._claimed.get(candidate)
+            if claimed is None:
+                self._claimed[candidate] = digest
+                if candidate != filename:
+                    self.stats['renamed'] += 1
+                return candidate
+            if claimed == digest:
+                return None
+        raise FileExistsError(f'No se pudo resolver un nombre libre para {filename}')
+
+    def submit(self, filename: str, content: str) -> Optional[Path]:
+        """
+        Encola la escritura de un archivo.
+
+        Args:
+            filename: Nombre deseado dentro de output_dir
+            content: Contenido del archivo
+
+        Returns:
+            Ruta final, o None si es un duplicado idéntico de un archivo ya encolado
+        """
+        data = content.encode(self.encoding)
+        name = self.resolve(filename, content_digest(data))
+        if name is None:
+            self.stats['duplicates'] += 1
+            return None
+        path = self.output_dir / name
+        if len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._executor.submit(atomic_write, path, data))
+        self.stats['written'] += 1
+        return path
+
+    def close(self):
+        """Espera las escrituras pendientes; propaga el primer error."""
+        error = None
+        while self._pending:
+            try:
+                self._pending.popleft().result()
+            except Exception as e:
+                error = error or e
+        self._executor.shutdown(wait=True)
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> 'BatchWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_extraction.py
+
+Benchmark de rendimiento de los extractores de vacantes sobre corpus
+sintéticos estilo LinkedIn.
+
+Los corpus se generan a partir de plantillas sembradas con los archivos de
+vacantes_yaml/ (cargos, empresas, ubicaciones, líneas de descripción y de
+requerimientos) e incluyen el ruido típico de un pegado desde LinkedIn:
+líneas de interfaz ("Easy Apply", "Show more", "Over 100 applicants"),
+viñetas y listas numeradas, etiquetas en español e inglés y mojibake
+(texto UTF-8 leído como Latin-1, p. ej. 'BogotÃ¡').
+
+Extractores medidos:
+  - extractor:  VacancyExtractor (texto plano -> YAML)
+  - split:      split_vacantes_to_yaml.split_vacantes (texto plano -> YAML)
+  - processor:  VacancyProcessor.process_all (bloques YAML -> YAML validados)
+  - ml:         MLVacancyExtractor (--extractor ml; requiere un modelo
+                entrenado en --model-dir, no se mide por defecto)
+
+Cada medición corre en un proceso nuevo para que el pico de memoria (RSS)
+sea el de ese extractor y ese tamaño. Se reportan bloques/seg, MB/seg, pico
+de RSS y el tiempo de cada etapa; los resultados se guardan en JSON para
+compararlos entre commits.
+
+Uso:
+  python scripts/benchmark_extraction.py
+  python scripts/benchmark_extraction.py --sizes 1000 10000 --extractors extractor split
+  python scripts/benchmark_extraction.py --output benchmarks/nuevo.json --compare benchmarks/anterior.json
+  python scripts/benchmark_extraction.py --sizes 1000 --extractors extractor ml --model-dir models
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+EXTRACTORS = ['extractor', 'split', 'processor', 'ml']
+DEFAULT_EXTRACTORS = ['extractor', 'split', 'processor']
+DEFAULT_MODEL_DIR = 'models'
+
+# Líneas de interfaz de LinkedIn que aparecen al copiar una vacante
+LINKEDIN_BOILERPLATE = [
+    'Easy Apply',
+    'Save',
+    'Show more',
+    'Show less',
+    'Apply',
+    'Promoted',
+    'Actively recruiting',
+    'Over 100 applicants',
+    'Responses managed off LinkedIn',
+    'See how you compare to over 100 other applicants. Try Premium for $0',
+    'Meet the hiring team',
+    'Job poster',
+    'About the company',
+]
+
+LABELS = {
+    'es': {'cargo': 'Cargo', 'empresa': 'Empresa', 'fecha': 'Fecha', 'modalidad': 'Modalidad',
+           'descripcion': 'Descripción', 'requerimientos': 'Requerimientos'},
+    'en': {'cargo': 'Position', 'empresa': 'Company', 'fecha': 'Date', 'modalidad': 'Work mode',
+           'descripcion': 'Job Description', 'requerimientos': 'Requirements'},
+}
+
+# Cargos/empresas/ubicaciones más largos se descartan como semilla
+MAX_SEED_VALUE_LENGTH = 80
+
+MODALIDADES = ['Remoto', 'Remote', 'Híbrido', 'Hybrid', 'Presencial', 'On-site']
+
+# Semillas mínimas si vacantes_yaml/ no existe o no se puede leer
+FALLBACK_SEEDS = {
+    'cargo': ['Data Analyst', 'Analista de Datos', 'Power BI Developer', 'Business Analyst'],
+    'empresa': ['TechCorp Solutions', 'DataMind Inc', 'Globant', 'Empresa Confidencial'],
+    'ubicacion': ['Bogotá, Colombia', 'Medellín, Antioquia, Colombia', 'Remote'],
+    'descripcion': ['Buscamos un profesional con experiencia en análisis de datos.',
+                    'You will work with stakeholders to build dashboards and reports.'],
+    'requerimientos': ['Experiencia con SQL y Python', '3+ years of experience with Power BI',
+                       'Inglés intermedio o avanzado', 'Strong communication skills'],
+}
+
+
+def _as_lines(value) -> List[str]:
+    """Convierte un valor YAML (texto o lista) en líneas no vacías sin viñetas."""
+    if isinstance(value, list):
+        items = [v for v in value if isinstance(v, str)]
+    elif isinstance(value, str):
+        items = value.splitlines()
+    else:
+        return []
+    return [item.strip().lstrip('-•* ').strip() for item in items if item and item.strip()]
+
+
+def load_seeds(yaml_dir: Path) -> Dict[str, List[str]]:
+    """
+    Carga los valores semilla desde los YAML de vacantes.
+
+    Args:
+        yaml_dir: Directorio con archivos .yaml
+
+    Returns:
+        Diccionario campo -> lista de valores
+    """
+    seeds = {key: [] for key in FALLBACK_SEEDS}
+    for path in sorted(Path(yaml_dir).glob('*.yaml')):
+        try:
+            data = yaml.safe_load(path.read_text(encoding='utf-8'))
+        except (yaml.YAMLError, UnicodeDecodeError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        for key in ('cargo', 'empresa', 'ubicacion'):
+            value = data.get(key)
+            if isinstance(value, str) and 0 < len(value.strip()) <= MAX_SEED_VALUE_LENGTH:
+                seeds[key].append(value.strip())
+        seeds['descripcion'].extend(line for line in _as_lines(data.get('descripcion')) if len(line) > 20)
+        seeds['requerimientos'].extend(_as_lines(data.get('requerimientos')))
+    for key, values in FALLBACK_SEEDS.items():
+        if not seeds[key]:
+            seeds[key] = list(values)
+    return seeds
+
+
+def mojibake(text: str) -> str:
+    """Simula texto UTF-8 decodificado como Latin-1 ('Bogotá' -> 'BogotÃ¡')."""
+    return text.encode('utf-8').decode('latin-1')
+
+
+class CorpusGenerator:
+    """Genera vacantes sintéticas reproducibles a partir de las semillas."""
+
+    def __init__(self, seeds: Dict[str, List[str]], seed: int = 0, mojibake_rate: float = 0.05):
+        """
+        Args:
+            seeds: Valores semilla (ver load_seeds)
+            seed: Semilla del generador aleatorio
+            mojibake_rate: Proporción de líneas con mojibake
+        """
+        self.seeds = seeds
+        self.rng = random.Random(seed)
+        self.mojibake_rate = mojibake_rate
+
+    def _noisy(self, line: str) -> str:
+        return mojibake(line) if self.rng.random() < self.mojibake_rate else line
+
+    def _requirements(self) -> List[str]:
+        reqs = self.rng.sample(self.seeds['requerimientos'], min(len(self.seeds['requerimientos']), self.rng.randint(3, 8)))
+        style = self.rng.choice(['-', '•', 'numbered', 'plain'])
+        if style == 'numbered':
+            return [f'{i}. {req}' for i, req in enumerate(reqs, 1)]
+        if style == 'plain':
+            return reqs
+        return [f'{style} {req}' for req in reqs]
+
+    def text_posting(self) -> str:
+        """Una vacante en texto plano tal como se copia desde LinkedIn."""
+        rng = self.rng
+        labels = LABELS[rng.choice(['es', 'en'])]
+        cargo = rng.choice(self.seeds['cargo'])
+        empresa = rng.choice(self.seeds['empresa'])
+        ubicacion = rng.choice(self.seeds['ubicacion'])
+        lines = []
+        if rng.random() < 0.5:
+            # Encabezado de LinkedIn: logo, empresa, cargo, ubicación
+            lines += [f'{empresa} logo', empresa, cargo,
+                      f'{ubicacion} · {rng.randint(1, 4)} weeks ago · {rng.randint(10, 300)} applicants']
+            lines += rng.sample(LINKEDIN_BOILERPLATE, 3)
+        else:
+            lines += [f"{labels['cargo']}: {cargo}", f"{labels['empresa']}: {empresa}"]
+        if rng.random() < 0.6:
+            lines.append(f"{labels['fecha']}: 2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+        lines.append(f"{labels['modalidad']}: {rng.choice(MODALIDADES)}")
+        lines.append('')
+        lines.append(f"{labels['descripcion']}: {' '.join(rng.sample(self.seeds['descripcion'], min(3, len(self.seeds['descripcion']))))}")
+        lines.append('')
+        lines.append(f"{labels['requerimientos']}:")
+        lines += self._requirements()
+        if rng.random() < 0.3:
+            lines += ['', 'About the company', rng.choice(self.seeds['descripcion']), 'Show more']
+        return '\n'.join(self._noisy(line) for line in lines)
+
+    def yaml_posting(self) -> str:
+        """Una vacante como documento YAML (formato de entrada de VacancyProcessor)."""
+        rng = self.rng
+        record = {
+            'cargo': rng.choice(self.seeds['cargo']),
+            'empresa': rng.choice(self.seeds['empresa']),
+            'fecha': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'descripcion': '\n'.join(rng.sample(self.seeds['descripcion'], min(3, len(self.seeds['descripcion'])))) + '\n',
+            'requerimientos': '\n'.join(self._requirements()) + '\n',
+            'ubicacion': rng.choice(self.seeds['ubicacion']),
+            'tipo_contrato': rng.choice(['Full-time', 'Contract', 'Part-time']),
+        }
+        return yaml.safe_dump(record, allow_unicode=True, sort_keys=False).strip()
+
+    def write_corpus(self, path: Path, postings: int, kind: str = 'text') -> Path:
+        """
+        Escribe un corpus de `postings` vacantes separadas por '---'.
+
+        Args:
+            path: Archivo de salida
+            postings: Número de vacantes
+            kind: 'text' (texto plano) o 'yaml'
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        make = self.text_posting if kind == 'text' else self.yaml_posting
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(postings):
+                if i:
+                    f.write('\n---\n')
+                f.write(make())
+            f.write('\n')
+        return path
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso actual en MB (None si no se puede medir)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageTimer:
+    """Acumula el tiempo de cada etapa de un benchmark."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(self.stages.get(name, 0.0) + time.perf_counter() - started, 4)
+
+
+def _bench_extractor(corpus: Path, workdir: Path, timer: StageTimer) -> int:
+    from extract_vacantes_from_text import VacancyExtractor
+    from vacancy_blocks import iter_blocks
+
+    with timer.stage('split'):
+        blocks = [block for _, block in iter_blocks(corpus)]
+    extractor = VacancyExtractor(verbose=False)
+    with timer.stage('extract'):
+        for block in blocks:
+            extractor.extract_vacancy_fields(block)
+    with timer.stage('end_to_end'):
+        VacancyExtractor(verbose=False).process_text_file(corpus, workdir / 'extractor')
+    return len(blocks)
+
+
+def _bench_ml(corpus: Path, workdir: Path, timer: StageTimer, model_dir: str = DEFAULT_MODEL_DIR) -> int:
+    from ml_extractor import MLVacancyExtractor
+    from vacancy_blocks import iter_blocks
+
+    with timer.stage('split'):
+        blocks = [block for _, block in iter_blocks(corpus)]
+    with timer.stage('load_model'):
+        extractor = MLVacancyExtractor(verbose=False, model_dir=model_dir)
+    with timer.stage('extract'):
+        extractor.extract_batch(blocks)
+    with timer.stage('end_to_end'):
+        MLVacancyExtractor(verbose=False, model_dir=model_dir).process_text_file(corpus, workdir / 'ml')
+    return len(blocks)
+
+
+def _bench_split(corpus: Path, workdir: Path, timer: StageTimer) -> int:
+    import split_vacantes_to_yaml as splitter
+
+    with timer.stage('split'):
+        blocks = [b.strip() for b in corpus.read_text(encoding='utf-8').split('---') if b.strip()]
+    with timer.stage('extract'):
+        for block in blocks:
+            splitter.extract_cargo_empresa(block)
+            splitter.detect_modalidad(block)
+            splitter.extract_requerimientos(block)
+    with timer.stage('end_to_end'), contextlib.redirect_stdout(io.StringIO()):
+        splitter.split_vacantes(str(corpus), str(workdir / 'split'))
+    return len(blocks)
+
+
+def _bench_processor(corpus: Path, workdir: Path, timer: StageTimer) -> int:
+    from process_vacantes import VacancyProcessor
+    from yaml_documents import load_document
+
+    processor = VacancyProcessor(corpus, workdir / 'processor', verbose=False)
+    with timer.stage('split'):
+        blocks = [block for _, block in processor.iter_vacantes_blocks()]
+    with timer.stage('parse'):
+        for block in blocks:
+            load_document(block)
+    with timer.stage('end_to_end'):
+        processor.process_all()
+    return len(blocks)
+
+
+BENCHMARKS = {
+    'extractor': (_bench_extractor, 'text'),
+    'split': (_bench_split, 'text'),
+    'processor': (_bench_processor, 'yaml'),
+    'ml': (_bench_ml, 'text'),
+}
+
+
+def run_benchmark(name: str, corpus: Path, model_dir: str = DEFAULT_MODEL_DIR) -> Dict:
+    """
+    Ejecuta un benchmark (pensado para correr en un proceso nuevo).
+
+    Args:
+        name: Extractor a medir (ver EXTRACTORS)
+        corpus: Archivo del corpus sintético
+        model_dir: Directorio del modelo del extractor 'ml'
+
+    Returns:
+        Resultado con tiempos por etapa, throughput y pico de RSS
+    """
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    bench, _ = BENCHMARKS[name]
+    options = {'model_dir': model_dir} if name == 'ml' else {}
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory(prefix=f'bench_{name}_') as tmp:
+        blocks = bench(corpus, Path(tmp), timer, **options)
+    size_mb = corpus.stat().st_size / (1024 * 1024)
+    seconds = timer.stages['end_to_end']
+    return {
+        'extractor': name,
+        'blocks': blocks,
+        'input_mb': round(size_mb, 3),
+        'stages': timer.stages,
+        'seconds': seconds,
+        'blocks_per_sec': round(blocks / seconds, 1) if seconds else None,
+        'mb_per_sec': round(size_mb / seconds, 3) if seconds else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Commit actual del repositorio (None si git no está disponible)."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: Dict, baseline_path: Path):
+    """Imprime la variación de bloques/seg respecto de un JSON anterior."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['extractor'], r['postings']): r for r in baseline.get('results', [])}
+    print(f"\nComparación con {baseline_path} ({(baseline.get('commit') or '?')[:10]}):")
+    for r in results['results']:
+        old = previous.get((r['extractor'], r['postings']))
+        if not old or not old.get('blocks_per_sec') or not r.get('blocks_per_sec'):
+            continue
+        ratio = r['blocks_per_sec'] / old['blocks_per_sec']
+        print(f"  {r['extractor']:<10} {r['postings']:>7}: {old['blocks_per_sec']:>9.1f} -> "
+              f"{r['blocks_per_sec']:>9.1f} bloques/seg ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark de los extractores de vacantes sobre corpus sintéticos',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Uso:')[1] if 'Uso:' in __doc__ else ''
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Número de vacantes de cada corpus (default: 1000 10000 100000)')
+    parser.add_argument('--extractors', nargs='+', choices=EXTRACTORS, default=DEFAULT_EXTRACTORS,
+                        help='Extractores a medir (default: extractor split processor)')
+    parser.add_argument('--model-dir', default=DEFAULT_MODEL_DIR,
+                        help='Modelo del extractor ml (default: models)')
+    parser.add_argument('--seeds-dir', default=str(REPO_ROOT / 'vacantes_yaml'),
+                        help='Directorio de YAML usados como semilla (default: vacantes_yaml)')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla del generador (default: 0)')
+    parser.add_argument('--corpus-dir', default=None,
+                        help='Directorio donde guardar los corpus generados (default: temporal)')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Archivo JSON de resultados (default: benchmarks/benchmark_<commit>.json)')
+    parser.add_argument('--compare', default=None, help='JSON de una corrida anterior para comparar')
+    args = parser.parse_args()
+
+    seeds = load_seeds(Path(args.seeds_dir))
+    commit = git_commit()
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix='bench_corpus_') as tmp:
+        corpus_dir = Path(args.corpus_dir) if args.corpus_dir else Path(tmp)
+        for size in args.sizes:
+            corpora = {}
+            for kind in sorted({BENCHMARKS[name][1] for name in args.extractors}):
+                path = corpus_dir / f'corpus_{kind}_{size}_seed{args.seed}.txt'
+                if not path.exists():
+                    print(f"🧪 Generando corpus {kind} de {size} vacantes...")
+                    CorpusGenerator(seeds, seed=args.seed).write_corpus(path, size, kind)
+                corpora[kind] = path
+
+            for name in args.extractors:
+                print(f"⏱️  {name} ({size} vacantes)...", flush=True)
+                # Un proceso nuevo por medición: el pico de RSS no se arrastra entre corridas
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                    try:
+                        result = executor.submit(run_benchmark, name, corpora[BENCHMARKS[name][1]],
+                                                 args.model_dir).result()
+                    except Exception as e:
+                        # Un extractor que falla sobre el corpus no detiene el resto de mediciones
+                        result = {'extractor': name, 'error': f'{type(e).__name__}: {e}'}
+                        print(f"   ❌ {result['error']}")
+                result['postings'] = size
+                results['results'].append(result)
+                if 'error' not in result:
+                    print(f"   {result['blocks_per_sec']} bloques/seg, {result['mb_per_sec']} MB/seg, "
+                          f"pico RSS {result['peak_rss_mb']} MB, etapas {result['stages']}")
+
+    output = Path(args.output) if args.output else REPO_ROOT / 'benchmarks' / f"benchmark_{(commit or 'local')[:10]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados guardados en: {output}")
+
+    if args.compare:
+        compare(results, Path(args.compare))
+
+
+if __name__ == '__main__':
+    main()
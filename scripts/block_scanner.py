@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+scripts/block_scanner.py
+
+Escaneo de un bloque de vacante en una sola pasada. Divide el texto en líneas
+una vez, calcula rasgos por línea (viñeta, numeración, posición) y registra
+en un único recorrido la primera posición de cada disparador (etiquetas como
+'Cargo:' o 'Requirements:'). Los extractores consultan esta estructura en
+lugar de volver a recorrer el texto completo para cada campo.
+
+También incluye HeadingIndex: un índice de encabezados de sección
+(Requerimientos, Requirements, Responsabilidades, What You'll Do, ...) con su
+offset y tipo, construido en una pasada, del que se cortan directamente los
+cuerpos de cada sección.
+
+Uso:
+  scanner = BlockScanner({'label_cargo': r'(?:cargo|puesto):'})
+  scan = scanner.scan(texto)
+  scan.anchor('label_cargo')   # primera posición o None
+  scan.nonblank_lines          # líneas no vacías (strip)
+
+  index = HeadingIndex([(r'Requirements', 'requerimientos'), (r'What You.ll Do', 'responsabilidades')])
+  for section in index.sections(texto):
+      section.kind, section.start, section.body
+"""
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+BULLET_CHARS = ('-', '•', '*')
+NUMBERED_PREFIX_RE = re.compile(r'\d+[.)]')
+
+
+class ScannedLine:
+    """Una línea del bloque con sus rasgos precalculados."""
+
+    __slots__ = ('index', 'start', 'raw', 'stripped', 'bullet', 'numbered')
+
+    def __init__(self, index: int, start: int, raw: str):
+        self.index = index
+        self.start = start
+        self.raw = raw
+        self.stripped = raw.strip()
+        # Los rasgos se evalúan sobre el inicio real de la línea (sin strip),
+        # igual que los patrones anclados con ^ en modo MULTILINE
+        self.bullet = raw.startswith(BULLET_CHARS)
+        self.numbered = NUMBERED_PREFIX_RE.match(raw) is not None
+
+
+class ScannedBlock:
+    """
+    Resultado del escaneo de un bloque. Es la estructura compartida por todas
+    las estrategias de extracción: cada vista (líneas con sus rasgos,
+    disparadores, párrafos, secciones, líneas de str.splitlines) se calcula
+    la primera vez que se consulta y se reutiliza después.
+    """
+
+    def __init__(self, text: str, anchors: Optional[Dict[str, int]] = None,
+                 heading_index: Optional['HeadingIndex'] = None,
+                 find_anchors: Optional[Callable[[str], Dict[str, int]]] = None):
+        """
+        Args:
+            text: Texto del bloque
+            anchors: Disparadores ya encontrados (nombre -> primera posición)
+            heading_index: Índice de encabezados para sections() (opcional)
+            find_anchors: Función que busca los disparadores (al primer anchor()) si no se pasó anchors
+        """
+        self.text = text
+        self.anchors = anchors
+        self.heading_index = heading_index
+        self._find_anchors = find_anchors
+        self._sections = None
+        self._stripped_lines = None
+        self._paragraphs = None
+        self._lines: Optional[List[ScannedLine]] = None
+        self._nonblank_lines: List[str] = []
+        self._bullet_count = 0
+        self._numbered_count = 0
+
+    def _scan_lines(self):
+        self._lines = []
+        start = 0
+        for index, raw in enumerate(self.text.split('\n')):
+            line = ScannedLine(index, start, raw)
+            self._lines.append(line)
+            if line.stripped:
+                self._nonblank_lines.append(line.stripped)
+            if line.bullet:
+                self._bullet_count += 1
+            if line.numbered:
+                self._numbered_count += 1
+            start += len(raw) + 1
+
+    @property
+    def lines(self) -> List[ScannedLine]:
+        """Líneas del bloque (cortadas en \\n) con sus rasgos."""
+        if self._lines is None:
+            self._scan_lines()
+        return self._lines
+
+    @property
+    def nonblank_lines(self) -> List[str]:
+        """Líneas no vacías (strip)."""
+        if self._lines is None:
+            self._scan_lines()
+        return self._nonblank_lines
+
+    @property
+    def bullet_count(self) -> int:
+        """Líneas que empiezan con viñeta."""
+        if self._lines is None:
+            self._scan_lines()
+        return self._bullet_count
+
+    @property
+    def numbered_count(self) -> int:
+        """Líneas que empiezan con numeración (1. o 1))."""
+        if self._lines is None:
+            self._scan_lines()
+        return self._numbered_count
+
+    def anchor(self, name: str) -> Optional[int]:
+        """Primera posición del disparador `name`, o None si no aparece."""
+        if self.anchors is None:
+            self.anchors = self._find_anchors(self.text) if self._find_anchors else {}
+        return self.anchors.get(name)
+
+    def stripped_lines(self) -> List[str]:
+        """Líneas con strip() según str.splitlines() (incluye las vacías)."""
+        if self._stripped_lines is None:
+            self._stripped_lines = [line.strip() for line in self.text.splitlines()]
+        return self._stripped_lines
+
+    def paragraphs(self) -> List[str]:
+        """Párrafos (separados por línea en blanco) sin espacios en los extremos."""
+        if self._paragraphs is None:
+            self._paragraphs = [p.strip() for p in self.text.split('\n\n')]
+        return self._paragraphs
+
+    def sections(self) -> List['Section']:
+        """Secciones del bloque según el índice de encabezados del escáner."""
+        if self._sections is None:
+            self._sections = self.heading_index.sections(self.text) if self.heading_index else []
+        return self._sections
+
+
+class BlockScanner:
+    """
+    Construye ScannedBlock. Todos los disparadores se buscan en una sola
+    pasada con una alternancia dentro de un lookahead, de modo que dos
+    disparadores que se solapan (p. ej. 'position:' dentro de
+    'about the position:') se registran ambos.
+
+    Los disparadores no deben poder empezar en la misma posición que otro
+    distinto (en ese caso solo se registraría el primero de la alternancia).
+    """
+
+    def __init__(self, triggers: Dict[str, str], flags: int = re.IGNORECASE,
+                 heading_index: Optional['HeadingIndex'] = None):
+        """
+        Args:
+            triggers: Diccionario nombre -> regex del disparador
+            flags: Flags de compilación
+            heading_index: Índice de encabezados para ScannedBlock.sections() (opcional)
+        """
+        self.heading_index = heading_index
+        self.names = list(triggers)
+        alternation = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in triggers.items())
+        self._trigger_re = re.compile(f'(?=(?:{alternation}))', flags)
+
+    def find_anchors(self, text: str) -> Dict[str, int]:
+        """Primera posición de cada disparador presente en el texto."""
+        anchors = {}
+        pending = len(self.names)
+        for match in self._trigger_re.finditer(text):
+            name = match.lastgroup
+            if name not in anchors:
+                anchors[name] = match.start()
+                pending -= 1
+                if not pending:
+                    break
+        return anchors
+
+    def scan(self, text: str) -> ScannedBlock:
+        """Escanea un bloque de texto (los disparadores se buscan al primer anchor())."""
+        return ScannedBlock(text, heading_index=self.heading_index, find_anchors=self.find_anchors)
+
+
+class Heading:
+    """Un encabezado reconocido: tipo, título y posición [start, end) en el texto."""
+
+    __slots__ = ('kind', 'title', 'start', 'end')
+
+    def __init__(self, kind: str, title: str, start: int, end: int):
+        self.kind = kind
+        self.title = title
+        self.start = start
+        self.end = end
+
+
+class Section:
+    """Una sección: su encabezado y el cuerpo cortado del texto."""
+
+    __slots__ = ('kind', 'title', 'start', 'body_start', 'body_end', 'body')
+
+    def __init__(self, heading: Heading, body_start: int, body_end: int, body: str):
+        self.kind = heading.kind
+        self.title = heading.title
+        self.start = heading.start
+        self.body_start = body_start
+        self.body_end = body_end
+        self.body = body
+
+    def to_dict(self) -> Dict:
+        """Representación serializable (JSON/YAML) de la sección."""
+        return {
+            'tipo': self.kind,
+            'titulo': self.title,
+            'offset': self.start,
+            'contenido': self.body,
+        }
+
+
+class HeadingIndex:
+    """
+    Índice de encabezados de sección. Las alternativas se prueban en el orden
+    dado (como en una alternancia regex) y cada una lleva su tipo de sección.
+    """
+
+    def __init__(self, headings: Sequence[Tuple[str, str]], flags: int = re.IGNORECASE,
+                 prefix: str = '', suffix: str = ''):
+        """
+        Args:
+            headings: Lista ordenada de (regex del encabezado, tipo de sección)
+            flags: Flags de compilación
+            prefix: Regex que debe preceder a cualquier encabezado (p. ej. inicio de línea)
+            suffix: Regex que debe seguir a cualquier encabezado
+        """
+        self._kinds = [kind for _, kind in headings]
+        alternation = '|'.join(f'(?P<h{i}>{pattern})' for i, (pattern, _) in enumerate(headings))
+        self._heading_re = re.compile(f'{prefix}(?:{alternation}){suffix}', flags)
+
+    def find(self, text: str) -> List[Heading]:
+        """Todos los encabezados del texto (sin solaparse), en orden."""
+        headings = []
+        for match in self._heading_re.finditer(text):
+            name = match.lastgroup
+            headings.append(Heading(self._kinds[int(name[1:])], match.group(name), match.start(), match.end()))
+        return headings
+
+    def sections(self, text: str, headings: Optional[List[Heading]] = None) -> List[Section]:
+        """
+        Secciones del texto: cada cuerpo va desde el final de su encabezado
+        (sin ':' ni espacios iniciales) hasta el siguiente encabezado.
+        """
+        if headings is None:
+            headings = self.find(text)
+        sections = []
+        for i, heading in enumerate(headings):
+            body_start = skip_heading_separator(text, heading.end)
+            body_end = headings[i + 1].start if i + 1 < len(headings) else len(text)
+            body_end = max(body_start, body_end)
+            sections.append(Section(heading, body_start, body_end, text[body_start:body_end].strip()))
+        return sections
+
+
+def skip_heading_separator(text: str, pos: int) -> int:
+    """
+    Avanza sobre el separador que sigue a un encabezado: espacios y luego
+    ':' o saltos de línea (equivalente a la regex \\s*[\\n:]* ).
+    """
+    n = len(text)
+    while pos < n and text[pos].isspace():
+        pos += 1
+    while pos < n and text[pos] in '\n:':
+        pos += 1
+    return pos
+
+
+def paragraph_end(text: str, pos: int) -> Tuple[int, int]:
+    """
+    Fin del párrafo que empieza en pos, con la semántica de la regex
+    [\\s\\S]*?(?:\\n{2,}|$) sin MULTILINE.
+
+    Returns:
+        Tupla (fin_del_cuerpo, fin_del_separador)
+    """
+    n = len(text)
+    candidates = [n]
+    if text.endswith('\n') and n - 1 >= pos:
+        candidates.append(n - 1)
+    blank = text.find('\n\n', pos)
+    if blank != -1:
+        candidates.append(blank)
+    body_end = min(candidates)
+    if blank == body_end:
+        sep_end = body_end
+        while sep_end < n and text[sep_end] == '\n':
+            sep_end += 1
+        return body_end, sep_end
+    return body_end, body_end
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+scripts/block_watcher.py
+
+Modo watch incremental para vacantes.txt. Guarda un checkpoint con la
+posición del último bloque procesado (offset inicial y final en bytes, hash
+de sus bytes y hash del bloque normalizado) y, en cada sondeo, solo divide y
+entrega los bloques a partir de esa posición, de modo que el costo depende
+de lo agregado y no del historial del archivo.
+
+Casos que detecta:
+  - Agregado al final: se entregan solo los bloques nuevos. Si el último
+    bloque procesado creció (se siguió escribiendo sin separador), se
+    entrega de nuevo.
+  - Reescritura: si el archivo es más corto que el checkpoint, los bytes del
+    último bloque cambiaron o aparece el separador '---' en un archivo que se
+    dividía por líneas en blanco, se vuelve a procesar el archivo completo.
+
+Los cambios se detectan por sondeo (tamaño y mtime del archivo), que funciona
+igual en Linux, macOS y Windows sin dependencias adicionales.
+
+Uso:
+  watcher = BlockWatcher('vacantes.txt', 'output/.watch_checkpoint.json')
+  watch(watcher, handle_blocks, poll_interval=2.0)   # handle_blocks(list[(offset, bloque)])
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from extraction_cache import block_hash
+from vacancy_blocks import (DASHES, SEPARATOR_BLANK_LINES, detect_separator,
+                            iter_block_spans, open_buffer)
+
+CHECKPOINT_VERSION = 1
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def _digest(raw) -> str:
+    return hashlib.sha1(bytes(raw)).hexdigest()
+
+
+class BlockWatcher:
+    """Entrega los bloques nuevos de un archivo desde el último checkpoint."""
+
+    def __init__(self, path, checkpoint_path, separator: Optional[str] = None,
+                 encoding: str = 'utf-8'):
+        """
+        Args:
+            path: Archivo de vacantes a vigilar
+            checkpoint_path: Archivo JSON del checkpoint
+            separator: SEPARATOR_DASHES, SEPARATOR_YAML, SEPARATOR_BLANK_LINES o None para detectarlo
+            encoding: Codificación del archivo
+        """
+        self.path = Path(path)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.separator = separator
+        self.encoding = encoding
+        self.checkpoint = self._load_checkpoint()
+        self.rewrites = 0
+        self._pending: Optional[Dict] = None
+        self._seen: Optional[Tuple[int, int]] = None
+
+    def _load_checkpoint(self) -> Optional[Dict]:
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('path') != str(self.path.resolve()):
+            return None
+        return checkpoint
+
+    def _resume_offset(self, buf, separator: str) -> Optional[int]:
+        """Offset desde el que continuar, o None si el archivo fue reescrito."""
+        cp = self.checkpoint
+        if cp is None or cp['separator'] != separator:
+            return None
+        if len(buf) < cp['last_end'] or _digest(buf[cp['last_offset']:cp['last_end']]) != cp['last_raw_hash']:
+            return None
+        if separator == SEPARATOR_BLANK_LINES and buf.find(DASHES, cp['last_offset']) != -1:
+            # Con '---' en el archivo cambia la regla de división de todo el archivo
+            return None
+        return cp['last_offset']
+
+    def poll(self) -> List[Tuple[int, str]]:
+        """
+        Revisa el archivo y devuelve los bloques nuevos (offset, bloque).
+        El checkpoint no avanza hasta llamar a commit().
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        seen = (stat.st_size, stat.st_mtime_ns)
+        if seen == self._seen:
+            return []
+
+        with open_buffer(self.path) as buf:
+            separator = self.separator or detect_separator(buf)
+            start = self._resume_offset(buf, separator)
+            skip_hash = None
+            if start is None:
+                if self.checkpoint is not None:
+                    self.rewrites += 1
+                start = 0
+            else:
+                skip_hash = self.checkpoint['last_block_hash']
+
+            blocks = []
+            last = None
+            for offset, end, block in iter_block_spans(buf, separator, self.encoding, start):
+                last = (offset, end, block)
+                if skip_hash is not None and offset == start and block_hash(block) == skip_hash:
+                    continue
+                blocks.append((offset, block))
+
+            if last is not None:
+                offset, end, block = last
+                self._pending = {
+                    'version': CHECKPOINT_VERSION,
+                    'path': str(self.path.resolve()),
+                    'separator': separator,
+                    'last_offset': offset,
+                    'last_end': end,
+                    'last_raw_hash': _digest(buf[offset:end]),
+                    'last_block_hash': block_hash(block),
+                }
+        self._seen = seen
+        return blocks
+
+    def commit(self):
+        """Guarda el checkpoint del último poll() (escritura atómica)."""
+        if self._pending is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._pending, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+        self.checkpoint = self._pending
+        self._pending = None
+
+
+def watch(watcher: BlockWatcher, handle: Callable[[List[Tuple[int, str]]], None],
+          poll_interval: float = DEFAULT_POLL_INTERVAL, once: bool = False,
+          verbose: bool = True):
+    """
+    Bucle de vigilancia: entrega a `handle` cada lote de bloques nuevos y
+    avanza el checkpoint cuando `handle` termina sin error. Termina con Ctrl+C.
+
+    Args:
+        watcher: BlockWatcher del archivo
+        handle: Función que procesa una lista de (offset, bloque)
+        poll_interval: Segundos entre sondeos
+        once: Procesar lo pendiente una vez y terminar
+        verbose: Si debe imprimir información del sondeo
+    """
+    if verbose:
+        print(f"👀 Vigilando {watcher.path} (checkpoint: {watcher.checkpoint_path})")
+    try:
+        while True:
+            rewrites = watcher.rewrites
+            blocks = watcher.poll()
+            if verbose and watcher.rewrites != rewrites:
+                print("🔁 El archivo fue reescrito: se procesa completo")
+            if blocks:
+                if verbose:
+                    print(f"🆕 {len(blocks)} bloque(s) nuevo(s) desde el byte {blocks[0][0]}")
+                handle(blocks)
+            watcher.commit()
+            if once:
+                return
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        if verbose:
+            print("\n⏹️  Vigilancia detenida")
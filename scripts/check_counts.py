@@ -4,28 +4,41 @@ scripts/check_counts.py
 
 Cuenta cuántos ejemplos hay por etiqueta en data/line_dataset.jsonl
 Imprime el conteo y muestra unas muestras por etiqueta.
+Acepta el formato normalizado y el anterior (ver line_dataset.py); solo lee
+el archivo de líneas. Si el JSONL tiene columnas al día (line_columns.py) o
+se pasa el directorio .columns, cuenta sobre los códigos de etiqueta con
+memory-map y solo decodifica las líneas de muestra.
 
 Uso:
   python scripts/check_counts.py --input data/line_dataset.jsonl --show-samples 5
 """
-import json
 import argparse
 import collections
 from pathlib import Path
 import random
 
+from line_columns import open_columns
+from line_dataset import iter_line_records
+
 def load_items(path):
-    items = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                items.append(json.loads(line))
-            except Exception:
-                continue
-    return items
+    return list(iter_line_records(path))
+
+def show_columns(columns, n):
+    # Las líneas sin label (código '') cuentan como "other", igual que en el JSONL
+    counts = collections.Counter()
+    for lab, count in columns.label_counts().items():
+        counts[lab or "other"] += count
+    print("Total lines:", len(columns))
+    print("Counts per label:")
+    for k,v in counts.items():
+        print(f"  {k}: {v}")
+
+    print("\nSample lines per label (up to {} each):".format(n))
+    for lab in counts:
+        rows = columns.rows_with_labels([lab, ""] if lab == "other" else [lab]).tolist()
+        print(f"\n== {lab} (showing up to {n}) ==")
+        for line in columns.texts(random.sample(rows, min(n, len(rows)))):
+            print(" -", repr(line[:200].replace("\n"," ")))
 
 def main():
     p = argparse.ArgumentParser()
@@ -38,6 +51,11 @@ def main():
         print("Input not found:", in_path)
         return
 
+    columns = open_columns(in_path)
+    if columns is not None:
+        show_columns(columns, args.show_samples)
+        return
+
     items = load_items(in_path)
     counts = collections.Counter()
     by_label = {}
@@ -6,34 +6,99 @@ Convierte data/training_data.jsonl (cada línea: {"text":..., "yaml": ...})
 en un dataset a nivel de línea listo para entrenamiento de un clasificador
 (line -> label in {role,company,other}).
 
-Salida:
- - data/line_dataset.jsonl      (cada línea: {"line":..., "label":..., "source_hash":..., "source_yaml":...})
+Salida (formato normalizado, ver line_dataset.py):
+ - data/line_dataset.jsonl      (cada línea: {"line":..., "label":..., "source_hash":..., "line_index":...})
+ - data/line_dataset.sources.jsonl  (una por vacante: {"source_hash":..., "text":..., "yaml":...})
  - data/line_dataset.csv        (columns: line,label,source_hash)
- - data/line_dataset_review.jsonl  (ejemplos para revisión manual)
+ - data/line_dataset_review.jsonl  (ejemplos para revisión manual, con su
+   data/line_dataset_review.sources.jsonl)
+
+Con --columnar se escribe además data/line_dataset.columns/ (un .npy por
+columna, con label y source_hash codificados con diccionario; ver
+line_columns.py), que train_tfidf_baseline, train_line_classifier,
+check_counts y extract_company_candidates abren con memory-map en lugar de
+parsear el JSONL.
+
+Con --workers N las vacantes se reparten en shards (bloques consecutivos)
+entre N procesos; cada uno escribe sus partes JSONL/CSV y se unen en orden,
+con la misma salida que en serie.
 
 Uso:
   python scripts/convert_to_line_dataset.py
   python scripts/convert_to_line_dataset.py --input data/training_data.jsonl --outdir data
+  python scripts/convert_to_line_dataset.py --input data/training_data.jsonl --outdir data --workers 4
+  python scripts/convert_to_line_dataset.py --input data/training_data.jsonl --outdir data --columnar
 
 """
 from pathlib import Path
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import json
 import re
 import csv
 import hashlib
+import shutil
+import tempfile
 import unicodedata
 import argparse
 
+from line_columns import write_columns
+from line_dataset import LineTableWriter, dump_record
+
+# Vacantes por shard en modo paralelo
+DEFAULT_SHARD_SIZE = 64
+
+# Puntuación que normalize_text reemplaza por espacios
+PUNCTUATION = '·•/\\()[]{}:,;"“”‘’`~-–—'
+
+class _NormalizeTable(dict):
+    """
+    Tabla de str.translate para normalize_text: elimina las marcas
+    combinantes (tildes tras NFKD) y cambia la puntuación por espacios. Se
+    completa a demanda, un código por carácter distinto.
+    """
+
+    def __missing__(self, code):
+        ch = chr(code)
+        if unicodedata.combining(ch):
+            mapped = None
+        elif ch in PUNCTUATION:
+            mapped = ' '
+        else:
+            mapped = code
+        self[code] = mapped
+        return mapped
+
+_NORMALIZE_TABLE = _NormalizeTable()
+_SPACES_RE = re.compile(r'\s+')
+_LINE_SPACES_RE = re.compile(r'[^\S\n]+')
+
 def normalize_text(s: str) -> str:
     if s is None:
         return ""
     s = s.strip()
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    s = re.sub(r'[·•/\\()\[\]\{\}:,;"“”‘’`~\-–—]', ' ', s)
-    s = re.sub(r'\s+', ' ', s).strip().lower()
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s)
+    s = s.translate(_NORMALIZE_TABLE)
+    s = _SPACES_RE.sub(' ', s).strip().lower()
     return s
 
+def normalize_lines(lines):
+    """
+    normalize_text de cada línea (de simple_lines) en una sola pasada sobre
+    la vacante: NFKD, la tabla y los espacios se aplican al texto unido por
+    saltos de línea, que ninguno de esos pasos cruza.
+    """
+    if not lines:
+        return []
+    s = "\n".join(lines)
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s)
+    s = s.translate(_NORMALIZE_TABLE)
+    s = _LINE_SPACES_RE.sub(' ', s).lower()
+    return [l.strip() for l in s.split("\n")]
+
 def extract_fields_from_yaml(yaml_text: str):
     cargo = ""
     empresa = ""
@@ -51,121 +116,363 @@ def simple_lines(text: str):
 def sha1_hex(s: str) -> str:
     return hashlib.sha1(s.encode('utf-8')).hexdigest()
 
-def line_contains_target(line_norm: str, target_norm: str) -> bool:
-    if not target_norm:
-        return False
-    if target_norm in line_norm:
-        return True
+class TargetMatcher:
+    """
+    Etiquetador de las líneas de una vacante. Cargo y empresa se normalizan
+    y se separan en tokens una vez por vacante, y cada objetivo se busca una
+    sola vez en todas las líneas normalizadas unidas.
+
+    Reglas, en orden:
+      role     la línea contiene el cargo
+      company  la línea contiene la empresa
+      role     la línea contiene los 3 primeros tokens del cargo
+      company  la línea contiene los 3 primeros tokens de la empresa
+      other    en otro caso
+    """
+
+    def __init__(self, cargo, empresa):
+        self.cargo_norm = normalize_text(cargo)
+        self.empresa_norm = normalize_text(empresa)
+        self.cargo_tokens = self.cargo_norm.split()[:3]
+        self.empresa_tokens = self.empresa_norm.split()[:3]
+
+    @classmethod
+    def from_yaml(cls, yaml_text):
+        return cls(*extract_fields_from_yaml(yaml_text))
+
+    @property
+    def has_targets(self):
+        return bool(self.cargo_norm or self.empresa_norm)
+
+    def label_lines(self, lines_norm):
+        """Etiqueta de cada línea normalizada (ver normalize_lines)."""
+        labels = ["other"] * len(lines_norm)
+        if not self.has_targets or not lines_norm:
+            return labels
+        joined = "\n".join(lines_norm)
+        starts = [0]
+        for ln in lines_norm[:-1]:
+            starts.append(starts[-1] + len(ln) + 1)
+
+        def assign(indexes, label):
+            for idx in indexes:
+                if labels[idx] == "other":
+                    labels[idx] = label
+
+        if self.cargo_norm:
+            assign(_lines_with(joined, starts, self.cargo_norm), "role")
+        if self.empresa_norm:
+            assign(_lines_with(joined, starts, self.empresa_norm), "company")
+        if self.cargo_tokens:
+            assign(_lines_with_all(joined, starts, self.cargo_tokens), "role")
+        if self.empresa_tokens:
+            assign(_lines_with_all(joined, starts, self.empresa_tokens), "company")
+        return labels
+
+def _lines_with(joined, starts, target):
+    """Índices (ordenados) de las líneas de joined que contienen target (sin saltos de línea)."""
+    found = []
+    pos = joined.find(target)
+    while pos != -1:
+        idx = bisect_right(starts, pos) - 1
+        found.append(idx)
+        if idx + 1 >= len(starts):
+            break
+        pos = joined.find(target, starts[idx + 1])
+    return found
+
+def _lines_with_all(joined, starts, tokens):
+    found = set(_lines_with(joined, starts, tokens[0]))
+    for tok in tokens[1:]:
+        if not found:
+            break
+        found.intersection_update(_lines_with(joined, starts, tok))
+    return sorted(found)
+
+def line_record(ln, ln_norm, label, src_hash, source_index, line_index, source_yaml=None):
+    item = {
+        "line": ln,
+        "line_norm": ln_norm,
+        "label": label,
+        "source_hash": src_hash,
+    }
+    if source_yaml is not None:
+        item["source_yaml"] = source_yaml
+    item["source_index"] = source_index
+    item["line_index"] = line_index
+    return item
+
+def label_source(src_text, src_yaml):
+    """
+    Etiqueta las líneas de una vacante.
+
+    Devuelve (src_hash, lines, lines_norm, labels, review), donde review son
+    los índices de las líneas para revisión manual, o None si no hay líneas.
+    """
+    lines = simple_lines(src_text)
+    if not lines:
+        return None
+    matcher = TargetMatcher.from_yaml(src_yaml)
+    lines_norm = normalize_lines(lines)
+    labels = matcher.label_lines(lines_norm)
+    review = [idx for idx, label in enumerate(labels) if label == "other"] if matcher.has_targets else []
+    return sha1_hex(src_text), lines, lines_norm, labels, review
+
+def render_lines(i, labeled, indexes, source_yaml=None):
+    """JSONL de las líneas indexes de una vacante etiquetada con label_source()."""
+    src_hash, lines, lines_norm, labels, _ = labeled
+    return "".join(dump_record(line_record(lines[idx], lines_norm[idx], labels[idx], src_hash, i, idx, source_yaml))
+                   for idx in indexes)
+
+def iter_jsonl_records(fin):
+    """
+    Lee un training_data.jsonl abierto y entrega tuplas (source_index, text, yaml).
+    source_index es el número de línea del archivo (base 1).
+    """
+    for i, line in enumerate(fin, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except Exception as e:
+            print(f"Skipping invalid json line {i}: {e}")
+            continue
+        yield i, obj.get('text',''), obj.get('yaml','')
+
+def convert(input_path: Path, outdir: Path, min_examples: int = 0, workers: int = 1,
+            shard_size: int = DEFAULT_SHARD_SIZE, columnar: bool = False):
+    with open(Path(input_path), 'r', encoding='utf-8-sig') as fin:
+        return convert_records(iter_jsonl_records(fin), outdir, min_examples, workers, shard_size, columnar)
+
+def convert_pairs(pairs, outdir: Path, min_examples: int = 0):
+    """
+    Igual que convert(), pero alimentado en memoria con pares (text, yaml)
+    en lugar de leer training_data.jsonl. Produce la misma salida que
+    escribir esos pares a JSONL y llamar a convert().
+    """
+    records = ((i, text, yaml_text) for i, (text, yaml_text) in enumerate(pairs, start=1))
+    return convert_records(records, outdir, min_examples)
+
+def convert_records(records, outdir: Path, min_examples: int = 0, workers: int = 1,
+                    shard_size: int = DEFAULT_SHARD_SIZE, columnar: bool = False):
+    with LineDatasetWriter(outdir, columnar) as writer:
+        if workers > 1:
+            convert_sharded(records, writer, workers, shard_size)
+        else:
+            for i, src_text, src_yaml in records:
+                writer.add(i, src_text, src_yaml)
+    return writer.result
+
+def iter_shards(records, shard_size):
+    shard = []
+    for record in records:
+        shard.append(record)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+def convert_sharded(records, writer, workers, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Conversión en paralelo: cada shard de vacantes consecutivas se etiqueta y
+    se serializa en un proceso (convert_shard) y writer.merge_shard() une las
+    partes en orden. Solo hay en curso unos pocos shards por proceso.
+    """
+    parts_dir = tempfile.mkdtemp(prefix='.line_dataset_parts_', dir=writer.outdir)
+    pending = deque()
     try:
-        if re.search(r'\b' + re.escape(target_norm) + r'\b', line_norm):
-            return True
-    except re.error:
-        pass
-    return False
-
-def convert(input_path: Path, outdir: Path, min_examples: int = 0):
-    input_path = Path(input_path)
-    outdir = Path(outdir)
-    outdir.mkdir(parents=True, exist_ok=True)
-
-    jsonl_out = outdir / 'line_dataset.jsonl'
-    csv_out = outdir / 'line_dataset.csv'
-    review_out = outdir / 'line_dataset_review.jsonl'
-
-    total_examples = 0
-    label_counts = {"role":0, "company":0, "other":0}
-    review_items = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for n, shard in enumerate(iter_shards(records, shard_size)):
+                prefix = str(Path(parts_dir) / f'shard_{n:06d}')
+                pending.append((shard, prefix, pool.submit(convert_shard, shard, prefix)))
+                while len(pending) > workers * 2 or (pending and pending[0][2].done()):
+                    shard, prefix, future = pending.popleft()
+                    writer.merge_shard(shard, prefix, future.result())
+            while pending:
+                shard, prefix, future = pending.popleft()
+                writer.merge_shard(shard, prefix, future.result())
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
 
-    with open(input_path, 'r', encoding='utf-8-sig') as fin, \
-         open(jsonl_out, 'w', encoding='utf-8') as fout_jsonl, \
-         open(csv_out, 'w', encoding='utf-8', newline='') as fout_csv:
+def shard_parts(prefix):
+    """Rutas (líneas, revisión, csv) de las partes de un shard."""
+    return prefix + '.jsonl', prefix + '.review.jsonl', prefix + '.csv'
 
-        csv_writer = csv.writer(fout_csv)
-        csv_writer.writerow(['text','label','source_hash'])
+def convert_shard(records, prefix):
+    """
+    Tarea de un worker: etiqueta un shard y escribe sus partes (ver
+    shard_parts) como si ninguna línea llevara source_yaml; qué fuentes se
+    registran se decide al unir, en orden (LineDatasetWriter.merge_shard).
 
-        for i, line in enumerate(fin, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception as e:
-                print(f"Skipping invalid json line {i}: {e}")
+    Devuelve (metas, label_counts): por vacante, None si no tiene líneas o
+    (src_hash, caracteres de sus líneas, caracteres de su revisión, líneas,
+    líneas de revisión).
+    """
+    metas = []
+    label_counts = {"role":0, "company":0, "other":0}
+    lines_part, review_part, csv_part = shard_parts(prefix)
+    with open(lines_part, 'w', encoding='utf-8', newline='') as flines, \
+         open(review_part, 'w', encoding='utf-8', newline='') as freview, \
+         open(csv_part, 'w', encoding='utf-8', newline='') as fcsv:
+        csv_writer = csv.writer(fcsv)
+        for i, src_text, src_yaml in records:
+            labeled = label_source(src_text, src_yaml)
+            if labeled is None:
+                metas.append(None)
                 continue
-            src_text = obj.get('text','')
-            src_yaml = obj.get('yaml','')
-            cargo, empresa = extract_fields_from_yaml(src_yaml)
+            src_hash, lines, _, labels, review = labeled
+            lines_text = render_lines(i, labeled, range(len(lines)))
+            review_text = render_lines(i, labeled, review)
+            flines.write(lines_text)
+            freview.write(review_text)
+            csv_writer.writerows([ln, label, src_hash] for ln, label in zip(lines, labels))
+            for label in labels:
+                label_counts[label] = label_counts.get(label,0) + 1
+            metas.append((src_hash, len(lines_text), len(review_text), len(lines), len(review)))
+    return metas, label_counts
 
-            src_hash = sha1_hex(src_text)
+class LineDatasetWriter:
+    """
+    Escritura incremental del dataset de líneas: cada vacante (text, yaml) se
+    etiqueta y se escribe al agregarla, sin acumular la entrada ni los
+    candidatos a revisión. convert() y convert_pairs() escriben a través
+    de esta clase.
 
-            lines = simple_lines(src_text)
-            if not lines:
-                continue
+    Uso:
+      with LineDatasetWriter('data') as writer:
+          writer.add(1, texto, yaml_text)
+      writer.result   # {'jsonl': ..., 'total': ..., 'counts': {...}}
+    """
 
-            cargo_norm = normalize_text(cargo)
-            empresa_norm = normalize_text(empresa)
-
-            for idx, ln in enumerate(lines):
-                ln_norm = normalize_text(ln)
-                label = "other"
-                if cargo_norm and line_contains_target(ln_norm, cargo_norm):
-                    label = "role"
-                elif empresa_norm and line_contains_target(ln_norm, empresa_norm):
-                    label = "company"
-                else:
-                    if cargo_norm:
-                        cargo_tokens = cargo_norm.split()
-                        if all(tok in ln_norm for tok in cargo_tokens[:min(len(cargo_tokens),3)]):
-                            label = "role"
-                    if empresa_norm and label == "other":
-                        empresa_tokens = empresa_norm.split()
-                        if all(tok in ln_norm for tok in empresa_tokens[:min(len(empresa_tokens),3)]):
-                            label = "company"
-
-                item = {
-                    "line": ln,
-                    "line_norm": ln_norm,
-                    "label": label,
-                    "source_hash": src_hash,
-                    "source_yaml": src_yaml,
-                    "source_index": i,
-                    "line_index": idx
-                }
-                fout_jsonl.write(json.dumps(item, ensure_ascii=False) + "\n")
-                csv_writer.writerow([ln, label, src_hash])
-                total_examples += 1
-                label_counts[label] = label_counts.get(label,0) + 1
+    def __init__(self, outdir: Path, columnar: bool = False):
+        outdir = Path(outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        self.outdir = outdir
 
-                if label == "other" and (cargo_norm or empresa_norm):
-                    review_items.append(item)
-
-    with open(review_out, 'w', encoding='utf-8') as frev:
-        for it in review_items:
-            frev.write(json.dumps(it, ensure_ascii=False) + "\n")
-
-    print("Wrote:", jsonl_out)
-    print("Wrote:", csv_out)
-    print("Wrote review file:", review_out)
-    print("Total line examples:", total_examples)
-    print("Label counts:", label_counts)
-    print("Review candidates:", len(review_items))
-
-    return {
-        "jsonl": str(jsonl_out),
-        "csv": str(csv_out),
-        "review": str(review_out),
-        "total": total_examples,
-        "counts": label_counts
-    }
+        self.jsonl_out = outdir / 'line_dataset.jsonl'
+        self.csv_out = outdir / 'line_dataset.csv'
+        self.review_out = outdir / 'line_dataset_review.jsonl'
+        self.columnar = columnar
+
+        self.total_examples = 0
+        self.label_counts = {"role":0, "company":0, "other":0}
+        self.review_count = 0
+        self.result = None
+
+        self._lines = LineTableWriter(self.jsonl_out)
+        self._fout_csv = open(self.csv_out, 'w', encoding='utf-8', newline='')
+        self._review = LineTableWriter(self.review_out)
+
+        self._csv_writer = csv.writer(self._fout_csv)
+        self._csv_writer.writerow(['text','label','source_hash'])
+
+    def add(self, i, src_text, src_yaml):
+        labeled = label_source(src_text, src_yaml)
+        if labeled is None:
+            return
+        src_hash, lines, _, labels, review = labeled
+
+        # La vacante se escribe una vez en el archivo de fuentes; las líneas
+        # solo llevan source_yaml si el mismo texto ya tenía otro YAML
+        inline_yaml = None if self._lines.add_source(src_hash, src_text, src_yaml) else src_yaml
+        self._lines.write_lines(render_lines(i, labeled, range(len(lines)), inline_yaml), len(lines))
+        self._csv_writer.writerows([ln, label, src_hash] for ln, label in zip(lines, labels))
+        self.total_examples += len(lines)
+        for label in labels:
+            self.label_counts[label] = self.label_counts.get(label,0) + 1
+
+        if review:
+            review_yaml = None if self._review.add_source(src_hash, src_text, src_yaml) else src_yaml
+            self._review.write_lines(render_lines(i, labeled, review, review_yaml), len(review))
+            self.review_count += len(review)
+
+    def merge_shard(self, records, prefix, shard_result):
+        """
+        Une las partes de un shard escritas por convert_shard(), en el orden
+        de sus vacantes. Las fuentes se registran aquí; las vacantes cuyo
+        texto ya tenía otro YAML se vuelven a serializar con su source_yaml.
+        """
+        metas, label_counts = shard_result
+        lines_part, review_part, csv_part = shard_parts(prefix)
+        with open(lines_part, 'r', encoding='utf-8', newline='') as flines, \
+             open(review_part, 'r', encoding='utf-8', newline='') as freview, \
+             open(csv_part, 'r', encoding='utf-8', newline='') as fcsv:
+            for (i, src_text, src_yaml), meta in zip(records, metas):
+                if meta is None:
+                    continue
+                src_hash, lines_chars, review_chars, n_lines, n_review = meta
+                lines_text = flines.read(lines_chars)
+                review_text = freview.read(review_chars)
+                if not self._lines.add_source(src_hash, src_text, src_yaml):
+                    lines_text = render_lines(i, label_source(src_text, src_yaml), range(n_lines), src_yaml)
+                self._lines.write_lines(lines_text, n_lines)
+                if n_review:
+                    if not self._review.add_source(src_hash, src_text, src_yaml):
+                        labeled = label_source(src_text, src_yaml)
+                        review_text = render_lines(i, labeled, labeled[4], src_yaml)
+                    self._review.write_lines(review_text, n_review)
+                self.total_examples += n_lines
+                self.review_count += n_review
+            shutil.copyfileobj(fcsv, self._fout_csv)
+        for label, count in label_counts.items():
+            self.label_counts[label] = self.label_counts.get(label,0) + count
+        for part in (lines_part, review_part, csv_part):
+            Path(part).unlink()
+
+    def close(self):
+        if self.result is not None:
+            return self.result
+        self._lines.close()
+        self._fout_csv.close()
+        self._review.close()
+        # Las columnas se arman del JSONL ya cerrado (igual en serie y con --workers)
+        columns = write_columns(self.jsonl_out) if self.columnar else None
+
+        print("Wrote:", self.jsonl_out)
+        print("Wrote sources:", self._lines.sources_path)
+        print("Wrote:", self.csv_out)
+        print("Wrote review file:", self.review_out)
+        if columns is not None:
+            print("Wrote columns:", columns)
+        print("Total line examples:", self.total_examples)
+        print("Label counts:", self.label_counts)
+        print("Review candidates:", self.review_count)
+
+        self.result = {
+            "jsonl": str(self.jsonl_out),
+            "sources": str(self._lines.sources_path),
+            "csv": str(self.csv_out),
+            "review": str(self.review_out),
+            "total": self.total_examples,
+            "counts": self.label_counts
+        }
+        if columns is not None:
+            self.result["columns"] = str(columns)
+        return self.result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 def main():
     p = argparse.ArgumentParser(description="Convert training_data.jsonl -> line-level dataset")
     p.add_argument('--input', '-i', default='data/training_data.jsonl', help='Input JSONL file')
     p.add_argument('--outdir', '-o', default='data', help='Output directory')
     p.add_argument('--min-examples', type=int, default=0, help='Min examples filter (unused currently)')
+    p.add_argument('--workers', '-w', type=int, default=1,
+                   help='Procesos para la conversión; 1 = en serie (default: 1)')
+    p.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                   help=f'Vacantes por shard en modo paralelo (default: {DEFAULT_SHARD_SIZE})')
+    p.add_argument('--columnar', action='store_true',
+                   help='Escribir también line_dataset.columns/ (formato columnar .npy, requiere numpy)')
     args = p.parse_args()
 
-    res = convert(Path(args.input), Path(args.outdir), args.min_examples)
+    res = convert(Path(args.input), Path(args.outdir), args.min_examples, args.workers, args.shard_size,
+                  args.columnar)
     print("Done:", res)
 
 if __name__ == '__main__':
@@ -16,6 +16,9 @@ Uso:
 
 Salida:
   data/company_candidates.csv
+
+Si data/line_dataset.jsonl tiene columnas al día (line_columns.py), las líneas
+se leen de ahí en lugar de parsear el JSONL.
 """
 import re
 import csv
@@ -23,9 +26,10 @@ import json
 import argparse
 from pathlib import Path
 
-COMPANY_INDICATORS = re.compile(r'\b(inc|llc|ltda|ltd|corp|company|group|s\.a|sa|co)\b', re.I)
+from keyword_matcher import CATEGORY_COMPANY, CATEGORY_ROLE, VACANCY_KEYWORDS
+from line_columns import open_columns
+
 LOGO_RE = re.compile(r'\blogo\b', re.I)
-ROLE_KEYWORDS = re.compile(r'\b(analyst|engineer|developer|manager|consultant|scientist|coordinator|officer|specialist|administrator|architect|operations|data|insight|insights|analyt|analytics|analisis|analítica)\b', re.I)
 
 def is_titlecase_short(s):
     words = [w for w in s.split() if w]
@@ -37,52 +41,61 @@ def is_titlecase_short(s):
 def normalize_whitespace(s):
     return re.sub(r'\s+', ' ', s).strip()
 
+def iter_items(input_path):
+    columns = open_columns(input_path)
+    if columns is not None:
+        yield from columns.records()
+        return
+    with input_path.open('r', encoding='utf-8') as fin:
+        for line in fin:
+            try:
+                yield json.loads(line)
+            except Exception:
+                continue
+
 def extract(input_path, out_csv, limit=None, priority_top=False):
     input_path = Path(input_path)
     out_csv = Path(out_csv)
     rows = []
 
-    with input_path.open('r', encoding='utf-8') as fin:
-        for i, line in enumerate(fin):
-            if limit and len(rows) >= limit:
-                break
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            text = obj.get('line','').strip()
-            if not text:
-                continue
-            text_norm = normalize_whitespace(text)
-            reason = []
-            score = 0
-
-            if COMPANY_INDICATORS.search(text_norm):
-                reason.append("indicator")
-                score += 5
-            if LOGO_RE.search(text_norm):
-                reason.append("logo")
-                score += 3
-            # TitleCase heuristic but avoid typical role keywords
-            if is_titlecase_short(text_norm) and not ROLE_KEYWORDS.search(text_norm):
-                reason.append("titlecase")
-                score += 2
-
-            # deprioritize obvious noise
-            if re.search(r'\b(days?\s+ago|applicants?|applicant|remote|full-?time|part-?time|contract|easy apply|promoted|save|share)\b', text_norm, re.I):
-                reason.append("metadata")
-                score -= 5
-
-            if score > 0:
-                rows.append({
-                    "line": text,
-                    "label": obj.get("label","other"),
-                    "source_hash": obj.get("source_hash",""),
-                    "source_index": obj.get("source_index",""),
-                    "line_index": obj.get("line_index",""),
-                    "reason": "|".join(reason),
-                    "score": score
-                })
+    for obj in iter_items(input_path):
+        if limit and len(rows) >= limit:
+            break
+        text = obj.get('line','').strip()
+        if not text:
+            continue
+        text_norm = normalize_whitespace(text)
+        reason = []
+        score = 0
+
+        # Indicadores de empresa y keywords de rol en una sola pasada
+        keywords = VACANCY_KEYWORDS.categories(text_norm, [CATEGORY_COMPANY, CATEGORY_ROLE])
+        if CATEGORY_COMPANY in keywords:
+            reason.append("indicator")
+            score += 5
+        if LOGO_RE.search(text_norm):
+            reason.append("logo")
+            score += 3
+        # TitleCase heuristic but avoid typical role keywords
+        if is_titlecase_short(text_norm) and CATEGORY_ROLE not in keywords:
+            reason.append("titlecase")
+            score += 2
+
+        # deprioritize obvious noise
+        if re.search(r'\b(days?\s+ago|applicants?|applicant|remote|full-?time|part-?time|contract|easy apply|promoted|save|share)\b', text_norm, re.I):
+            reason.append("metadata")
+            score -= 5
+
+        if score > 0:
+            rows.append({
+                "line": text,
+                "label": obj.get("label","other"),
+                "source_hash": obj.get("source_hash",""),
+                "source_index": obj.get("source_index",""),
+                "line_index": obj.get("line_index",""),
+                "reason": "|".join(reason),
+                "score": score
+            })
 
     # sort by score desc, optionally prioritize smaller source_index (top-of-postings)
     rows.sort(key=lambda r: (-r['score'], int(r['source_index'] or 0) if r['source_index'] not in (None,"") else 999999))
@@ -14,14 +14,74 @@ Uso:
 """
 
 import argparse
+import contextlib
+import io
 import json
 import re
+import sys
 import yaml
 import unicodedata
-import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional, Pattern, Sequence
+
+from block_scanner import BlockScanner, HeadingIndex, ScannedBlock
+from block_watcher import DEFAULT_POLL_INTERVAL, BlockWatcher, watch
+from convert_to_line_dataset import LineDatasetWriter
+from extraction_cache import ExtractionCache, block_hash, fingerprint_of
+from jsonl_sink import JsonlSink
+from extraction_pipeline import (STRATEGY_FIELDS, STRATEGY_LABELS, ExtractionPipeline,
+                                 ExtractionStrategy, FieldValue, build_strategy, parse_strategy_names)
+from output_manifest import (STATUS_UNCHANGED, OutputManifest, classify_output,
+                             new_output_counts)
+from regex_guard import (DEFAULT_BLOCK_BUDGET, RegexGuard, merge_fallbacks,
+                         merge_pattern_stats, summarize_pattern_stats)
+from vacancy_blocks import iter_blocks
+
+
+# Flags comunes a todos los patrones de campos
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Tamaño de bloque (vacantes por tarea) en modo paralelo
+DEFAULT_CHUNK_SIZE = 32
+
+# Bloques más cortos que esto se ignoran
+MIN_BLOCK_LENGTH = 50
+
+
+class PatternRegistry:
+    """
+    Registro de patrones de campos compilados una sola vez.
+    
+    Conserva el orden de cada lista: el primer patrón que produce un valor
+    aceptable gana, igual que al iterar las cadenas originales.
+    """
+    
+    def __init__(self, patterns: Dict[str, List[str]], flags: int = PATTERN_FLAGS):
+        """
+        Compila los patrones agrupados por campo.
+        
+        Args:
+            patterns: Diccionario campo -> lista de patrones regex (en orden de prioridad)
+            flags: Flags de compilación
+        """
+        self.flags = flags
+        self._compiled: Dict[str, Tuple[Pattern, ...]] = {
+            field: tuple(re.compile(p, flags) for p in field_patterns)
+            for field, field_patterns in patterns.items()
+        }
+    
+    def get(self, field_name: str) -> Tuple[Pattern, ...]:
+        """Devuelve los patrones compilados de un campo (tupla vacía si no existe)."""
+        return self._compiled.get(field_name, ())
+    
+    def fields(self) -> List[str]:
+        """Devuelve los campos registrados."""
+        return list(self._compiled)
 
 
 class VacancyExtractor:
@@ -58,22 +118,131 @@ class VacancyExtractor:
         ],
     }
     
-    def __init__(self, verbose: bool = True):
+    # Incrementar al cambiar la lógica de extracción (invalida la caché)
+    EXTRACTOR_VERSION = 1
+    
+    # Si extract_batch procesa varios bloques a la vez (también en serie se
+    # agrupan en chunks)
+    BATCHED = False
+    
+    # Patrones compilados al cargar la clase (evita re.search sobre cadenas y
+    # la caché interna de `re` en cada bloque)
+    COMPILED_PATTERNS = PatternRegistry(PATTERNS)
+    
+    # Patrones auxiliares usados por las heurísticas de respaldo
+    NUMBERED_PREFIX_RE = re.compile(r'(?:^|\n)(\d+\.)\s*', re.MULTILINE)
+    BULLET_RE = re.compile(r'(?:^|\n)[\-•*]\s*(.+)', re.MULTILINE)
+    NUMBERED_ITEM_RE = re.compile(r'(?:^|\n)(\d+[.\)]\s*.+?)(?=\n\d+[.\)]|\n\n|$)', re.MULTILINE | re.DOTALL)
+    NUMBER_STRIP_RE = re.compile(r'^\d+[.\)]\s*')
+    MUST_HAVE_RE = re.compile(r'(?:must have|requirements|requisitos):\s*(.+?)(?=\n\n|$)', re.IGNORECASE | re.DOTALL)
+    EMPRESA_FALLBACK_RE = re.compile(r'\b([A-Z][A-Za-z0-9]+(?:\s+[A-Z][A-Za-z0-9]+){0,3}(?:\s+(?:Inc|Corp|Ltd|SA|SAS|Group|Solutions|Services|Technologies|Global))?)\b')
+    ROLE_WORD_RE = re.compile(r'\b(developer|engineer|analyst|manager|specialist|coordinator)\b', re.IGNORECASE)
+    
+    # Disparadores del escaneo de una pasada: nombre -> (regex, retroceso).
+    # Una coincidencia del patrón asociado no puede empezar antes de
+    # (primera aparición del disparador - retroceso), así que si el disparador
+    # no aparece el patrón se omite y, si aparece, se busca desde ahí.
+    TRIGGERS = {
+        'label_cargo': (r'(?:cargo|puesto|posición|position|rol|role|título|title):', 0),
+        'intro_cargo': (r'(?:buscamos|seeking|looking for|hiring|contratamos)\s', 0),
+        'label_empresa': (r'(?:empresa|company|organization|organización|cliente):', 0),
+        # [A-Z] + {2,40} caracteres antes del sufijo
+        'suffix_empresa': (r'(?:Inc|Corp|Ltd|S\.?A|SAS|Group|Solutions|Services|Technologies|Global)\.?\s+(?:está|is|busca|looking)', 41),
+        'label_fecha': (r'(?:fecha|date|publicado|published|start date):', 0),
+        'label_modalidad': (r'(?:modalidad|work mode|modo de trabajo):', 0),
+        'label_requerimientos': (r'(?:requerimientos|requirements|requisitos|qualifications|skills|must have):', 0),
+        'label_descripcion': (r'(?:descripción|description|sobre el puesto|about the (?:role|position)|job description|what you\'ll do):', 0),
+    }
+    
+    # (campo, índice en PATTERNS) -> disparador
+    PATTERN_TRIGGERS = {
+        ('cargo', 0): 'label_cargo',
+        ('cargo', 2): 'intro_cargo',
+        ('empresa', 0): 'label_empresa',
+        ('empresa', 2): 'suffix_empresa',
+        ('fecha', 0): 'label_fecha',
+        ('fecha', 1): 'label_fecha',
+        ('modalidad', 0): 'label_modalidad',
+        ('requerimientos', 0): 'label_requerimientos',
+        ('descripcion', 0): 'label_descripcion',
+    }
+    
+    # Encabezados de sección (al inicio de línea, seguidos de ':' o fin de línea)
+    SECTION_HEADINGS = [
+        (r'requerimientos|requirements|requisitos|qualifications|required skills|skills|must have', 'requerimientos'),
+        (r'responsabilidades(?: principales| clave)?|key responsibilities|responsibilities|what you[\'’]ll do|lo que harás', 'responsabilidades'),
+        (r'job description|descripción|description|sobre el puesto|about the (?:role|position|job)', 'descripcion'),
+        (r'beneficios|benefits|what we offer|ofrecemos', 'beneficios'),
+    ]
+    SECTION_INDEX = HeadingIndex(
+        SECTION_HEADINGS,
+        re.IGNORECASE | re.MULTILINE,
+        prefix=r'^[ \t]*(?:[-•*#]+[ \t]*)?',
+        suffix=r'[ \t]*(?::|$)',
+    )
+    
+    SCANNER = BlockScanner({name: pattern for name, (pattern, _) in TRIGGERS.items()},
+                           heading_index=SECTION_INDEX)
+    
+    # Escáner sin los disparadores de cargo/empresa, para bloques en los que
+    # ambos campos ya vienen decididos (preset) y sus patrones no se ejecutan
+    FIELD_SCANNER = BlockScanner({name: pattern for name, (pattern, _) in TRIGGERS.items()
+                                  if name not in ('label_cargo', 'intro_cargo', 'label_empresa', 'suffix_empresa')},
+                                 heading_index=SECTION_INDEX)
+    
+    def __init__(self, verbose: bool = True, include_sections: bool = False,
+                 regex_budget: float = DEFAULT_BLOCK_BUDGET, profile_patterns: bool = False,
+                 strategies: Sequence[str] = (STRATEGY_LABELS,)):
         """
         Inicializa el extractor.
         
         Args:
             verbose: Si debe imprimir información detallada
+            include_sections: Si debe agregar las secciones detectadas
+                              (campo 'secciones') a cada vacante
+            regex_budget: Segundos de regex permitidos por bloque antes de
+                          pasar a la estrategia por líneas (ver regex_guard)
+            profile_patterns: Si debe registrar coincidencias, fallos y tiempo
+                              por patrón y el uso de cada heurística de respaldo
+            strategies: Estrategias de cargo/empresa en orden de prioridad
+                        (ver extraction_pipeline): 'etiquetas', 'linkedin'
         """
         self.verbose = verbose
+        self.include_sections = include_sections
+        self.regex_budget = regex_budget
+        self.profile_patterns = profile_patterns
+        self.strategies = list(strategies)
+        self.guard = RegexGuard(block_budget=regex_budget, profile=profile_patterns)
+        self.pipeline = ExtractionPipeline([
+            LabelPatternStrategy(self) if name == STRATEGY_LABELS else build_strategy(name)
+            for name in self.strategies
+        ])
         self.stats = {
             'processed': 0,
             'successful': 0,
             'failed': 0,
             'fields_extracted': {},
             'fields_missing': {},
+            'cache_hits': 0,
+            # Archivos escritos nuevos / modificados y sin cambios (no reescritos)
+            'output_files': new_output_counts(),
+            # Patrón -> veces que se usó la estrategia por líneas
+            'regex_fallbacks': self.guard.fallbacks,
+            # Solo con profile_patterns: patrón -> hits/misses/skipped/seconds
+            'pattern_profile': self.guard.pattern_stats,
+            # Solo con profile_patterns: 'campo:estrategia' -> veces que decidió el campo
+            'extraction_paths': {},
         }
     
+    def fingerprint(self) -> str:
+        """
+        Huella del extractor para la caché: cambia al modificar PATTERNS,
+        SECTION_HEADINGS, las opciones de salida, las estrategias o al
+        incrementar EXTRACTOR_VERSION.
+        """
+        return fingerprint_of(type(self).__name__, self.EXTRACTOR_VERSION, self.PATTERNS,
+                              self.SECTION_HEADINGS, self.include_sections, self.strategies)
+    
     def normalize_for_filename(self, text: str, max_length: int = 50) -> str:
         """
         Normaliza texto para usar en nombres de archivo.
@@ -108,32 +277,40 @@ class VacancyExtractor:
         
         return text.strip('_') or "sin_dato"
     
-    def extract_field(self, text: str, field_name: str) -> Optional[str]:
+    def extract_field(self, text: str, field_name: str, scan: Optional[ScannedBlock] = None) -> Optional[str]:
         """
         Extrae un campo específico del texto usando patrones regex.
         
         Args:
             text: Texto completo de la vacante
             field_name: Nombre del campo a extraer
+            scan: Escaneo del bloque (opcional); permite omitir patrones cuyo
+                  disparador no aparece y buscar desde su primera aparición
             
         Returns:
             Valor extraído o None
         """
-        patterns = self.PATTERNS.get(field_name, [])
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        for idx, pattern in enumerate(self.COMPILED_PATTERNS.get(field_name)):
+            pos = 0
+            trigger = self.PATTERN_TRIGGERS.get((field_name, idx)) if scan is not None else None
+            if trigger:
+                anchor = scan.anchor(trigger)
+                if anchor is None:
+                    self.guard.record_skip(f'{field_name}[{idx}]')
+                    continue
+                pos = max(0, anchor - self.TRIGGERS[trigger][1])
+            match = self.guard.search(f'{field_name}[{idx}]', pattern, text, pos)
             if match:
                 value = match.group(1).strip()
                 if value:
                     # Limpiar el valor extraído
-                    value = re.sub(r'\s+', ' ', value)
+                    value = WHITESPACE_RE.sub(' ', value)
                     if len(value) > 5 or field_name in ['fecha', 'modalidad']:
                         return value
         
         return None
     
-    def extract_description(self, text: str, found_fields: Dict) -> str:
+    def extract_description(self, text: str, found_fields: Dict, scan: Optional[ScannedBlock] = None) -> str:
         """
         Extrae la descripción del puesto. Si no se encuentra con patrones,
         usa el texto completo excluyendo otros campos ya extraídos.
@@ -141,71 +318,106 @@ class VacancyExtractor:
         Args:
             text: Texto completo
             found_fields: Campos ya extraídos
+            scan: Escaneo del bloque (opcional)
             
         Returns:
             Descripción extraída
         """
+        if scan is None:
+            scan = self.SCANNER.scan(text)
+        
         # Intentar con patrones primero
-        desc = self.extract_field(text, 'descripcion')
+        desc = self.extract_field(text, 'descripcion', scan)
         if desc and len(desc) > 50:
+            self.record_path('descripcion', 'patron')
             return desc
         
         # Si no, usar una heurística: tomar el bloque más grande de texto
-        paragraphs = [p.strip() for p in text.split('\n\n') if len(p.strip()) > 50]
+        paragraphs = [p for p in scan.paragraphs() if len(p) > 50]
         if paragraphs:
+            self.record_path('descripcion', 'parrafo_mas_largo')
             return max(paragraphs, key=len)
         
         # Como último recurso, tomar las primeras líneas
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        lines = scan.nonblank_lines
         if len(lines) >= 3:
+            self.record_path('descripcion', 'primeras_lineas')
             return '\n'.join(lines[:min(10, len(lines))])
         
+        self.record_path('descripcion', 'texto_inicial')
         return text[:500] if text else "Sin descripción disponible"
     
-    def extract_requirements(self, text: str) -> str:
+    def extract_requirements(self, text: str, scan: Optional[ScannedBlock] = None) -> str:
         """
         Extrae los requerimientos de la vacante.
         
         Args:
             text: Texto completo
+            scan: Escaneo del bloque (opcional)
             
         Returns:
             Requerimientos extraídos
         """
+        if scan is None:
+            scan = self.SCANNER.scan(text)
+        
         # Intentar con patrones primero
-        reqs = self.extract_field(text, 'requerimientos')
+        reqs = self.extract_field(text, 'requerimientos', scan)
         if reqs and len(reqs) > 20:
             # Normalizar formato de bullets si es necesario
-            reqs = re.sub(r'(?:^|\n)(\d+\.)\s*', r'\n- ', reqs, flags=re.MULTILINE)
+            reqs = self.NUMBERED_PREFIX_RE.sub(r'\n- ', reqs)
+            self.record_path('requerimientos', 'patron')
             return reqs
         
-        # Buscar listas con bullets
-        bullet_pattern = r'(?:^|\n)[\-•*]\s*(.+)'
-        bullets = re.findall(bullet_pattern, text, re.MULTILINE)
-        if bullets and len(bullets) >= 2:
-            return '\n'.join([f"- {b.strip()}" for b in bullets])
-        
-        # Buscar secciones numeradas
-        numbered_pattern = r'(?:^|\n)(\d+[.\)]\s*.+?)(?=\n\d+[.\)]|\n\n|$)'
-        numbered_matches = re.findall(numbered_pattern, text, re.MULTILINE | re.DOTALL)
-        if numbered_matches and len(numbered_matches) >= 2:
-            reqs_list = []
-            for match in numbered_matches:
-                # Limpiar y formatear
-                clean = re.sub(r'^\d+[.\)]\s*', '', match.strip())
-                if clean:
-                    reqs_list.append(f"- {clean}")
-            if reqs_list:
-                return '\n'.join(reqs_list)
-        
-        # Buscar sección "Must have" o similar
-        must_have_pattern = r'(?:must have|requirements|requisitos):\s*(.+?)(?=\n\n|$)'
-        must_have = re.search(must_have_pattern, text, re.IGNORECASE | re.DOTALL)
-        if must_have:
-            return must_have.group(1).strip()
-        
+        # Buscar listas con bullets (cada coincidencia empieza en una línea con viñeta)
+        if scan.bullet_count >= 2:
+            bullets = self.guard.findall('bullets', self.BULLET_RE, text)
+            if bullets and len(bullets) >= 2:
+                self.record_path('requerimientos', 'vinetas')
+                return '\n'.join([f"- {b.strip()}" for b in bullets])
+        
+        # Buscar secciones numeradas (cada coincidencia empieza en una línea numerada)
+        if scan.numbered_count >= 2:
+            numbered_matches = self.guard.findall('numbered_items', self.NUMBERED_ITEM_RE, text)
+            if numbered_matches and len(numbered_matches) >= 2:
+                reqs_list = []
+                for match in numbered_matches:
+                    # Limpiar y formatear
+                    clean = self.NUMBER_STRIP_RE.sub('', match.strip())
+                    if clean:
+                        reqs_list.append(f"- {clean}")
+                if reqs_list:
+                    self.record_path('requerimientos', 'numerados')
+                    return '\n'.join(reqs_list)
+        
+        # Buscar sección "Must have" o similar (sus etiquetas son un subconjunto
+        # de las de requerimientos)
+        anchor = scan.anchor('label_requerimientos')
+        if anchor is not None:
+            must_have = self.guard.search('must_have', self.MUST_HAVE_RE, text, anchor)
+            if must_have:
+                self.record_path('requerimientos', 'must_have')
+                return must_have.group(1).strip()
+        
+        self.record_path('requerimientos', 'ninguno')
         return "No se pudieron extraer requerimientos específicos"
     
+    def extract_sections(self, text: str, scan: Optional[ScannedBlock] = None) -> List[Dict]:
+        """
+        Extrae las secciones de la vacante a partir del índice de encabezados
+        (Requerimientos, Responsabilidades, What You'll Do, Descripción, ...).
+        
+        Args:
+            text: Texto completo
+            scan: Escaneo del bloque (opcional)
+            
+        Returns:
+            Lista de secciones con 'tipo', 'titulo', 'offset' y 'contenido'
+        """
+        if scan is None:
+            scan = self.SCANNER.scan(text)
+        return [section.to_dict() for section in scan.sections()]
+    
     def normalize_date(self, date_str: str) -> str:
         """
         Normaliza la fecha al formato YYYY-MM-DD.
@@ -241,57 +453,88 @@ class VacancyExtractor:
             print(f"   ⚠️  No se pudo parsear fecha '{date_str}', usando fecha actual")
         return datetime.now().strftime('%Y-%m-%d')
     
-    def extract_vacancy_fields(self, text: str) -> Dict:
+    def extract_vacancy_fields(self, text: str, preset: Optional[Dict] = None) -> Dict:
         """
         Extrae todos los campos clave de una vacante.
         
         Args:
             text: Texto completo de la vacante
+            preset: Valores de cargo/empresa ya decididos por otra estrategia
+                    (p. ej. el clasificador de líneas); los vacíos se extraen
+                    con los patrones
             
         Returns:
             Diccionario con los campos extraídos
         """
         fields = {}
+        preset = preset or {}
         
-        # Extraer campos básicos
-        fields['cargo'] = self.extract_field(text, 'cargo')
-        fields['empresa'] = self.extract_field(text, 'empresa')
+        # Escanear el bloque una sola vez; todos los campos consultan este escaneo
+        scanner = self.FIELD_SCANNER if all(preset.get(f) for f in STRATEGY_FIELDS) else self.SCANNER
+        scan = scanner.scan(text)
+        self.guard.begin(text)
         
-        # Si no se encontró cargo, intentar con la primera línea no vacía
-        if not fields['cargo']:
-            lines = [l.strip() for l in text.split('\n') if l.strip()]
-            if lines:
-                first_line = lines[0]
-                # Si la primera línea es corta y parece un título, usarla
-                if len(first_line) < 100 and not first_line.endswith('.'):
-                    fields['cargo'] = first_line.strip()
-        
-        # Si no se encontró empresa, buscar en las primeras líneas
-        if not fields['empresa']:
-            # Buscar patrones como "TechCorp Solutions", "DataMind Inc"
-            empresa_match = re.search(r'\b([A-Z][A-Za-z0-9]+(?:\s+[A-Z][A-Za-z0-9]+){0,3}(?:\s+(?:Inc|Corp|Ltd|SA|SAS|Group|Solutions|Services|Technologies|Global))?)\b', text)
-            if empresa_match:
-                candidate = empresa_match.group(1).strip()
-                # Validar que no sea un cargo común
-                if not re.search(r'\b(developer|engineer|analyst|manager|specialist|coordinator)\b', candidate, re.IGNORECASE):
-                    fields['empresa'] = candidate
+        # Cargo y empresa: estrategias del pipeline sobre el mismo escaneo
+        for field, result in self.pipeline.run(scan, preset).items():
+            fields[field] = result.value
+            self.record_path(field, result.path)
         
-        fecha_raw = self.extract_field(text, 'fecha')
+        fecha_raw = self.extract_field(text, 'fecha', scan)
         fields['fecha'] = self.normalize_date(fecha_raw) if fecha_raw else datetime.now().strftime('%Y-%m-%d')
-        fields['modalidad'] = self.extract_field(text, 'modalidad')
+        fields['modalidad'] = self.extract_field(text, 'modalidad', scan)
         
         # Extraer descripción y requerimientos (más complejos)
-        fields['descripcion'] = self.extract_description(text, fields)
-        fields['requerimientos'] = self.extract_requirements(text)
+        fields['descripcion'] = self.extract_description(text, fields, scan)
+        fields['requerimientos'] = self.extract_requirements(text, scan)
+        
+        # Secciones estructuradas (encabezado, offset y contenido)
+        if self.include_sections:
+            fields['secciones'] = self.extract_sections(text, scan)
         
         # Actualizar estadísticas
+        self.count_fields(fields)
+        
+        return fields
+    
+    def record_path(self, field: str, path: str):
+        """
+        Registra qué estrategia decidió un campo (solo con profile_patterns).
+        
+        Args:
+            field: Nombre del campo
+            path: Estrategia usada ('patron', 'primera_linea', 'vinetas', ...)
+        """
+        if not self.profile_patterns:
+            return
+        paths = self.stats['extraction_paths']
+        key = f'{field}:{path}'
+        paths[key] = paths.get(key, 0) + 1
+    
+    def extract_batch(self, blocks: List[str]) -> List[Dict]:
+        """
+        Extrae los campos de varios bloques. Las subclases que procesan por
+        lotes (ver ml_extractor) la redefinen; aquí es bloque a bloque.
+        
+        Args:
+            blocks: Textos de las vacantes
+            
+        Returns:
+            Lista de campos en el mismo orden
+        """
+        return [self.extract_vacancy_fields(block) for block in blocks]
+    
+    def count_fields(self, fields: Dict):
+        """
+        Actualiza los contadores de campos extraídos/faltantes de una vacante.
+        
+        Args:
+            fields: Campos de la vacante
+        """
         for field, value in fields.items():
             if value and value != "Sin descripción disponible":
                 self.stats['fields_extracted'][field] = self.stats['fields_extracted'].get(field, 0) + 1
             else:
                 self.stats['fields_missing'][field] = self.stats['fields_missing'].get(field, 0) + 1
-        
-        return fields
     
     def generate_filename(self, fields: Dict) -> str:
         """
@@ -309,87 +552,246 @@ class VacancyExtractor:
         
         return f"{cargo}_{empresa}_{fecha}.yaml"
     
-    def save_yaml(self, fields: Dict, output_path: Path) -> bool:
+    def save_yaml(self, fields: Dict, output_path: Path, manifest: Optional[OutputManifest] = None,
+                  source_hash: Optional[str] = None) -> Optional[str]:
         """
-        Guarda los campos extraídos en un archivo YAML.
+        Guarda los campos extraídos en un archivo YAML. Si el archivo ya
+        existe con el mismo contenido no se reescribe.
         
         Args:
             fields: Campos extraídos
             output_path: Ruta del archivo de salida
+            manifest: Manifiesto del directorio de salida (opcional; sin él
+                      se compara con el archivo en disco)
+            source_hash: Hash del bloque de origen, para el manifiesto
             
         Returns:
-            True si se guardó exitosamente
+            Estado del archivo ('new', 'changed' o 'unchanged', ver
+            output_manifest) o None si no se pudo guardar
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                yaml.dump(fields, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-            return True
+            data = yaml.dump(fields, allow_unicode=True, default_flow_style=False,
+                             sort_keys=False).encode('utf-8')
+            if manifest is not None:
+                status = manifest.classify(output_path.name, data)
+            else:
+                status = classify_output(output_path, data)
+            if status != STATUS_UNCHANGED:
+                with open(output_path, 'wb') as f:
+                    f.write(data)
+            if manifest is not None:
+                manifest.record(output_path.name, data, source_hash=source_hash)
+            self.stats['output_files'][status] += 1
+            return status
         except Exception as e:
             if self.verbose:
                 print(f"   ❌ Error al guardar {output_path}: {e}")
-            return False
+            return None
+    
+    def worker_options(self) -> Dict:
+        """Opciones con las que se crea el extractor de cada worker."""
+        return {
+            'include_sections': self.include_sections,
+            'regex_budget': self.regex_budget,
+            'profile_patterns': self.profile_patterns,
+            'strategies': self.strategies,
+        }
+    
+    def merge_field_stats(self, field_stats: Dict):
+        """
+        Suma los contadores de campos de otro extractor (p. ej. de un worker).
+        
+        Args:
+            field_stats: Diccionario con 'fields_extracted', 'fields_missing',
+                         'regex_fallbacks', 'pattern_profile' y 'extraction_paths'
+        """
+        for key in ('fields_extracted', 'fields_missing'):
+            target = self.stats[key]
+            for field, count in field_stats.get(key, {}).items():
+                target[field] = target.get(field, 0) + count
+        merge_fallbacks(self.stats['regex_fallbacks'], field_stats.get('regex_fallbacks'))
+        merge_pattern_stats(self.stats['pattern_profile'], field_stats.get('pattern_profile'))
+        merge_fallbacks(self.stats['extraction_paths'], field_stats.get('extraction_paths'))
     
-    def process_text_file(self, input_file: Path, output_dir: Path) -> List[Dict]:
+    def iter_extracted(self, blocks: Iterator[Tuple[int, str]], workers: int = 1,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       cache: Optional[ExtractionCache] = None) -> Iterator[Tuple[int, int, str, Dict, Optional[str]]]:
+        """
+        Extrae los campos de cada bloque, en serie o con un pool de procesos.
+        El orden de salida es siempre el orden de entrada. Los bloques presentes
+        en la caché no se vuelven a extraer.
+        
+        Args:
+            blocks: Iterador de tuplas (offset, bloque)
+            workers: Número de procesos (1 = en serie)
+            chunk_size: Vacantes por tarea enviada a cada proceso
+            cache: Caché de extracción (opcional)
+            
+        Yields:
+            Tuplas (numero_de_bloque, offset, bloque, campos, filename_en_cache)
+            donde filename_en_cache es None si el bloque se extrajo de nuevo
+        """
+        def candidates():
+            for i, (offset, block) in enumerate(blocks, 1):
+                if len(block) < MIN_BLOCK_LENGTH:  # Ignorar bloques muy pequeños
+                    continue
+                hit = cache.get(block_hash(block)) if cache is not None else None
+                if hit:
+                    self.stats['cache_hits'] += 1
+                    self.count_fields(hit[1])
+                yield i, offset, block, hit
+        
+        if workers <= 1 and not self.BATCHED:
+            for i, offset, block, hit in candidates():
+                if hit:
+                    yield i, offset, block, hit[1], hit[0]
+                else:
+                    yield i, offset, block, self.extract_vacancy_fields(block), None
+            return
+        
+        def chunks():
+            chunk = []
+            for item in candidates():
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        if workers <= 1:
+            # Extractor por lotes en serie: un lote por chunk, en este proceso
+            for chunk in chunks():
+                to_extract = [block for _, _, block, hit in chunk if not hit]
+                extracted = iter(self.extract_batch(to_extract))
+                for i, offset, block, hit in chunk:
+                    if hit:
+                        yield i, offset, block, hit[1], hit[0]
+                    else:
+                        yield i, offset, block, next(extracted), None
+            return
+        
+        # Se limita el número de tareas en vuelo para no materializar toda la entrada
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks():
+                to_extract = [block for _, _, block, hit in chunk if not hit]
+                future = (executor.submit(_extract_chunk, to_extract, type(self), self.worker_options())
+                          if to_extract else None)
+                pending.append((chunk, future))
+                if len(pending) < workers * 2:
+                    continue
+                yield from self._collect_chunk(*pending.popleft())
+            while pending:
+                yield from self._collect_chunk(*pending.popleft())
+    
+    def _collect_chunk(self, chunk: List[Tuple], future) -> Iterator[Tuple[int, int, str, Dict, Optional[str]]]:
+        """Espera el resultado de un chunk, fusiona sus estadísticas y lo entrega en orden."""
+        extracted = iter(())
+        if future is not None:
+            fields_list, field_stats = future.result()
+            self.merge_field_stats(field_stats)
+            extracted = iter(fields_list)
+        for i, offset, block, hit in chunk:
+            if hit:
+                yield i, offset, block, hit[1], hit[0]
+            else:
+                yield i, offset, block, next(extracted), None
+    
+    def process_text_file(self, input_file: Path, output_dir: Path, workers: int = 1,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          cache: Optional[ExtractionCache] = None,
+                          blocks: Optional[Iterable[Tuple[int, str]]] = None,
+                          sinks: Sequence = ()) -> List[Dict]:
         """
         Procesa un archivo de texto con una o más vacantes.
         Las vacantes pueden estar separadas por líneas vacías dobles o '---'.
         
+        Con sinks (objetos con write(vacante), p. ej. DatasetSink y
+        ReportCollector), cada vacante se entrega a los sinks en cuanto se
+        guarda su YAML y no se acumula: la memoria no depende del tamaño
+        del lote.
+        
         Args:
             input_file: Archivo de entrada
             output_dir: Directorio de salida
+            workers: Número de procesos para la extracción (1 = en serie)
+            chunk_size: Vacantes por tarea en modo paralelo
+            cache: Caché de extracción; los bloques sin cambios cuyo YAML ya
+                   existe en output_dir no se extraen ni se reescriben
+            blocks: Bloques (offset, texto) a procesar; por defecto todos los
+                    del archivo (el modo watch pasa solo los nuevos)
+            sinks: Destinos de las vacantes procesadas (opcional)
             
         Returns:
-            Lista de vacantes procesadas
+            Lista de vacantes procesadas (vacía si se pasan sinks)
         """
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Dividir por '---' o por bloques separados por líneas vacías dobles
-        if '---' in content:
-            blocks = [b.strip() for b in content.split('---') if b.strip()]
-        else:
-            blocks = [b.strip() for b in re.split(r'\n\s*\n\s*\n', content) if b.strip()]
-        
-        if not blocks:
-            blocks = [content.strip()]
-        
         if self.verbose:
             print(f"\n📄 Archivo: {input_file}")
-            print(f"📊 Bloques detectados: {len(blocks)}")
             print("\n" + "="*70)
             print("EXTRACCIÓN DE CAMPOS")
             print("="*70 + "\n")
         
         processed_vacancies = []
-        
-        for i, block in enumerate(blocks, 1):
-            if len(block) < 50:  # Ignorar bloques muy pequeños
-                continue
-            
+        if sinks:
+            def deliver(vacancy):
+                for sink in sinks:
+                    sink.write(vacancy)
+        else:
+            deliver = processed_vacancies.append
+        block_counter = {'total': 0}
+        # Los YAML con contenido idéntico no se reescriben (ver output_manifest)
+        manifest = OutputManifest(output_dir)
+        
+        def counted_blocks():
+            # Dividir por '---' o por bloques separados por líneas vacías dobles,
+            # leyendo el archivo en streaming (un bloque a la vez)
+            for item in (iter_blocks(input_file) if blocks is None else blocks):
+                block_counter['total'] += 1
+                yield item
+        
+        for i, offset, block, fields, cached_filename in self.iter_extracted(
+                counted_blocks(), workers, chunk_size, cache):
             self.stats['processed'] += 1
             
             if self.verbose:
-                print(f"📋 Procesando vacante {i}/{len(blocks)}...")
+                print(f"📋 Procesando vacante {i} (byte {offset})...")
             
-            # Extraer campos
-            fields = self.extract_vacancy_fields(block)
+            # Bloque sin cambios cuyo YAML ya existe: no se reescribe
+            if cached_filename and (output_dir / cached_filename).exists():
+                self.stats['successful'] += 1
+                deliver({
+                    'fields': fields,
+                    'filename': cached_filename,
+                    'original_text': block
+                })
+                if self.verbose:
+                    print(f"   ♻️  Sin cambios (caché): {cached_filename}")
+                continue
             
             # Generar nombre de archivo
-            filename = self.generate_filename(fields)
+            filename = cached_filename or self.generate_filename(fields)
             output_path = output_dir / filename
             
-            # Guardar YAML
-            if self.save_yaml(fields, output_path):
+            # Guardar YAML (sin reescribirlo si el contenido no cambió)
+            source_hash = block_hash(block)
+            status = self.save_yaml(fields, output_path, manifest, source_hash)
+            if status:
                 self.stats['successful'] += 1
-                processed_vacancies.append({
+                if cache is not None and not cached_filename:
+                    cache.put(source_hash, filename, fields)
+                deliver({
                     'fields': fields,
                     'filename': filename,
                     'original_text': block
                 })
                 if self.verbose:
-                    print(f"   ✅ Guardado: {filename}")
+                    if status == STATUS_UNCHANGED:
+                        print(f"   ⏸️  Sin cambios (contenido idéntico): {filename}")
+                    else:
+                        print(f"   ✅ Guardado: {filename}")
                     print(f"   📌 Cargo: {fields.get('cargo') or 'NO EXTRAÍDO'}")
                     print(f"   🏢 Empresa: {fields.get('empresa') or 'NO EXTRAÍDO'}")
                     print(f"   📅 Fecha: {fields.get('fecha')}")
@@ -397,17 +799,85 @@ class VacancyExtractor:
                         print(f"   🌐 Modalidad: {fields.get('modalidad')}")
             else:
                 self.stats['failed'] += 1
+        manifest.save()
+        
+        if self.verbose:
+            print(f"\n📊 Bloques detectados: {block_counter['total']}")
         
         return processed_vacancies
     
-    def generate_report(self, vacancies: List[Dict], output_dir: Path, dataset_result: Optional[Dict] = None):
+    def report_entry(self, vacancy: Dict) -> Dict:
+        """
+        Resumen de una vacante procesada para el reporte (campos principales,
+        largos y puntaje de calidad), sin su texto original.
+        
+        Args:
+            vacancy: Vacante procesada ('fields', 'filename', 'original_text')
+            
+        Returns:
+            Diccionario con la información de la vacante para el reporte
+        """
+        fields = vacancy['fields']
+        vacancy_info = {
+            'filename': vacancy['filename'],
+            'cargo': fields.get('cargo'),
+            'empresa': fields.get('empresa'),
+            'fecha': fields.get('fecha'),
+            'modalidad': fields.get('modalidad'),
+            'has_descripcion': bool(fields.get('descripcion')),
+            'has_requerimientos': bool(fields.get('requerimientos')),
+            'original_length': len(vacancy['original_text']),
+            'descripcion_length': len(fields.get('descripcion', '')),
+            'requerimientos_length': len(fields.get('requerimientos', '')),
+        }
+        
+        # Calcular métricas de calidad
+        quality_score = 0
+        quality_notes = []
+        
+        if fields.get('cargo'):
+            quality_score += 20
+        else:
+            quality_notes.append("Cargo no extraído o incompleto")
+        
+        if fields.get('empresa'):
+            quality_score += 20
+        else:
+            quality_notes.append("Empresa no extraída")
+        
+        if fields.get('descripcion') and len(fields.get('descripcion', '')) > 50:
+            quality_score += 20
+        else:
+            quality_notes.append("Descripción ausente o muy corta")
+        
+        if fields.get('requerimientos') and len(fields.get('requerimientos', '')) > 20:
+            quality_score += 20
+        else:
+            quality_notes.append("Requerimientos ausentes o muy cortos")
+        
+        if fields.get('modalidad'):
+            quality_score += 10
+        else:
+            quality_notes.append("Modalidad no detectada")
+        
+        if fields.get('fecha'):
+            quality_score += 10
+        
+        vacancy_info['quality_score'] = quality_score
+        vacancy_info['quality_notes'] = quality_notes
+        return vacancy_info
+    
+    def generate_report(self, vacancies: Iterable[Dict], output_dir: Path, dataset_result: Optional[Dict] = None,
+                        entries: Optional[List[Dict]] = None):
         """
         Genera un reporte de la extracción con comparación y sugerencias.
         
         Args:
-            vacancies: Lista de vacantes procesadas
+            vacancies: Vacantes procesadas
             output_dir: Directorio de salida
             dataset_result: Resultado de la conversión a dataset (opcional)
+            entries: Resúmenes ya calculados con report_entry() (p. ej. los
+                     de un ReportCollector); reemplazan a vacancies
         """
         report = {
             'timestamp': datetime.now().isoformat(),
@@ -416,60 +886,21 @@ class VacancyExtractor:
             'failed': self.stats['failed'],
             'fields_extracted_counts': self.stats['fields_extracted'],
             'fields_missing_counts': self.stats['fields_missing'],
+            'cache_hits': self.stats['cache_hits'],
+            'output_files': self.stats['output_files'],
+            'regex_fallbacks': self.stats['regex_fallbacks'],
             'vacancies': []
         }
+        if self.profile_patterns:
+            report['pattern_profile'] = summarize_pattern_stats(self.stats['pattern_profile'])
+            report['extraction_paths'] = dict(sorted(
+                (path, count) for path, count in self.stats['extraction_paths'].items() if count
+            ))
         
         # Agregar información detallada de cada vacante
-        for v in vacancies:
-            vacancy_info = {
-                'filename': v['filename'],
-                'cargo': v['fields'].get('cargo'),
-                'empresa': v['fields'].get('empresa'),
-                'fecha': v['fields'].get('fecha'),
-                'modalidad': v['fields'].get('modalidad'),
-                'has_descripcion': bool(v['fields'].get('descripcion')),
-                'has_requerimientos': bool(v['fields'].get('requerimientos')),
-                'original_length': len(v['original_text']),
-                'descripcion_length': len(v['fields'].get('descripcion', '')),
-                'requerimientos_length': len(v['fields'].get('requerimientos', '')),
-            }
-            
-            # Calcular métricas de calidad
-            quality_score = 0
-            quality_notes = []
-            
-            if v['fields'].get('cargo'):
-                quality_score += 20
-            else:
-                quality_notes.append("Cargo no extraído o incompleto")
-            
-            if v['fields'].get('empresa'):
-                quality_score += 20
-            else:
-                quality_notes.append("Empresa no extraída")
-            
-            if v['fields'].get('descripcion') and len(v['fields'].get('descripcion', '')) > 50:
-                quality_score += 20
-            else:
-                quality_notes.append("Descripción ausente o muy corta")
-            
-            if v['fields'].get('requerimientos') and len(v['fields'].get('requerimientos', '')) > 20:
-                quality_score += 20
-            else:
-                quality_notes.append("Requerimientos ausentes o muy cortos")
-            
-            if v['fields'].get('modalidad'):
-                quality_score += 10
-            else:
-                quality_notes.append("Modalidad no detectada")
-            
-            if v['fields'].get('fecha'):
-                quality_score += 10
-            
-            vacancy_info['quality_score'] = quality_score
-            vacancy_info['quality_notes'] = quality_notes
-            
-            report['vacancies'].append(vacancy_info)
+        if entries is None:
+            entries = [self.report_entry(v) for v in vacancies]
+        report['vacancies'] = entries
         
         # Agregar información del dataset si está disponible
         if dataset_result:
@@ -537,8 +968,32 @@ class VacancyExtractor:
             f.write(f"Total procesadas: {self.stats['processed']}\n")
             f.write(f"Exitosas: {self.stats['successful']}\n")
             f.write(f"Fallidas: {self.stats['failed']}\n")
+            f.write(f"Sin cambios (caché): {self.stats['cache_hits']}\n")
+            files = self.stats['output_files']
+            f.write(f"Archivos: {files['new']} nuevos, {files['changed']} modificados, "
+                    f"{files['unchanged']} sin cambios\n")
             f.write(f"Calidad promedio: {avg_quality:.1f}/100\n\n")
             
+            if self.profile_patterns:
+                f.write("PERFIL DE PATRONES (por tiempo total)\n")
+                f.write("-"*70 + "\n")
+                for name, entry in report['pattern_profile'].items():
+                    avg = f"{entry['avg_ms']}ms" if entry['avg_ms'] is not None else '-'
+                    f.write(f"  {name:<20} hits={entry['hits']:<6} misses={entry['misses']:<6} "
+                            f"omitido={entry['skipped']:<6} total={entry['seconds']:.4f}s medio={avg}\n")
+                f.write("\nESTRATEGIA QUE DECIDIÓ CADA CAMPO\n")
+                f.write("-"*70 + "\n")
+                for path, count in report['extraction_paths'].items():
+                    f.write(f"  {path}: {count}\n")
+                f.write("\n")
+            
+            if self.stats['regex_fallbacks']:
+                f.write("PATRONES RESUELTOS POR LÍNEAS (presupuesto regex agotado)\n")
+                f.write("-"*70 + "\n")
+                for name, count in sorted(self.stats['regex_fallbacks'].items()):
+                    f.write(f"  • {name}: {count}\n")
+                f.write("\n")
+            
             f.write("CAMPOS EXTRAÍDOS\n")
             f.write("-"*70 + "\n")
             for field, count in sorted(self.stats['fields_extracted'].items()):
@@ -586,6 +1041,18 @@ class VacancyExtractor:
             print("="*70)
             print(f"✅ Vacantes procesadas exitosamente: {self.stats['successful']}")
             print(f"❌ Vacantes fallidas: {self.stats['failed']}")
+            if self.stats['cache_hits']:
+                print(f"♻️  Vacantes sin cambios (caché): {self.stats['cache_hits']}")
+            files = self.stats['output_files']
+            print(f"📁 Archivos: {files['new']} nuevos, {files['changed']} modificados, "
+                  f"{files['unchanged']} sin cambios (no reescritos)")
+            if self.profile_patterns:
+                print(f"\n⏱️  Patrones más costosos:")
+                for name, entry in list(report['pattern_profile'].items())[:5]:
+                    print(f"   • {name}: {entry['seconds']:.4f}s "
+                          f"({entry['hits']} hits, {entry['misses']} misses, {entry['skipped']} omitidos)")
+            if self.stats['regex_fallbacks']:
+                print(f"🐢 Patrones resueltos por líneas (presupuesto regex): {self.stats['regex_fallbacks']}")
             print(f"📊 Calidad promedio: {avg_quality:.1f}/100")
             print(f"\n📊 Campos extraídos:")
             for field, count in sorted(self.stats['fields_extracted'].items()):
@@ -608,15 +1075,87 @@ class VacancyExtractor:
         
         return report
     
-    def run_dataset_conversion(self, yaml_dir: Path, output_dir: Path, vacancies: List[Dict]) -> Dict:
+    def run_dataset_conversion(self, yaml_dir: Path, output_dir: Path, vacancies: Iterable[Dict],
+                               save_jsonl: bool = False) -> Dict:
         """
-        Ejecuta convert_to_line_dataset.py sobre los YAMLs generados.
+        Ejecuta la conversión de convert_to_line_dataset.py en el mismo proceso,
+        alimentada en memoria con las vacantes procesadas.
+        
+        Para no retener las vacantes, process_text_file(sinks=[DatasetSink(...)])
+        hace la misma conversión a medida que se procesan.
         
         Args:
             yaml_dir: Directorio con archivos YAML
             output_dir: Directorio de salida para datasets
-            vacancies: Lista de vacantes procesadas con texto original
+            vacancies: Vacantes procesadas con texto original (cualquier iterable)
+            save_jsonl: Si además debe guardarse el JSONL intermedio
+                        (yaml_dir/training_data.jsonl)
             
+        Returns:
+            Resultado de la conversión
+        """
+        sink = DatasetSink(self, yaml_dir, output_dir, save_jsonl)
+        for vacancy in vacancies:
+            sink.write(vacancy)
+        return sink.close()
+
+
+class DatasetSink:
+    """
+    Sink de process_text_file que alimenta la conversión a dataset de líneas
+    (convert_to_line_dataset.LineDatasetWriter) vacante por vacante: cada
+    vacante se etiqueta y se escribe al llegar. Un error de la conversión no
+    interrumpe la extracción; queda en el resultado de close().
+    """
+    
+    def __init__(self, extractor: VacancyExtractor, yaml_dir: Path, output_dir: Path,
+                 save_jsonl: bool = False):
+        """
+        Args:
+            extractor: VacancyExtractor (para verbose)
+            yaml_dir: Directorio con archivos YAML
+            output_dir: Directorio de salida para datasets
+            save_jsonl: Si además debe guardarse el JSONL intermedio
+                        (yaml_dir/training_data.jsonl)
+        """
+        self.verbose = extractor.verbose
+        self.output_dir = Path(output_dir)
+        self.count = 0
+        self.error = None
+        self.writer = None
+        self.training = JsonlSink(Path(yaml_dir) / 'training_data.jsonl') if save_jsonl else None
+        try:
+            with self._output():
+                self.writer = LineDatasetWriter(self.output_dir)
+        except Exception as e:
+            self.error = e
+    
+    def _output(self):
+        # La salida del conversor solo se muestra en modo verbose
+        return contextlib.redirect_stdout(sys.stdout if self.verbose else io.StringIO())
+    
+    def write(self, vacancy: Dict):
+        """Agrega una vacante procesada ('fields', 'original_text') al dataset."""
+        if self.error is not None:
+            return
+        try:
+            # Par (texto, yaml) en el formato esperado por convert_to_line_dataset.py
+            # Formato: {"text": "...", "yaml": "cargo: ...\nempresa: ..."}
+            yaml_str = yaml.dump(vacancy['fields'], allow_unicode=True, default_flow_style=False, sort_keys=False)
+            if self.training is not None:
+                self.training.write({
+                    'text': vacancy['original_text'],
+                    'yaml': yaml_str
+                })
+            self.count += 1
+            self.writer.add(self.count, vacancy['original_text'], yaml_str)
+        except Exception as e:
+            self.error = e
+    
+    def close(self) -> Dict:
+        """
+        Cierra los archivos del dataset.
+        
         Returns:
             Resultado de la conversión
         """
@@ -625,77 +1164,129 @@ class VacancyExtractor:
             print("CONVERSIÓN A DATASET DE LÍNEAS")
             print("="*70 + "\n")
         
-        # Crear JSONL en el formato esperado por convert_to_line_dataset.py
-        # Formato: {"text": "...", "yaml": "cargo: ...\nempresa: ..."}
-        jsonl_path = yaml_dir / 'training_data.jsonl'
-        
         try:
-            with open(jsonl_path, 'w', encoding='utf-8') as f:
-                for vacancy in vacancies:
-                    fields = vacancy['fields']
-                    original_text = vacancy['original_text']
-                    
-                    # Crear representación YAML como string
-                    yaml_str = yaml.dump(fields, allow_unicode=True, default_flow_style=False, sort_keys=False)
-                    
-                    # Crear el objeto en formato esperado
-                    item = {
-                        'text': original_text,
-                        'yaml': yaml_str
-                    }
-                    
-                    f.write(json.dumps(item, ensure_ascii=False) + '\n')
-            
-            if self.verbose:
-                print(f"✅ Archivo JSONL para conversión creado: {jsonl_path}")
-                print(f"   Vacantes: {len(vacancies)}\n")
-        
+            if self.training is not None:
+                self.training.close()
+            result = None
+            if self.writer is not None:
+                with self._output():
+                    result = self.writer.close()
         except Exception as e:
-            if self.verbose:
-                print(f"❌ Error al crear JSONL: {e}")
-            return {'success': False, 'error': str(e)}
-        
-        # Ejecutar convert_to_line_dataset.py
-        script_path = Path(__file__).parent / 'convert_to_line_dataset.py'
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        try:
-            cmd = [
-                'python', str(script_path),
-                '--input', str(jsonl_path),
-                '--outdir', str(output_dir)
-            ]
-            
-            if self.verbose:
-                print(f"🔧 Ejecutando: {' '.join(cmd)}\n")
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            
-            if self.verbose:
-                print(result.stdout)
-                if result.stderr:
-                    print(f"⚠️  Stderr: {result.stderr}")
-            
-            # Verificar archivos generados
-            expected_files = ['line_dataset.jsonl', 'line_dataset.csv', 'line_dataset_review.jsonl']
-            generated = [f for f in expected_files if (output_dir / f).exists()]
-            
-            if self.verbose:
-                print(f"\n✅ Archivos de dataset generados: {', '.join(generated)}")
-            
-            return {
-                'success': True,
-                'files_generated': generated
-            }
+            self.error = self.error or e
         
-        except subprocess.CalledProcessError as e:
+        if self.error is not None:
             if self.verbose:
-                print(f"❌ Error al ejecutar convert_to_line_dataset.py:")
-                print(f"   {e.stderr}")
+                print(f"❌ Error en la conversión a dataset de líneas:")
+                print(f"   {self.error}")
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(self.error)
             }
+        
+        if self.training is not None and self.training.count and self.verbose:
+            print(f"✅ Archivo JSONL de entrenamiento creado: {self.training.path}")
+        
+        # Verificar archivos generados
+        expected_files = ['line_dataset.jsonl', 'line_dataset.sources.jsonl', 'line_dataset.csv', 'line_dataset_review.jsonl']
+        generated = [f for f in expected_files if (self.output_dir / f).exists()]
+        
+        if self.verbose:
+            print(f"\n✅ Archivos de dataset generados: {', '.join(generated)}")
+        
+        return {
+            'success': True,
+            'files_generated': generated,
+            'total_examples': result['total'],
+            'label_counts': result['counts']
+        }
+
+
+class ReportCollector:
+    """
+    Sink de process_text_file que conserva, por vacante, solo su resumen
+    para generate_report (ver VacancyExtractor.report_entry).
+    """
+    
+    def __init__(self, extractor: VacancyExtractor):
+        self.extractor = extractor
+        self.entries: List[Dict] = []
+    
+    def write(self, vacancy: Dict):
+        self.entries.append(self.extractor.report_entry(vacancy))
+    
+    def close(self):
+        pass
+
+
+class LabelPatternStrategy(ExtractionStrategy):
+    """
+    Estrategia 'etiquetas': patrones de cargo/empresa de VacancyExtractor
+    (confiables) y, como respaldo, la primera línea corta como cargo y la
+    primera secuencia de palabras capitalizadas como empresa.
+    """
+    
+    name = STRATEGY_LABELS
+    
+    def __init__(self, extractor: VacancyExtractor):
+        """
+        Args:
+            extractor: Extractor cuyos patrones, disparadores y guard se usan
+        """
+        self.extractor = extractor
+        self.scanner = extractor.SCANNER
+    
+    def extract(self, scan: ScannedBlock, fields: Sequence[str]) -> Dict[str, FieldValue]:
+        extractor = self.extractor
+        text = scan.text
+        extractor.guard.ensure_begun(text)
+        results = {}
+        for field in fields:
+            value = extractor.extract_field(text, field, scan)
+            if value:
+                results[field] = FieldValue(value, True, 'patron')
+        
+        # Si no se encontró cargo, intentar con la primera línea no vacía
+        if 'cargo' in fields and 'cargo' not in results:
+            lines = scan.nonblank_lines
+            if lines:
+                first_line = lines[0]
+                # Si la primera línea es corta y parece un título, usarla
+                if len(first_line) < 100 and not first_line.endswith('.'):
+                    results['cargo'] = FieldValue(first_line.strip(), False, 'primera_linea')
+        
+        # Si no se encontró empresa, buscar patrones como "TechCorp Solutions", "DataMind Inc"
+        if 'empresa' in fields and 'empresa' not in results:
+            empresa_match = extractor.guard.search('empresa_fallback', extractor.EMPRESA_FALLBACK_RE, text)
+            if empresa_match:
+                candidate = empresa_match.group(1).strip()
+                # Validar que no sea un cargo común
+                if not extractor.ROLE_WORD_RE.search(candidate):
+                    results['empresa'] = FieldValue(candidate, False, 'palabras_capitalizadas')
+        return results
+
+
+def _extract_chunk(blocks: List[str], extractor_class: type, options: Dict) -> Tuple[List[Dict], Dict]:
+    """
+    Tarea de un worker: extrae los campos de un chunk de bloques.
+    
+    Args:
+        blocks: Textos de las vacantes del chunk
+        extractor_class: VacancyExtractor o una subclase
+        options: Opciones del extractor (ver VacancyExtractor.worker_options)
+        
+    Returns:
+        Tupla (lista de campos en el mismo orden, contadores de campos del chunk)
+    """
+    extractor = extractor_class(verbose=False, **options)
+    fields_list = extractor.extract_batch(blocks)
+    field_stats = {
+        'fields_extracted': extractor.stats['fields_extracted'],
+        'fields_missing': extractor.stats['fields_missing'],
+        'regex_fallbacks': extractor.stats['regex_fallbacks'],
+        'pattern_profile': extractor.stats['pattern_profile'],
+        'extraction_paths': extractor.stats['extraction_paths'],
+    }
+    return fields_list, field_stats
 
 
 def main():
@@ -714,6 +1305,12 @@ Ejemplos de uso:
   # Extraer y generar reporte detallado
   python scripts/extract_vacantes_from_text.py --input vacante.txt --output output/extracted --generate-report
   
+  # Reutilizar resultados de bloques ya procesados (caché SQLite)
+  python scripts/extract_vacantes_from_text.py --input vacante.txt --output output/extracted --cache .cache/extraction_cache.sqlite
+  
+  # Extracción en paralelo con 8 procesos
+  python scripts/extract_vacantes_from_text.py --input vacante.txt --output output/extracted --workers 8
+  
   # Modo silencioso
   python scripts/extract_vacantes_from_text.py --input vacante.txt --output output/extracted --quiet
         """
@@ -736,7 +1333,13 @@ Ejemplos de uso:
     parser.add_argument(
         '--run-dataset-conversion',
         action='store_true',
-        help='Ejecutar convert_to_line_dataset.py después de la extracción'
+        help='Ejecutar la conversión de convert_to_line_dataset.py después de la extracción'
+    )
+    
+    parser.add_argument(
+        '--save-training-jsonl',
+        action='store_true',
+        help='Guardar también el JSONL intermedio (training_data.jsonl) en el directorio de salida'
     )
     
     parser.add_argument(
@@ -752,6 +1355,86 @@ Ejemplos de uso:
         help='Generar reporte detallado de la extracción'
     )
     
+    parser.add_argument(
+        '--extractor',
+        choices=['regex', 'ml'],
+        default='regex',
+        help='Estrategia para cargo/empresa: regex (default) o ml (clasificador de líneas '
+             'TF-IDF entrenado con train_tfidf_baseline.py, con regex como respaldo)'
+    )
+    
+    parser.add_argument(
+        '--strategies',
+        type=parse_strategy_names,
+        default=[STRATEGY_LABELS],
+        help='Estrategias de cargo/empresa en orden de prioridad, separadas por coma: '
+             'etiquetas (default), linkedin. Se detiene en el primer resultado confiable'
+    )
+    
+    parser.add_argument(
+        '--model-dir',
+        default='models',
+        help='Directorio con tfidf_vectorizer.pkl y tfidf_baseline_model.pkl (default: models)'
+    )
+    
+    parser.add_argument(
+        '--include-sections',
+        action='store_true',
+        help='Agregar a cada YAML las secciones detectadas (requerimientos, responsabilidades, ...)'
+    )
+    
+    parser.add_argument(
+        '--regex-budget',
+        type=float,
+        default=DEFAULT_BLOCK_BUDGET,
+        help=f'Segundos de regex por bloque antes de usar la estrategia por líneas (default: {DEFAULT_BLOCK_BUDGET})'
+    )
+    
+    parser.add_argument(
+        '--profile-patterns',
+        action='store_true',
+        help='Registrar hits, misses y tiempo por patrón y el uso de cada heurística de respaldo (va al reporte JSON)'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Número de procesos para la extracción en paralelo (default: 1, en serie)'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default=None,
+        help='Archivo SQLite de caché de extracción; los bloques sin cambios no se vuelven a procesar'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Vigilar el archivo de entrada y extraer solo los bloques agregados desde el último checkpoint'
+    )
+    
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Con --watch: procesar lo pendiente desde el checkpoint y terminar'
+    )
+    
+    parser.add_argument(
+        '--checkpoint',
+        default='.cache/extract_watch_checkpoint.json',
+        help='Archivo de checkpoint del modo watch (default: .cache/extract_watch_checkpoint.json)'
+    )
+    
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f'Segundos entre revisiones del archivo en modo watch (default: {DEFAULT_POLL_INTERVAL})'
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
@@ -760,8 +1443,23 @@ Ejemplos de uso:
     
     args = parser.parse_args()
     
+    if args.watch and args.run_dataset_conversion:
+        parser.error('--watch no se puede combinar con --run-dataset-conversion '
+                     '(el dataset se genera a partir de todas las vacantes)')
+    
     # Crear extractor
-    extractor = VacancyExtractor(verbose=not args.quiet)
+    options = dict(verbose=not args.quiet, include_sections=args.include_sections,
+                   regex_budget=args.regex_budget, profile_patterns=args.profile_patterns,
+                   strategies=args.strategies)
+    if args.extractor == 'ml':
+        from ml_extractor import MLVacancyExtractor, ModelUnavailableError
+        try:
+            extractor = MLVacancyExtractor(model_dir=args.model_dir, **options)
+        except ModelUnavailableError as e:
+            print(f"❌ Error: {e}")
+            return 1
+    else:
+        extractor = VacancyExtractor(**options)
     
     # Procesar archivo
     input_path = Path(args.input)
@@ -771,23 +1469,49 @@ Ejemplos de uso:
         print(f"❌ Error: El archivo {input_path} no existe")
         return 1
     
-    vacancies = extractor.process_text_file(input_path, output_path)
+    # Las vacantes no se acumulan: el dataset y el resumen del reporte se
+    # generan a medida que se procesan
+    sinks = []
+    report = None
+    if args.generate_report or not args.quiet:
+        report = ReportCollector(extractor)
+        sinks.append(report)
+    dataset = None
+    if args.run_dataset_conversion:
+        dataset = DatasetSink(extractor, output_path, Path(args.dataset_output),
+                              save_jsonl=args.save_training_jsonl)
+        sinks.append(dataset)
+    
+    cache = ExtractionCache(args.cache, extractor.fingerprint()) if args.cache else None
+    try:
+        if args.watch:
+            # Solo se extraen los bloques agregados desde el último checkpoint
+            watcher = BlockWatcher(input_path, args.checkpoint)
+            watch(
+                watcher,
+                lambda blocks: extractor.process_text_file(
+                    input_path, output_path, workers=args.workers, cache=cache, blocks=blocks, sinks=sinks),
+                poll_interval=args.poll_interval,
+                once=args.once,
+                verbose=not args.quiet
+            )
+        else:
+            extractor.process_text_file(input_path, output_path, workers=args.workers, cache=cache, sinks=sinks)
+    finally:
+        if cache is not None:
+            cache.close()
     
-    # Ejecutar conversión a dataset si se solicita
+    # Cerrar la conversión a dataset si se solicitó
     dataset_result = None
-    if args.run_dataset_conversion:
-        dataset_result = extractor.run_dataset_conversion(
-            output_path,
-            Path(args.dataset_output),
-            vacancies
-        )
+    if dataset is not None:
+        dataset_result = dataset.close()
         
         if not dataset_result.get('success', False):
             print(f"⚠️  Advertencia: La conversión a dataset no se completó exitosamente")
     
     # Generar reporte si se solicita
-    if args.generate_report or not args.quiet:
-        extractor.generate_report(vacancies, output_path, dataset_result)
+    if report is not None:
+        extractor.generate_report((), output_path, dataset_result, entries=report.entries)
     
     return 0
 
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+scripts/extraction_cache.py
+
+Caché persistente (SQLite) de resultados de extracción direccionada por
+contenido. Cada entrada se identifica por el SHA-1 del bloque normalizado y
+por la huella (fingerprint) del extractor que la produjo; al cambiar los
+patrones o la versión del extractor cambia la huella y las entradas
+anteriores dejan de usarse (y se purgan al abrir la caché).
+
+Valor guardado por bloque:
+  - filename: nombre del archivo YAML generado
+  - fields:   campos extraídos (JSON)
+
+Uso:
+  from extraction_cache import ExtractionCache, block_hash
+  with ExtractionCache('.cache/extraction_cache.sqlite', fingerprint) as cache:
+      hit = cache.get(block_hash(block))
+"""
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Confirmar a disco cada N escrituras
+COMMIT_EVERY = 200
+
+
+def normalize_block(text: str) -> str:
+    """Normaliza un bloque para el hash: saltos de línea '\\n' y sin espacios en los extremos."""
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+def block_hash(text: str) -> str:
+    """SHA-1 hexadecimal del bloque normalizado."""
+    return hashlib.sha1(normalize_block(text).encode('utf-8')).hexdigest()
+
+
+def fingerprint_of(*parts) -> str:
+    """Huella estable (SHA-1) de una configuración serializable a JSON."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ExtractionCache:
+    """Caché SQLite: (hash de bloque, huella) -> (filename, campos)."""
+
+    def __init__(self, path, fingerprint: str):
+        """
+        Abre (o crea) la caché y descarta las entradas de otras huellas.
+
+        Args:
+            path: Ruta del archivo SQLite
+            fingerprint: Huella del extractor actual
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' block_hash TEXT NOT NULL,'
+            ' fingerprint TEXT NOT NULL,'
+            ' filename TEXT NOT NULL,'
+            ' fields TEXT NOT NULL,'
+            ' PRIMARY KEY (block_hash, fingerprint))'
+        )
+        self._conn.execute('DELETE FROM entries WHERE fingerprint != ?', (fingerprint,))
+        self._conn.commit()
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Busca un bloque en la caché.
+
+        Args:
+            key: Hash del bloque (ver block_hash)
+
+        Returns:
+            Tupla (filename, campos) o None si no está
+        """
+        row = self._conn.execute(
+            'SELECT filename, fields FROM entries WHERE block_hash = ? AND fingerprint = ?',
+            (key, self.fingerprint)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, filename: str, fields: Dict):
+        """Guarda (o reemplaza) el resultado de un bloque."""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO entries (block_hash, fingerprint, filename, fields) VALUES (?, ?, ?, ?)',
+            (key, self.fingerprint, filename, json.dumps(fields, ensure_ascii=False, default=str))
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self):
+        """Confirma las escrituras pendientes y cierra la conexión."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
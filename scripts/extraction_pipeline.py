@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+scripts/extraction_pipeline.py
+
+Pipeline de extracción de cargo/empresa con estrategias intercambiables.
+Cada bloque se escanea una sola vez (block_scanner.ScannedBlock: líneas,
+disparadores, párrafos, secciones) y las estrategias trabajan sobre ese
+escaneo en el orden configurado:
+
+  etiquetas  Patrones regex con etiquetas ('Cargo:', 'Company:', 'buscamos ...')
+             de VacancyExtractor; respaldo: primera línea / palabras capitalizadas
+  linkedin   Heurísticas del layout de LinkedIn de split_vacantes_to_yaml
+             (línea 'logo', separador '·', IGNORE_LINES); respaldo: primera
+             línea válida / palabras típicas de cargo
+
+Cada estrategia devuelve, por campo, un valor y si es confiable (resultado
+de la heurística principal) o solo un respaldo. Un valor confiable fija el
+campo; un respaldo se conserva solo si ninguna estrategia posterior da uno
+confiable. El pipeline se detiene en cuanto todos los campos son confiables.
+
+Uso:
+  pipeline = build_pipeline(['etiquetas', 'linkedin'])
+  scan = pipeline.scan(texto)
+  results = pipeline.run(scan)          # {'cargo': FieldValue(...), 'empresa': FieldValue(...)}
+  results['cargo'].value, results['cargo'].path
+"""
+import argparse
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from block_scanner import BlockScanner, ScannedBlock
+
+# Campos que deciden las estrategias
+STRATEGY_FIELDS = ('cargo', 'empresa')
+
+STRATEGY_LABELS = 'etiquetas'
+STRATEGY_LINKEDIN = 'linkedin'
+STRATEGY_NAMES = (STRATEGY_LABELS, STRATEGY_LINKEDIN)
+
+# Escáner sin disparadores para pipelines que no los necesitan
+PLAIN_SCANNER = BlockScanner({})
+
+
+class FieldValue(NamedTuple):
+    """Valor de un campo según una estrategia."""
+    value: Optional[str]
+    confident: bool
+    path: str
+
+
+MISSING = FieldValue(None, False, 'ninguno')
+
+
+class ExtractionStrategy:
+    """
+    Estrategia de extracción de cargo/empresa sobre un bloque escaneado.
+    Las subclases definen `name` y extract(); si necesitan disparadores
+    propios, `scanner` es el escáner con el que debe escanearse el bloque.
+    """
+
+    name = ''
+    scanner: Optional[BlockScanner] = None
+
+    def extract(self, scan: ScannedBlock, fields: Sequence[str]) -> Dict[str, FieldValue]:
+        """
+        Extrae los campos pedidos.
+
+        Args:
+            scan: Bloque escaneado
+            fields: Campos que aún no tienen un valor confiable
+
+        Returns:
+            Diccionario campo -> FieldValue (los campos sin valor pueden omitirse)
+        """
+        raise NotImplementedError
+
+
+class ExtractionPipeline:
+    """Ejecuta las estrategias en orden hasta tener valores confiables."""
+
+    def __init__(self, strategies: Sequence[ExtractionStrategy]):
+        """
+        Args:
+            strategies: Estrategias en orden de prioridad
+        """
+        self.strategies = list(strategies)
+        self.names = [strategy.name for strategy in self.strategies]
+        scanners = [s.scanner for s in self.strategies if s.scanner is not None]
+        self.scanner = scanners[0] if scanners else PLAIN_SCANNER
+
+    def scan(self, text: str) -> ScannedBlock:
+        """Escanea un bloque una sola vez para todas las estrategias."""
+        return self.scanner.scan(text)
+
+    def run(self, scan: ScannedBlock, preset: Optional[Dict] = None) -> Dict[str, FieldValue]:
+        """
+        Decide cargo y empresa de un bloque.
+
+        Args:
+            scan: Bloque escaneado (ver scan())
+            preset: Valores ya decididos por otra fuente (p. ej. el
+                    clasificador de líneas); cuentan como confiables
+
+        Returns:
+            Diccionario campo -> FieldValue para todos los STRATEGY_FIELDS
+        """
+        decided: Dict[str, FieldValue] = {}
+        for field, value in (preset or {}).items():
+            if field in STRATEGY_FIELDS and value:
+                decided[field] = FieldValue(value, True, 'modelo')
+
+        for strategy in self.strategies:
+            pending = [f for f in STRATEGY_FIELDS if not (f in decided and decided[f].confident)]
+            if not pending:
+                break
+            for field, result in strategy.extract(scan, pending).items():
+                if field not in pending or not result.value:
+                    continue
+                current = decided.get(field)
+                if current is None or result.confident:
+                    decided[field] = result
+        return {field: decided.get(field, MISSING) for field in STRATEGY_FIELDS}
+
+
+def parse_strategy_names(value: str) -> List[str]:
+    """
+    Convierte 'etiquetas,linkedin' en una lista validada (type= de argparse).
+
+    Raises:
+        argparse.ArgumentTypeError: Si hay nombres desconocidos o la lista está vacía
+    """
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STRATEGY_NAMES]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"Estrategias inválidas: {value!r} (disponibles: {', '.join(STRATEGY_NAMES)})")
+    return names
+
+
+def build_strategy(name: str, extractor=None) -> ExtractionStrategy:
+    """
+    Crea una estrategia por nombre.
+
+    Args:
+        name: Nombre de la estrategia (ver STRATEGY_NAMES)
+        extractor: VacancyExtractor que ejecuta los patrones de 'etiquetas'
+                   (se crea uno si no se pasa)
+    """
+    # Importaciones diferidas: cada estrategia vive junto a sus heurísticas
+    if name == STRATEGY_LABELS:
+        from extract_vacantes_from_text import LabelPatternStrategy, VacancyExtractor
+        return LabelPatternStrategy(extractor or VacancyExtractor(verbose=False))
+    if name == STRATEGY_LINKEDIN:
+        from split_vacantes_to_yaml import LinkedInLayoutStrategy
+        return LinkedInLayoutStrategy()
+    raise ValueError(f"Estrategia desconocida: {name} (disponibles: {', '.join(STRATEGY_NAMES)})")
+
+
+def build_pipeline(names: Iterable[str], extractor=None) -> ExtractionPipeline:
+    """Pipeline con las estrategias indicadas, en ese orden."""
+    return ExtractionPipeline([build_strategy(name, extractor) for name in names])
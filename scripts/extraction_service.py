@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+scripts/extraction_service.py
+
+Servicio HTTP local (asyncio, sin dependencias adicionales) que mantiene
+cargado VacancyExtractor (y opcionalmente el clasificador de líneas) para
+extraer campos de vacantes sin el costo de arrancar el intérprete, importar
+yaml, compilar las regex o cargar el modelo en cada llamada.
+
+Las solicitudes concurrentes se agrupan: las que llegan dentro de una
+ventana corta (--batch-window-ms) se extraen juntas con una sola llamada a
+extract_batch (con --extractor ml, un solo predict_proba por lote).
+
+Endpoints:
+  GET  /health    Estado del servicio y contadores
+  POST /extract   Cuerpo JSON {"text": "..."} o {"texts": ["...", ...]},
+                  o texto plano con una vacante.
+                  Respuesta: {"fields": {...}} o {"results": [{...}, ...]}
+
+Uso:
+  python scripts/extraction_service.py --port 8765
+  python scripts/extraction_service.py --extractor ml --model-dir models
+  python scripts/extraction_service.py --allow-origin chrome-extension://<id-del-clipper>
+
+  curl -s localhost:8765/extract -d '{"text": "Cargo: Data Analyst\\nEmpresa: Acme Inc"}'
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from extract_vacantes_from_text import VacancyExtractor
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH = 256
+
+# Límites de la solicitud
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class RequestError(Exception):
+    """Solicitud inválida; se responde con el código HTTP indicado."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class BatchingExtractor:
+    """
+    Agrupa las solicitudes concurrentes en lotes y los extrae en un hilo
+    aparte (el extractor no es thread-safe: un solo hilo, un lote a la vez).
+    """
+
+    def __init__(self, extractor: VacancyExtractor, batch_window: float = DEFAULT_BATCH_WINDOW_MS / 1000,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Args:
+            extractor: Extractor ya inicializado (se reutiliza en todas las solicitudes)
+            batch_window: Segundos que se espera a más solicitudes antes de extraer
+            max_batch: Máximo de vacantes por lote
+        """
+        self.extractor = extractor
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.stats = {'requests': 0, 'postings': 0, 'batches': 0, 'extract_seconds': 0.0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='extractor')
+
+    async def extract(self, texts: List[str]) -> List[Dict]:
+        """Extrae los campos de las vacantes de una solicitud (en el próximo lote)."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def run(self):
+        """Bucle que arma lotes con las solicitudes en cola y los extrae."""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.batch_window
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self.extractor.extract_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats['extract_seconds'] += time.perf_counter() - started
+            self.stats['batches'] += 1
+            self.stats['requests'] += len(batch)
+            self.stats['postings'] += len(texts)
+
+            start = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(results[start:start + len(item_texts)])
+                start += len(item_texts)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def parse_postings(body: bytes, content_type: str) -> Tuple[List[str], bool]:
+    """
+    Obtiene las vacantes del cuerpo de la solicitud.
+
+    Returns:
+        Tupla (textos, es_lista) donde es_lista indica si se enviaron varias
+    """
+    try:
+        payload = body.decode('utf-8')
+    except UnicodeDecodeError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, 'El cuerpo debe estar en UTF-8')
+
+    if 'json' not in content_type and not payload.lstrip().startswith(('{', '[')):
+        texts, many = [payload], False
+    else:
+        try:
+            data = json.loads(payload)
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f'JSON inválido: {e}')
+        if isinstance(data, dict) and 'texts' in data:
+            texts, many = data['texts'], True
+        elif isinstance(data, dict) and 'text' in data:
+            texts, many = [data['text']], False
+        elif isinstance(data, list):
+            texts, many = data, True
+        else:
+            raise RequestError(HTTPStatus.BAD_REQUEST, 'Se espera {"text": ...} o {"texts": [...]}')
+
+    if not isinstance(texts, list) or not all(isinstance(t, str) and t.strip() for t in texts):
+        raise RequestError(HTTPStatus.BAD_REQUEST, 'Cada vacante debe ser un texto no vacío')
+    if not texts:
+        raise RequestError(HTTPStatus.BAD_REQUEST, 'No se enviaron vacantes')
+    return [t.strip() for t in texts], many
+
+
+class ExtractionService:
+    """Servidor HTTP/1.1 mínimo sobre asyncio."""
+
+    def __init__(self, batcher: BatchingExtractor, allow_origin: Optional[str] = None):
+        """
+        Args:
+            batcher: Extractor con agrupación de solicitudes
+            allow_origin: Origen permitido por CORS (el del clipper del navegador); con None
+                no se envían encabezados CORS y ninguna página web puede leer las respuestas
+        """
+        self.batcher = batcher
+        self.allow_origin = allow_origin
+        self.started = time.time()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                        {'error': 'Encabezados demasiado grandes'}, keep_alive=False)
+                    break
+                keep_alive = await self._handle_request(head, reader, writer)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, head: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> bool:
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, version = lines[0].split(' ', 2)
+        except ValueError:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'Solicitud inválida'}, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        # Solo se admiten cuerpos con Content-Length: un cuerpo por chunks quedaría
+        # sin leer y se interpretaría como la siguiente solicitud
+        if 'transfer-encoding' in headers:
+            await self._respond(writer, HTTPStatus.LENGTH_REQUIRED,
+                                {'error': 'Transfer-Encoding no soportado; envía Content-Length'}, keep_alive=False)
+            return False
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                {'error': f'Cuerpo inválido o mayor a {MAX_BODY_BYTES} bytes'}, keep_alive=False)
+            return False
+        try:
+            body = await reader.readexactly(length) if length else b''
+        except asyncio.IncompleteReadError:
+            # El cliente cerró la conexión antes de enviar todo el cuerpo
+            return False
+
+        path = path.split('?', 1)[0]
+        try:
+            if method == 'OPTIONS':
+                await self._respond(writer, HTTPStatus.NO_CONTENT, None, keep_alive)
+            elif path == '/health' and method == 'GET':
+                await self._respond(writer, HTTPStatus.OK, self.health(), keep_alive)
+            elif path == '/extract' and method == 'POST':
+                texts, many = parse_postings(body, headers.get('content-type', ''))
+                results = await self.batcher.extract(texts)
+                payload = {'results': results} if many else {'fields': results[0]}
+                await self._respond(writer, HTTPStatus.OK, payload, keep_alive)
+            else:
+                await self._respond(writer, HTTPStatus.NOT_FOUND, {'error': f'{method} {path} no existe'}, keep_alive)
+        except RequestError as e:
+            await self._respond(writer, e.status, {'error': str(e)}, keep_alive)
+        except Exception as e:
+            await self._respond(writer, HTTPStatus.INTERNAL_SERVER_ERROR,
+                                {'error': f'Error al extraer: {e}'}, keep_alive)
+        return keep_alive
+
+    def health(self) -> Dict:
+        stats = dict(self.batcher.stats)
+        stats['extract_seconds'] = round(stats['extract_seconds'], 4)
+        return {
+            'status': 'ok',
+            'extractor': type(self.batcher.extractor).__name__,
+            'uptime_seconds': round(time.time() - self.started, 1),
+            **stats,
+        }
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: HTTPStatus,
+                       payload: Optional[Dict], keep_alive: bool):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        head = [
+            f'HTTP/1.1 {status.value} {status.phrase}',
+            'Content-Type: application/json; charset=utf-8',
+            f'Content-Length: {len(body)}',
+        ]
+        if self.allow_origin:
+            head += [
+                f'Access-Control-Allow-Origin: {self.allow_origin}',
+                'Access-Control-Allow-Methods: GET, POST, OPTIONS',
+                'Access-Control-Allow-Headers: Content-Type',
+                'Vary: Origin',
+            ]
+        head.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(service: ExtractionService, host: str, port: int, verbose: bool = True):
+    """Arranca el servidor y el bucle de lotes hasta que se interrumpa."""
+    batch_task = asyncio.create_task(service.batcher.run())
+    server = await asyncio.start_server(service.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    if verbose:
+        print(f"🚀 Servicio de extracción en http://{host}:{port} "
+              f"({type(service.batcher.extractor).__name__}, ventana {service.batcher.batch_window * 1000:.1f} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Servicio HTTP local de extracción de vacantes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Uso:')[1]
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Dirección de escucha (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Puerto (default: {DEFAULT_PORT})')
+    parser.add_argument('--extractor', choices=['regex', 'ml'], default='regex',
+                        help='Estrategia para cargo/empresa (default: regex)')
+    parser.add_argument('--model-dir', default='models',
+                        help='Directorio con tfidf_vectorizer.pkl y tfidf_baseline_model.pkl (default: models)')
+    parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                        help=f'Milisegundos de espera para agrupar solicitudes (default: {DEFAULT_BATCH_WINDOW_MS})')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f'Máximo de vacantes por lote (default: {DEFAULT_MAX_BATCH})')
+    parser.add_argument('--allow-origin', default=None,
+                        help='Origen al que se permite leer las respuestas por CORS, p. ej. '
+                             'chrome-extension://<id> del clipper (default: ninguno)')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Modo silencioso')
+    args = parser.parse_args()
+
+    if args.extractor == 'ml':
+        from ml_extractor import MLVacancyExtractor, ModelUnavailableError
+        try:
+            extractor = MLVacancyExtractor(verbose=False, model_dir=args.model_dir)
+        except ModelUnavailableError as e:
+            print(f"❌ Error: {e}")
+            return 1
+    else:
+        extractor = VacancyExtractor(verbose=False)
+
+    batcher = BatchingExtractor(extractor, args.batch_window_ms / 1000, args.max_batch)
+    service = ExtractionService(batcher, args.allow_origin)
+    try:
+        asyncio.run(serve(service, args.host, args.port, verbose=not args.quiet))
+    except KeyboardInterrupt:
+        if not args.quiet:
+            print("\n⏹️  Servicio detenido")
+    finally:
+        batcher.close()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
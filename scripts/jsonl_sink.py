@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+scripts/jsonl_sink.py
+
+Sink de registros JSONL: cada registro se escribe (una línea JSON) en cuanto
+se valida la vacante, en lugar de acumular el lote completo para convertirlo
+al final. La memoria usada depende de un registro, no del tamaño del lote.
+
+El archivo se abre en la primera escritura: si no llega ningún registro no
+se crea (igual que la conversión por lotes, que no escribía nada sin
+vacantes válidas).
+
+Los sinks siguen un protocolo mínimo (write(registro) y close()) que usan
+VacancyProcessor.process_all y VacancyExtractor.process_text_file.
+
+Uso:
+  with JsonlSink('vacantes.jsonl') as sink:
+      processor.process_all(sink=sink)
+  sink.count   # registros escritos
+"""
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class JsonlSink:
+    """Escribe registros JSON, uno por línea, a medida que llegan."""
+
+    def __init__(self, path, encoding: str = 'utf-8'):
+        """
+        Args:
+            path: Archivo JSONL de salida (se sobrescribe en la primera escritura)
+            encoding: Codificación del archivo
+        """
+        self.path = Path(path)
+        self.encoding = encoding
+        self.count = 0
+        self._file = None
+
+    def write(self, record: Dict):
+        """Agrega un registro al archivo."""
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding=self.encoding)
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+
+    def flush(self):
+        """Vuelca al disco los registros escritos hasta ahora."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> Optional[Path]:
+        """
+        Cierra el archivo.
+
+        Returns:
+            Ruta del archivo, o None si no se escribió ningún registro
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.path if self.count else None
+
+    def __enter__(self) -> 'JsonlSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+scripts/keyword_matcher.py
+
+Detección de palabras clave con un autómata de múltiples patrones. Los
+vocabularios (modalidad, palabras de cargo, keywords de rol, indicadores de
+empresa) se insertan en un trie que se compila una sola vez en una regex
+(cada nivel del trie es una alternancia de un carácter), de modo que cada
+texto se recorre una vez, en C, con un costo por posición acotado por el
+largo de las palabras y no por el tamaño del vocabulario. De cada posición
+se obtienen todas las palabras clave que empiezan ahí, con su categoría.
+Cada llamador puede limitar la búsqueda a las categorías que necesita (se
+compila una regex por conjunto de categorías, la primera vez).
+
+La comparación es sin distinguir mayúsculas (sobre text.lower()). Las
+categorías con whole_word=True solo aceptan coincidencias delimitadas como
+\\b...\\b en una regex (el carácter vecino no es alfanumérico ni '_').
+
+Uso:
+  matcher = KeywordMatcher()
+  matcher.add('modalidad:remoto', ['remote'])
+  matcher.add('role', ['analyst', 'engineer'], whole_word=True)
+  matcher.hits('Senior Data Analyst - Remote')   # [Hit(...), ...]
+  matcher.categories(texto)                       # {'role', 'modalidad:remoto'}
+  matcher.categories(texto, ['role'])             # solo la categoría 'role'
+
+  VACANCY_KEYWORDS                                # autómata compartido con los vocabularios de vacantes
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+
+class Hit(NamedTuple):
+    """Coincidencia de una palabra clave en el texto (offsets sobre text.lower())."""
+    start: int
+    end: int
+    keyword: str
+    category: str
+
+
+def _is_word_char(c: str) -> bool:
+    # Mismo criterio que \w en las regex de Python (str)
+    return c.isalnum() or c == '_'
+
+
+class _TrieNode:
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.entries: List[Tuple[str, str, bool]] = []
+
+
+def _trie_pattern(node: _TrieNode, categories: Optional[FrozenSet[str]]) -> str:
+    """
+    Regex del subárbol restringido a `categories` (None = todas); prefiere la
+    continuación más larga (cuantificador voraz).
+    """
+    alternatives = []
+    for c, child in sorted(node.children.items()):
+        rest = _trie_pattern(child, categories)
+        if rest is not None:
+            alternatives.append(re.escape(c) + rest)
+    terminal = any(categories is None or entry[1] in categories for entry in node.entries)
+    if not alternatives:
+        return '' if terminal else None
+    pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if terminal:
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+class KeywordMatcher:
+    """Autómata (trie compilado) sobre vocabularios con categoría."""
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._regexes: Dict[Optional[FrozenSet[str]], Optional[Pattern]] = {}
+
+    def add(self, category: str, keywords: Iterable[str], whole_word: bool = False) -> 'KeywordMatcher':
+        """
+        Agrega palabras clave a una categoría (invalida el autómata compilado).
+
+        Args:
+            category: Nombre de la categoría de las coincidencias
+            keywords: Palabras o frases a detectar
+            whole_word: Exigir límites de palabra a ambos lados
+        """
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            node = self._root
+            for c in keyword:
+                node = node.children.setdefault(c, _TrieNode())
+            node.entries.append((keyword, category, whole_word))
+        self._regexes.clear()
+        return self
+
+    def _regex(self, categories: Optional[FrozenSet[str]]) -> Optional[Pattern]:
+        # Se compila una vez por conjunto de categorías consultado; None si
+        # ninguna palabra clave pertenece a esas categorías
+        if categories not in self._regexes:
+            pattern = _trie_pattern(self._root, categories)
+            self._regexes[categories] = re.compile(pattern, re.DOTALL) if pattern else None
+        return self._regexes[categories]
+
+    def hits(self, text: str, categories: Optional[Iterable[str]] = None) -> List[Hit]:
+        """
+        Todas las coincidencias del texto en una pasada (pueden solaparse).
+
+        Args:
+            text: Texto a recorrer
+            categories: Limitar la búsqueda a estas categorías (None = todas)
+        """
+        if categories is not None:
+            categories = frozenset(categories)
+        regex = self._regex(categories)
+        if regex is None:
+            return []
+        lowered = text.lower()
+        found = []
+        match = regex.search(lowered)
+        while match is not None:
+            start = match.start()
+            # Las palabras clave que empiezan en esta posición son prefijos de
+            # la más larga: se recorren en el trie a lo largo de ella
+            node = self._root
+            for c in match.group():
+                node = node.children[c]
+                for keyword, category, whole_word in node.entries:
+                    if categories is not None and category not in categories:
+                        continue
+                    end = start + len(keyword)
+                    if whole_word and ((start > 0 and _is_word_char(lowered[start - 1]))
+                                       or (end < len(lowered) and _is_word_char(lowered[end]))):
+                        continue
+                    found.append(Hit(start, end, keyword, category))
+            match = regex.search(lowered, start + 1)
+        return found
+
+    def categories(self, text: str, categories: Optional[Iterable[str]] = None) -> Set[str]:
+        """Categorías (de `categories`, o todas) con al menos una coincidencia en el texto."""
+        return {hit.category for hit in self.hits(text, categories)}
+
+
+# Modalidad en orden de prioridad (la primera categoría presente gana). Los
+# valores son los que produce split_vacantes_to_yaml.detect_modalidad.
+MODALIDAD_KEYWORDS = [
+    ('remoto', ['remote']),
+    ('híbrido', ['híbrido', 'hybrid']),
+    ('presencial', ['presencial', 'on-site']),
+]
+
+# Palabras (subcadenas) que identifican una línea de cargo en split_vacantes_to_yaml
+CARGO_KEYWORDS = [
+    "analista", "business", "developer", "specialist", "coordinator", "manager",
+    "consultant", "support", "administration", "data management", "power bi", "bi",
+    "desarrollador", "funcional", "calypso", "back office", "freight", "administrador",
+    "procesos comerciales", "analyst",
+]
+
+# Palabras completas de rol y sufijos de empresa (extract_company_candidates)
+ROLE_KEYWORDS = [
+    'analyst', 'engineer', 'developer', 'manager', 'consultant', 'scientist', 'coordinator',
+    'officer', 'specialist', 'administrator', 'architect', 'operations', 'data', 'insight',
+    'insights', 'analyt', 'analytics', 'analisis', 'analítica',
+]
+COMPANY_INDICATORS = ['inc', 'llc', 'ltda', 'ltd', 'corp', 'company', 'group', 's.a', 'sa', 'co']
+
+CATEGORY_CARGO = 'cargo'
+CATEGORY_ROLE = 'role'
+CATEGORY_COMPANY = 'company_indicator'
+MODALIDAD_PREFIX = 'modalidad:'
+MODALIDAD_CATEGORIES = [MODALIDAD_PREFIX + modalidad for modalidad, _ in MODALIDAD_KEYWORDS]
+
+
+def build_vacancy_matcher() -> KeywordMatcher:
+    """Autómata con todos los vocabularios de vacantes."""
+    matcher = KeywordMatcher()
+    for modalidad, keywords in MODALIDAD_KEYWORDS:
+        matcher.add(MODALIDAD_PREFIX + modalidad, keywords)
+    matcher.add(CATEGORY_CARGO, CARGO_KEYWORDS)
+    matcher.add(CATEGORY_ROLE, ROLE_KEYWORDS, whole_word=True)
+    matcher.add(CATEGORY_COMPANY, COMPANY_INDICATORS, whole_word=True)
+    return matcher
+
+
+VACANCY_KEYWORDS = build_vacancy_matcher()
+
+
+def modalidad_of(categories: Set[str]) -> str:
+    """Modalidad de mayor prioridad entre las categorías encontradas, o ''."""
+    for modalidad, _ in MODALIDAD_KEYWORDS:
+        if MODALIDAD_PREFIX + modalidad in categories:
+            return modalidad
+    return ''
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+scripts/line_columns.py
+
+Formato columnar del dataset de líneas, para cargar millones de líneas sin
+parsear un JSON por línea. Es un directorio junto al JSONL
+(data/line_dataset.jsonl -> data/line_dataset.columns/) con un .npy por
+columna:
+
+ - line.npy + line_offsets.npy            texto UTF-8 de todas las líneas seguido y offsets (n+1)
+ - line_norm.npy + line_norm_offsets.npy  igual para line_norm
+ - label_codes.npy + labels.npy           etiqueta codificada con diccionario (uint8)
+ - source_codes.npy + source_hashes.npy   source_hash codificado con diccionario (uint32)
+ - source_index.npy, line_index.npy       (-1 si la línea no los tiene o son null)
+ - columns.json                           versión, filas, tamaño/mtime del JSONL de origen y
+                                          campos del JSONL que no tienen columna (extra_fields)
+
+Los .npy se abren con np.load(mmap_mode='r'): abrir el dataset solo mapea
+los archivos, y el texto se decodifica únicamente para las filas pedidas.
+columns.json se escribe al final; si el JSONL cambió después (tamaño o mtime
+distintos), find_columns no usa las columnas y los lectores vuelven al JSONL.
+
+Es una vista de solo lectura para conteos y entrenamiento: el YAML de origen
+y los campos extra de cada línea siguen en el JSONL (ver line_dataset.py).
+Si extra_fields está vacío, records() devuelve las líneas completas.
+Requiere numpy.
+
+Uso:
+  python scripts/line_columns.py data/line_dataset.jsonl      # columnas de un JSONL existente
+
+  columns = open_columns('data/line_dataset.jsonl')           # None si no hay columnas al día
+  rows = columns.rows_with_labels(['role', 'company', 'other'])
+  texts, labels = columns.texts(rows), columns.label_values(rows)
+"""
+import argparse
+import json
+import shutil
+from array import array
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from line_dataset import iter_jsonl
+
+COLUMNS_SUFFIX = '.columns'
+META_FILENAME = 'columns.json'
+COLUMNS_VERSION = 1
+TEXT_COLUMNS = ('line', 'line_norm')
+# Campos de una línea que tienen columna
+RECORD_FIELDS = frozenset(TEXT_COLUMNS + ('label', 'source_hash', 'source_index', 'line_index'))
+
+# Filas que records() decodifica de una vez
+RECORDS_CHUNK = 65536
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("El formato columnar requiere numpy. Instálalo con: pip install numpy")
+
+def columns_path(lines_path):
+    """data/line_dataset.jsonl -> data/line_dataset.columns"""
+    lines_path = Path(lines_path)
+    name = lines_path.name
+    if name.endswith('.jsonl'):
+        name = name[:-len('.jsonl')]
+    return lines_path.with_name(name + COLUMNS_SUFFIX)
+
+def _read_meta(columns_dir):
+    try:
+        with open(Path(columns_dir) / META_FILENAME, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('version') == COLUMNS_VERSION else None
+
+def _source_stat(path):
+    st = Path(path).stat()
+    return {"name": Path(path).name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def find_columns(path):
+    """
+    Directorio columnar de path (el propio directorio o el de un JSONL), o
+    None si no existe o quedó desactualizado respecto del JSONL.
+    """
+    path = Path(path)
+    if _read_meta(path) is not None:
+        return path
+    columns_dir = columns_path(path)
+    meta = _read_meta(columns_dir)
+    if meta is None:
+        return None
+    try:
+        current = _source_stat(path)
+    except OSError:
+        return columns_dir
+    source = meta.get('source') or {}
+    if (source.get('size'), source.get('mtime_ns')) != (current['size'], current['mtime_ns']):
+        return None
+    return columns_dir
+
+def open_columns(path):
+    """
+    LineColumns de path si hay columnas al día (ver find_columns), o None
+    para leer el JSONL. Sin numpy también devuelve None, salvo que path sea
+    el propio directorio columnar.
+    """
+    columns_dir = find_columns(path)
+    if columns_dir is None or (np is None and columns_dir != Path(path)):
+        return None
+    return LineColumns(columns_dir)
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+class _TextColumn:
+    """Columna de texto: bytes UTF-8 seguidos (en un temporal) y offsets."""
+
+    def __init__(self, columns_dir, name):
+        self.path = Path(columns_dir) / (name + '.npy')
+        self.offsets_path = Path(columns_dir) / (name + '_offsets.npy')
+        self._tmp_path = Path(columns_dir) / (name + '.tmp')
+        self._tmp = open(self._tmp_path, 'wb')
+        self._offsets = array('q', [0])
+        self._size = 0
+
+    def append(self, text):
+        data = text.encode('utf-8')
+        self._tmp.write(data)
+        self._size += len(data)
+        self._offsets.append(self._size)
+
+    def close(self):
+        # El .npy se arma con su cabecera y el temporal, sin cargarlo en memoria
+        self._tmp.close()
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(np.uint8)),
+                  "fortran_order": False, "shape": (self._size,)}
+        with open(self.path, 'wb') as fout, open(self._tmp_path, 'rb') as fin:
+            np.lib.format.write_array_header_1_0(fout, header)
+            shutil.copyfileobj(fin, fout)
+        self._tmp_path.unlink()
+        np.save(self.offsets_path, np.frombuffer(self._offsets, dtype=np.int64))
+
+    def discard(self):
+        self._tmp.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+class LineColumnsWriter:
+    """
+    Escribe el formato columnar a partir de líneas del dataset (dicts como
+    los del JSONL), en streaming: solo los offsets y códigos quedan en memoria.
+    """
+
+    def __init__(self, columns_dir, source=None):
+        """
+        Args:
+            columns_dir: Directorio de salida (se crea si no existe)
+            source: JSONL del que salen las líneas; su tamaño y mtime quedan
+                    en columns.json para detectar columnas desactualizadas
+        """
+        _require_numpy()
+        self.columns_dir = Path(columns_dir)
+        self.source = Path(source) if source else None
+        self.rows = 0
+        self.columns_dir.mkdir(parents=True, exist_ok=True)
+        # Sin columns.json las columnas a medio escribir no se usan
+        (self.columns_dir / META_FILENAME).unlink(missing_ok=True)
+        self._labels = {}
+        self._source_hashes = {}
+        self._label_codes = array('B')
+        self._source_codes = array('I')
+        self._source_index = array('q')
+        self._line_index = array('q')
+        self._extra_fields = set()
+        self._texts = [_TextColumn(self.columns_dir, name) for name in TEXT_COLUMNS]
+        self.result = None
+
+    def add(self, item):
+        """Agrega una línea ('label' vacío si no tiene; 'text' si no tiene 'line')."""
+        line, line_norm = self._texts
+        line.append(item.get('line') or item.get('text') or '')
+        line_norm.append(item.get('line_norm') or '')
+        label = item.get('label') or ''
+        code = self._labels.setdefault(label, len(self._labels))
+        if code > 255:
+            raise ValueError(f"Demasiadas etiquetas distintas para el formato columnar: {label!r}")
+        self._label_codes.append(code)
+        source_hash = item.get('source_hash') or ''
+        self._source_codes.append(self._source_hashes.setdefault(source_hash, len(self._source_hashes)))
+        self._source_index.append(_to_int(item.get('source_index')))
+        self._line_index.append(_to_int(item.get('line_index')))
+        self._extra_fields.update(item.keys() - RECORD_FIELDS)
+        self.rows += 1
+
+    def close(self):
+        if self.result is not None:
+            return self.result
+        for column in self._texts:
+            column.close()
+        save = lambda name, values: np.save(self.columns_dir / (name + '.npy'), values)
+        save('labels', np.array(list(self._labels), dtype=str))
+        save('label_codes', np.frombuffer(self._label_codes, dtype=np.uint8))
+        save('source_hashes', np.array(list(self._source_hashes), dtype=str))
+        save('source_codes', np.frombuffer(self._source_codes, dtype=np.uint32))
+        save('source_index', np.frombuffer(self._source_index, dtype=np.int64))
+        save('line_index', np.frombuffer(self._line_index, dtype=np.int64))
+        meta = {"version": COLUMNS_VERSION, "rows": self.rows,
+                "source": _source_stat(self.source) if self.source and self.source.exists() else None,
+                "extra_fields": sorted(self._extra_fields)}
+        with open(self.columns_dir / META_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        self.result = self.columns_dir
+        return self.result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for column in self._texts:
+                column.discard()
+
+def write_columns(lines_path, columns_dir=None):
+    """Escribe las columnas de un JSONL de líneas (por defecto en columns_path(lines_path))."""
+    columns_dir = Path(columns_dir) if columns_dir else columns_path(lines_path)
+    with LineColumnsWriter(columns_dir, source=lines_path) as writer:
+        for item in iter_jsonl(lines_path):
+            writer.add(item)
+    return writer.result
+
+class LineColumns:
+    """
+    Dataset columnar abierto con memory-map. Las columnas numéricas son
+    arrays de numpy de solo lectura; los textos se decodifican con texts().
+    """
+
+    def __init__(self, columns_dir):
+        _require_numpy()
+        self.columns_dir = Path(columns_dir)
+        self.meta = _read_meta(self.columns_dir)
+        if self.meta is None:
+            raise ValueError(f"No es un dataset columnar (falta o no es válido {META_FILENAME}): {self.columns_dir}")
+        load = lambda name: np.load(self.columns_dir / (name + '.npy'), mmap_mode='r')
+        self.labels = load('labels').tolist()
+        self.label_codes = load('label_codes')
+        self.source_hashes = load('source_hashes')
+        self.source_codes = load('source_codes')
+        self.source_index = load('source_index')
+        self.line_index = load('line_index')
+        self._texts = {name: (load(name), load(name + '_offsets')) for name in TEXT_COLUMNS}
+
+    def __len__(self):
+        return len(self.label_codes)
+
+    def label_counts(self):
+        """Cantidad de líneas por etiqueta."""
+        counts = np.bincount(self.label_codes, minlength=len(self.labels))
+        return {label: int(count) for label, count in zip(self.labels, counts)}
+
+    def rows_with_labels(self, labels):
+        """Índices (en orden) de las filas cuya etiqueta está en labels."""
+        codes = [code for code, label in enumerate(self.labels) if label in labels]
+        return np.flatnonzero(np.isin(self.label_codes, codes))
+
+    def _rows(self, rows):
+        return np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+
+    def texts(self, rows=None, column='line'):
+        """Textos de la columna (line o line_norm) de las filas pedidas (todas por defecto)."""
+        blob, offsets = self._texts[column]
+        data = memoryview(blob)
+        rows = self._rows(rows)
+        starts, ends = offsets[rows].tolist(), offsets[rows + 1].tolist()
+        return [str(data[start:end], 'utf-8') for start, end in zip(starts, ends)]
+
+    def label_values(self, rows=None):
+        """Etiquetas (str) de las filas pedidas."""
+        return [self.labels[code] for code in self.label_codes[self._rows(rows)].tolist()]
+
+    def records(self, rows=None, chunk_size=RECORDS_CHUNK):
+        """
+        Filas como dicts con los campos del JSONL que tienen columna, decodificadas
+        por tramos. Una línea sin label (o con label vacío) se entrega sin la
+        clave, y los índices -1 como None, para que los lectores apliquen los
+        mismos valores por defecto que con el JSONL. Los campos de
+        meta['extra_fields'] (p. ej. source_yaml) no se incluyen.
+        """
+        source_hashes = self.source_hashes.tolist()
+        rows = self._rows(rows)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            fields = zip(self.texts(chunk), self.texts(chunk, 'line_norm'), self.label_values(chunk),
+                         self.source_codes[chunk].tolist(), self.source_index[chunk].tolist(),
+                         self.line_index[chunk].tolist())
+            for line, line_norm, label, source_code, source_index, line_index in fields:
+                item = {"line": line, "line_norm": line_norm}
+                if label:
+                    item["label"] = label
+                item["source_hash"] = source_hashes[source_code]
+                item["source_index"] = source_index if source_index >= 0 else None
+                item["line_index"] = line_index if line_index >= 0 else None
+                yield item
+
+def main():
+    p = argparse.ArgumentParser(description="Genera el formato columnar (.npy) de un dataset de líneas JSONL")
+    p.add_argument('input', help='JSONL de líneas (p. ej. data/line_dataset.jsonl)')
+    p.add_argument('--outdir', '-o', default=None, help='Directorio de salida (default: <input>.columns)')
+    args = p.parse_args()
+
+    columns_dir = write_columns(Path(args.input), args.outdir)
+    print("Wrote columns:", columns_dir, f"({len(LineColumns(columns_dir))} lines)")
+
+if __name__ == '__main__':
+    main()
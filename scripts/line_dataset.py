@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+scripts/line_dataset.py
+
+Formato normalizado del dataset de líneas. En lugar de repetir el YAML de
+origen en cada línea, el dataset son dos archivos:
+
+ - <nombre>.jsonl          líneas: {"line", "line_norm", "label", "source_hash", "source_index", "line_index"}
+ - <nombre>.sources.jsonl  una fuente por source_hash: {"source_hash", "text", "yaml"}
+
+Los lectores aceptan también el formato anterior (source_yaml dentro de cada
+línea, sin archivo de fuentes), así que dedupe_line_dataset,
+merge_labeled_into_line_dataset, oversample_minority, check_counts y los
+entrenadores leen ambos.
+Quien no necesita el YAML de origen (conteos, entrenamiento) lee solo el
+archivo de líneas.
+
+Si un mismo texto aparece con YAML distintos, la fuente guarda el primero y
+las líneas de los siguientes conservan su source_yaml.
+
+Uso:
+  for item in iter_line_records('data/line_dataset.jsonl'):
+      item['line'], item['label']
+  for item in iter_line_records('data/line_dataset.jsonl', with_sources=True):
+      item['source_yaml']
+
+  with LineTableWriter('data/line_dataset.dedup.jsonl') as writer:
+      copy_sources('data/line_dataset.jsonl', writer)
+      writer.add_line(item)      # si trae source_yaml, lo mueve al archivo de fuentes
+"""
+import hashlib
+import json
+from pathlib import Path
+
+SOURCES_SUFFIX = '.sources.jsonl'
+
+# Equivale a json.dumps(obj, ensure_ascii=False) sin crear un encoder por llamada
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+def dump_record(item):
+    """Línea JSONL de un registro (con su salto de línea)."""
+    return _encode(item) + "\n"
+
+def sources_path(lines_path):
+    """data/line_dataset.jsonl -> data/line_dataset.sources.jsonl"""
+    lines_path = Path(lines_path)
+    name = lines_path.name
+    if name.endswith('.jsonl'):
+        name = name[:-len('.jsonl')]
+    return lines_path.with_name(name + SOURCES_SUFFIX)
+
+def iter_jsonl(path):
+    """Objetos de un JSONL, ignorando líneas vacías o mal formadas."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception:
+                continue
+
+def load_sources(path):
+    """Fuentes por source_hash ({} si no hay archivo de fuentes)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return {src.get('source_hash', ''): src for src in iter_jsonl(path)}
+
+def iter_line_records(path, with_sources=False):
+    """
+    Líneas del dataset en cualquiera de los dos formatos.
+
+    Con with_sources=True cada línea trae source_yaml (del archivo de fuentes
+    si no lo tiene en la propia línea); sin él las líneas se leen tal cual y
+    el archivo de fuentes ni se abre.
+    """
+    sources = load_sources(sources_path(path)) if with_sources else None
+    for obj in iter_jsonl(path):
+        if sources is not None and 'source_yaml' not in obj:
+            src = sources.get(obj.get('source_hash', ''))
+            obj['source_yaml'] = src.get('yaml', '') if src else ''
+        yield obj
+
+def copy_sources(lines_path, writer, source_hashes=None):
+    """
+    Copia al writer las fuentes de lines_path (todas, o solo las de
+    source_hashes). Conviene copiarlas antes de agregar las líneas, para que
+    las fuentes originales tengan prioridad sobre un source_yaml en línea.
+    """
+    path = sources_path(lines_path)
+    if not path.exists():
+        return
+    for src in iter_jsonl(path):
+        if source_hashes is None or src.get('source_hash', '') in source_hashes:
+            writer.add_source(src.get('source_hash', ''), src.get('text', ''), src.get('yaml', ''))
+
+def _yaml_hash(yaml_text):
+    return hashlib.sha1((yaml_text or '').encode('utf-8')).hexdigest()
+
+class LineTableWriter:
+    """
+    Escribe un dataset de líneas normalizado (líneas + fuentes). Cada fuente
+    se escribe una sola vez; solo se recuerda el hash de su YAML.
+    """
+
+    def __init__(self, lines_path):
+        self.lines_path = Path(lines_path)
+        self.sources_path = sources_path(self.lines_path)
+        self.total_lines = 0
+        self.total_sources = 0
+        self._yaml_hashes = {}
+        self._flines = open(self.lines_path, 'w', encoding='utf-8')
+        self._fsources = open(self.sources_path, 'w', encoding='utf-8')
+
+    def has_source(self, source_hash):
+        return source_hash in self._yaml_hashes
+
+    def add_source(self, source_hash, text, yaml_text):
+        """
+        Agrega una fuente (no se reescribe si source_hash ya está).
+
+        Devuelve True si la fuente de source_hash tiene este yaml_text; False
+        si ya tenía otro (las líneas deben llevar entonces su source_yaml).
+        """
+        yaml_hash = _yaml_hash(yaml_text)
+        known = self._yaml_hashes.get(source_hash)
+        if known is not None:
+            return known == yaml_hash
+        self._yaml_hashes[source_hash] = yaml_hash
+        src = {"source_hash": source_hash, "text": text or '', "yaml": yaml_text or ''}
+        self._fsources.write(dump_record(src))
+        self.total_sources += 1
+        return True
+
+    def add_line(self, item, source_text=''):
+        """
+        Agrega una línea. Si trae source_yaml, se guarda como fuente (junto
+        con source_text) y la línea se escribe sin él, salvo que la fuente
+        ya tenga otro YAML.
+        """
+        if 'source_yaml' in item and self.add_source(item.get('source_hash', ''), source_text, item['source_yaml']):
+            item = dict(item)
+            del item['source_yaml']
+        self._flines.write(dump_record(item))
+        self.total_lines += 1
+
+    def write_lines(self, text, count):
+        """Agrega count líneas ya serializadas con dump_record (sus fuentes se agregan con add_source)."""
+        self._flines.write(text)
+        self.total_lines += count
+
+    def close(self):
+        self._flines.close()
+        self._fsources.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
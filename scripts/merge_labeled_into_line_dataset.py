@@ -9,16 +9,20 @@ Toma:
 Actualiza las entradas de line_dataset.jsonl reemplazando label cuando coincida (por source_hash + line_norm),
 añade nuevas si no existían y escribe data/line_dataset.merged.jsonl y data/line_dataset.merged.dedup.jsonl
 
+Lee y escribe el formato normalizado (líneas + .sources.jsonl, ver line_dataset.py);
+también acepta archivos en el formato anterior, con source_yaml en cada línea.
+
 Uso:
   python scripts/merge_labeled_into_line_dataset.py data/line_dataset.jsonl data/review_sample_200_labeled.jsonl
 """
-import json
 import sys
 from pathlib import Path
 import unicodedata
 import re
 from collections import OrderedDict
 
+from line_dataset import LineTableWriter, copy_sources, iter_line_records
+
 def normalize_text(s: str) -> str:
     if s is None:
         return ""
@@ -29,21 +33,10 @@ def normalize_text(s: str) -> str:
     return s
 
 def load_jsonl(path: Path):
-    items = []
     if not path.exists():
-        return items
-    with path.open('r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                items.append(obj)
-            except Exception:
-                # ignore malformed
-                continue
-    return items
+        return []
+    # ignora líneas mal formadas
+    return list(iter_line_records(path))
 
 def merge(main_path: Path, labeled_path: Path, out_path: Path):
     main = load_jsonl(main_path)
@@ -72,17 +65,21 @@ def merge(main_path: Path, labeled_path: Path, out_path: Path):
                 "line_norm": normalize_text(lab.get('line','')),
                 "label": lab.get('label','other'),
                 "source_hash": lab.get('source_hash',''),
-                "source_yaml": lab.get('source_yaml',''),
                 "source_index": lab.get('source_index', None),
                 "line_index": lab.get('line_index', None)
             }
+            # el YAML de origen va al archivo de fuentes (si el labeled lo trae en línea)
+            if 'source_yaml' in lab:
+                new_item["source_yaml"] = lab['source_yaml']
             index[key] = new_item
             added += 1
 
-    # write merged file
-    with out_path.open('w', encoding='utf-8') as fout:
+    # write merged file (fuentes del original primero, luego las del labeled)
+    with LineTableWriter(out_path) as writer:
+        copy_sources(main_path, writer)
+        copy_sources(labeled_path, writer)
         for obj in index.values():
-            fout.write(json.dumps(obj, ensure_ascii=False) + '\n')
+            writer.add_line(obj)
 
     print(f"Merged. updated={updated} added={added} total_after={len(index)} wrote={out_path}")
     return updated, added, len(index)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+scripts/ml_extractor.py
+
+Extracción de cargo/empresa asistida por el clasificador de líneas TF-IDF
+entrenado con train_tfidf_baseline.py (tfidf_vectorizer.pkl y
+tfidf_baseline_model.pkl, etiquetas role/company/other).
+
+El modelo se carga una sola vez por proceso. Las líneas candidatas de todos
+los bloques de un lote se vectorizan en una única matriz dispersa y se llama
+a predict_proba una sola vez; luego, por bloque, se elige la línea con mayor
+probabilidad de 'role' (cargo) y de 'company' (empresa). Si la probabilidad
+no alcanza el umbral, ese campo se extrae con las regex habituales.
+
+Solo se clasifican las primeras MAX_CANDIDATE_LINES líneas candidatas de
+cada bloque, y los bloques con cargo y empresa decididos por el modelo se
+escanean sin los disparadores de esos patrones (VacancyExtractor.FIELD_SCANNER):
+el costo del modelo queda por debajo del escaneo que se ahorra.
+
+Uso:
+  python scripts/extract_vacantes_from_text.py --input vacantes.txt --extractor ml --model-dir models
+  python scripts/split_vacantes_to_yaml.py vacantes.txt vacantes_yaml --extractor ml
+"""
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from extract_vacantes_from_text import VacancyExtractor
+from extraction_cache import fingerprint_of
+
+VECTORIZER_FILE = 'tfidf_vectorizer.pkl'
+MODEL_FILE = 'tfidf_baseline_model.pkl'
+
+ROLE_LABEL = 'role'
+COMPANY_LABEL = 'company'
+
+# Probabilidad mínima para aceptar la línea elegida por el modelo
+DEFAULT_MIN_SCORE = 0.5
+
+# Las líneas más largas son párrafos de descripción, no títulos ni empresas
+MAX_CANDIDATE_LENGTH = 120
+
+# Cargo y empresa están en el encabezado de la vacante: solo se clasifican
+# las primeras líneas candidatas (más abajo el modelo confunde títulos de
+# sección y viñetas con el cargo)
+MAX_CANDIDATE_LINES = 12
+
+
+class ModelUnavailableError(Exception):
+    """El modelo no existe o no se puede cargar (p. ej. falta scikit-learn)."""
+
+
+class LineClassifier:
+    """Vectorizador + clasificador de líneas cargados desde models/."""
+
+    _loaded: Dict[str, 'LineClassifier'] = {}
+
+    def __init__(self, vectorizer, classifier, digest: str):
+        self.vectorizer = vectorizer
+        self.classifier = classifier
+        self.digest = digest
+        self._columns = {label: i for i, label in enumerate(classifier.classes_)}
+
+    @classmethod
+    def load(cls, model_dir) -> 'LineClassifier':
+        """
+        Carga el modelo (una vez por proceso y directorio).
+
+        Args:
+            model_dir: Directorio con tfidf_vectorizer.pkl y tfidf_baseline_model.pkl
+
+        Raises:
+            ModelUnavailableError: Si faltan los archivos o no se pueden deserializar
+        """
+        model_dir = Path(model_dir)
+        key = str(model_dir.resolve())
+        if key in cls._loaded:
+            return cls._loaded[key]
+
+        paths = [model_dir / VECTORIZER_FILE, model_dir / MODEL_FILE]
+        missing = [str(p) for p in paths if not p.exists()]
+        if missing:
+            raise ModelUnavailableError(
+                f"No se encontró el modelo ({', '.join(missing)}). Entrénalo con: "
+                f"python scripts/train_tfidf_baseline.py data/line_dataset.jsonl --output-dir {model_dir}"
+            )
+        digest = hashlib.sha1()
+        objects = []
+        for path in paths:
+            data = path.read_bytes()
+            digest.update(data)
+            try:
+                objects.append(pickle.loads(data))
+            except (ImportError, pickle.UnpicklingError, AttributeError, EOFError) as e:
+                raise ModelUnavailableError(f"No se pudo cargar {path}: {e} (¿está instalado scikit-learn?)")
+
+        classifier = cls(objects[0], objects[1], digest.hexdigest())
+        cls._loaded[key] = classifier
+        return classifier
+
+    def column(self, label: str) -> Optional[int]:
+        """Columna de predict_proba de la etiqueta, o None si el modelo no la conoce."""
+        return self._columns.get(label)
+
+    def predict_proba(self, lines: Sequence[str]):
+        """Probabilidades por etiqueta de un lote de líneas (una sola llamada al modelo)."""
+        return self.classifier.predict_proba(self.vectorizer.transform(lines))
+
+
+def candidate_lines(text: str) -> List[str]:
+    """Primeras líneas no vacías del bloque que pueden ser un cargo o una empresa."""
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and len(line) <= MAX_CANDIDATE_LENGTH:
+            lines.append(line)
+            if len(lines) == MAX_CANDIDATE_LINES:
+                break
+    return lines
+
+
+def pick_cargo_empresa(classifier: LineClassifier, blocks: Sequence[str],
+                       min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Elige la línea de cargo y la de empresa de cada bloque con un único
+    predict_proba sobre las líneas de todos los bloques.
+
+    Args:
+        classifier: Clasificador de líneas
+        blocks: Textos de las vacantes
+        min_score: Probabilidad mínima para aceptar una línea
+
+    Returns:
+        Lista de tuplas (cargo, empresa) en el orden de blocks; None donde
+        el modelo no alcanzó el umbral
+    """
+    lines: List[str] = []
+    bounds = []
+    for block in blocks:
+        candidates = candidate_lines(block)
+        bounds.append((len(lines), len(lines) + len(candidates)))
+        lines.extend(candidates)
+    if not lines:
+        return [(None, None)] * len(blocks)
+
+    proba = classifier.predict_proba(lines)
+    role = classifier.column(ROLE_LABEL)
+    company = classifier.column(COMPANY_LABEL)
+
+    picks = []
+    for start, end in bounds:
+        cargo = empresa = None
+        role_idx = None
+        if end > start and role is not None:
+            idx = start + int(proba[start:end, role].argmax())
+            if proba[idx, role] >= min_score:
+                cargo, role_idx = lines[idx], idx
+        if end > start and company is not None:
+            scores = proba[start:end, company].copy()
+            if role_idx is not None:
+                # La línea del cargo no puede ser también la empresa
+                scores[role_idx - start] = -1.0
+            idx = start + int(scores.argmax())
+            if scores[idx - start] >= min_score:
+                empresa = lines[idx]
+        picks.append((cargo, empresa))
+    return picks
+
+
+class MLVacancyExtractor(VacancyExtractor):
+    """
+    VacancyExtractor que decide cargo/empresa con el clasificador de líneas
+    (por lotes) y usa los patrones regex como respaldo; el resto de campos se
+    extrae igual que en VacancyExtractor.
+    """
+
+    BATCHED = True
+
+    def __init__(self, verbose: bool = True, model_dir='models',
+                 min_score: float = DEFAULT_MIN_SCORE, **kwargs):
+        """
+        Args:
+            verbose: Si debe imprimir información detallada
+            model_dir: Directorio del modelo entrenado
+            min_score: Probabilidad mínima para aceptar la línea del modelo
+            **kwargs: Resto de opciones de VacancyExtractor
+
+        Raises:
+            ModelUnavailableError: Si el modelo no se puede cargar
+        """
+        super().__init__(verbose=verbose, **kwargs)
+        self.model_dir = str(model_dir)
+        self.min_score = min_score
+        self.classifier = LineClassifier.load(model_dir)
+
+    def fingerprint(self) -> str:
+        """Huella del extractor para la caché: incluye el contenido del modelo."""
+        return fingerprint_of(super().fingerprint(), self.classifier.digest, self.min_score,
+                              MAX_CANDIDATE_LENGTH, MAX_CANDIDATE_LINES)
+
+    def worker_options(self) -> Dict:
+        """Opciones con las que se crea el extractor de cada worker."""
+        options = super().worker_options()
+        options.update(model_dir=self.model_dir, min_score=self.min_score)
+        return options
+
+    def extract_batch(self, blocks: List[str]) -> List[Dict]:
+        """
+        Extrae los campos de un lote de bloques con una sola predicción del modelo.
+
+        Args:
+            blocks: Textos de las vacantes
+
+        Returns:
+            Lista de campos en el mismo orden
+        """
+        picks = pick_cargo_empresa(self.classifier, blocks, self.min_score)
+        return [
+            self.extract_vacancy_fields(block, preset={'cargo': cargo, 'empresa': empresa})
+            for block, (cargo, empresa) in zip(blocks, picks)
+        ]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+scripts/output_manifest.py
+
+Manifiesto de los archivos generados en un directorio de salida. Registra,
+por archivo, el hash de su contenido, el hash del bloque de origen (ver
+extraction_cache.block_hash) y el tamaño y mtime con que quedó escrito.
+
+Antes de escribir un archivo se clasifica su contenido:
+  - new:       el archivo no existe
+  - changed:   existe con otro contenido
+  - unchanged: existe con el mismo contenido (no se vuelve a escribir, así
+               no cambia su mtime)
+
+Si el tamaño y el mtime del archivo coinciden con los del manifiesto basta
+comparar los hashes; si no (archivo editado a mano, checkout nuevo o archivo
+sin entrada) se compara con el contenido en disco. El manifiesto es una
+aceleración: borrarlo no cambia el resultado.
+
+El archivo del manifiesto (.manifest.json) es compartido por todos los
+scripts que escriben en el mismo directorio, y las etapas siguientes pueden
+usarlo para saber qué cambió sin volver a leer los YAML.
+
+Uso:
+  with OutputManifest('vacantes_yaml') as manifest:
+      status = manifest.classify(filename, contenido)
+      if status != STATUS_UNCHANGED:
+          escribir(filename, contenido)
+      manifest.record(filename, contenido, source_hash=block_hash(bloque))
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from batch_writer import atomic_write
+
+MANIFEST_FILENAME = '.manifest.json'
+MANIFEST_VERSION = 1
+
+STATUS_NEW = 'new'
+STATUS_CHANGED = 'changed'
+STATUS_UNCHANGED = 'unchanged'
+
+
+def new_output_counts() -> Dict[str, int]:
+    """Contadores de archivos por estado, para las estadísticas de cada script."""
+    return {STATUS_NEW: 0, STATUS_CHANGED: 0, STATUS_UNCHANGED: 0}
+
+
+def classify_output(path: Path, data: bytes, entry: Optional[Dict] = None) -> str:
+    """
+    Estado de un archivo respecto de un contenido a escribir.
+
+    Args:
+        path: Ruta del archivo
+        data: Contenido a escribir
+        entry: Entrada del manifiesto para el archivo (opcional); si su tamaño
+               y mtime coinciden con los del archivo, no se lee el disco
+
+    Returns:
+        STATUS_NEW, STATUS_CHANGED o STATUS_UNCHANGED
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return STATUS_NEW
+    if st.st_size != len(data):
+        return STATUS_CHANGED
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        same = entry['content_hash'] == hashlib.sha1(data).hexdigest()
+    else:
+        same = path.read_bytes() == data
+    return STATUS_UNCHANGED if same else STATUS_CHANGED
+
+
+class OutputManifest:
+    """Manifiesto (filename -> hashes) de un directorio de salida."""
+
+    def __init__(self, output_dir, encoding: str = 'utf-8', filename: str = MANIFEST_FILENAME):
+        """
+        Args:
+            output_dir: Directorio de salida (debe existir al guardar)
+            encoding: Codificación de los archivos
+            filename: Nombre del manifiesto dentro de output_dir
+        """
+        self.output_dir = Path(output_dir)
+        self.encoding = encoding
+        self.path = self.output_dir / filename
+        self.entries: Dict[str, Dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('files', {})
+
+    def _data(self, content) -> bytes:
+        return content.encode(self.encoding) if isinstance(content, str) else content
+
+    def classify(self, filename: str, content) -> str:
+        """
+        Estado del archivo respecto de un contenido a escribir.
+
+        Args:
+            filename: Nombre del archivo dentro de output_dir
+            content: Contenido a escribir (str o bytes)
+
+        Returns:
+            STATUS_NEW, STATUS_CHANGED o STATUS_UNCHANGED
+        """
+        return classify_output(self.output_dir / filename, self._data(content), self.entries.get(filename))
+
+    def record(self, filename: str, content, source_hash: Optional[str] = None):
+        """
+        Registra el contenido con que quedó un archivo (después de escribirlo
+        o de comprobar que no cambió).
+
+        Args:
+            filename: Nombre del archivo dentro de output_dir
+            content: Contenido del archivo (str o bytes)
+            source_hash: Hash del bloque de origen
+        """
+        st = (self.output_dir / filename).stat()
+        entry = {
+            'content_hash': hashlib.sha1(self._data(content)).hexdigest(),
+            'source_hash': source_hash,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+        }
+        if self.entries.get(filename) != entry:
+            self.entries[filename] = entry
+            self._dirty = True
+
+    def save(self):
+        """Guarda el manifiesto si cambió (escritura atómica)."""
+        if not self._dirty:
+            return
+        manifest = {'version': MANIFEST_VERSION, 'files': self.entries}
+        atomic_write(self.path, json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8'))
+        self._dirty = False
+
+    def __enter__(self) -> 'OutputManifest':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.save()
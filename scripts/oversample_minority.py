@@ -4,19 +4,29 @@ Oversample minority class in data/line_dataset.jsonl by duplicating examples.
 Uso:
   python scripts/oversample_minority.py --input data/line_dataset.jsonl --output data/line_dataset.oversampled.jsonl --target-ratio 0.33
 target-ratio = fraction deseada de la clase minoritaria (ej. 0.33 => queremos que 'company' sea ~33% del dataset)
+La salida lleva su archivo de fuentes (data/line_dataset.oversampled.sources.jsonl, ver line_dataset.py).
+Si el JSONL tiene columnas al día (line_columns.py) y sin campos extra, se leen las columnas.
 """
-import argparse, json, random
+import argparse, random
 from collections import defaultdict
 from pathlib import Path
 
+from line_columns import open_columns
+from line_dataset import LineTableWriter, copy_sources, iter_line_records
+
 def load(path):
-    with open(path,'r',encoding='utf-8') as f:
-        return [json.loads(l) for l in f if l.strip()]
+    columns = open_columns(path)
+    # Las columnas no guardan source_yaml ni otros campos extra: si el JSONL los tiene, se lee el JSONL
+    if columns is not None and columns.meta.get('extra_fields') == []:
+        return list(columns.records())
+    return list(iter_line_records(path))
 
-def save(path, items):
-    with open(path,'w',encoding='utf-8') as f:
+def save(path, items, sources_from):
+    with LineTableWriter(path) as writer:
+        # Las líneas duplicadas apuntan a las mismas fuentes: se copian todas
+        copy_sources(sources_from, writer)
         for it in items:
-            f.write(json.dumps(it, ensure_ascii=False) + '\n')
+            writer.add_line(it)
 
 def main():
     p = argparse.ArgumentParser()
@@ -45,7 +55,7 @@ def main():
         for _ in range(need):
             new_items.append(random.choice(by_label[args.label]))
     random.shuffle(new_items)
-    save(Path(args.output), new_items)
+    save(Path(args.output), new_items, args.input)
     print("Wrote oversampled file:", args.output, "new_total:", len(new_items))
 
 if __name__ == '__main__':
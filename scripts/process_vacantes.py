@@ -6,6 +6,14 @@ Módulo para procesar y validar un archivo vacantes.txt con múltiples vacantes
 en formato YAML separadas por '---', generar archivos .yaml individuales por 
 cada vacante, y reportar inconsistencias en la estructura o campos esenciales.
 
+Solo las líneas que empiezan con '---' separan vacantes (un '---' dentro de
+una descripción no divide el documento). El parseo y la emisión usan libyaml
+cuando está disponible (ver yaml_documents) y los errores indican la línea
+del archivo de entrada.
+
+Con --to-jsonl cada vacante válida se agrega al JSONL en cuanto se valida
+(ver jsonl_sink), sin retener el lote completo en memoria.
+
 Campos requeridos:
   - cargo
   - empresa
@@ -20,12 +28,24 @@ Uso:
 
 """
 import argparse
-import json
 import re
 import yaml
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime, date
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional
+
+from batch_writer import DEFAULT_WRITER_WORKERS, MAX_PENDING_PER_WORKER, InlineExecutor, atomic_write
+from block_watcher import DEFAULT_POLL_INTERVAL, BlockWatcher, watch
+from extraction_cache import ExtractionCache, block_hash, fingerprint_of
+from jsonl_sink import JsonlSink
+from output_manifest import STATUS_UNCHANGED, OutputManifest, new_output_counts
+from vacancy_blocks import iter_blocks, SEPARATOR_YAML
+from yaml_documents import LIBYAML, LineCounter, dump_document, load_document, locate_error
+
+# Tamaño de bloque (vacantes por tarea) en modo paralelo
+DEFAULT_CHUNK_SIZE = 32
 
 
 class VacancyProcessor:
@@ -33,7 +53,11 @@ class VacancyProcessor:
     
     REQUIRED_FIELDS = ['cargo', 'empresa', 'fecha', 'descripcion', 'requerimientos']
     
-    def __init__(self, input_file: Path, output_dir: Path, verbose: bool = True):
+    # Incrementar al cambiar el parseo, la validación o el nombrado (invalida la caché)
+    PROCESSOR_VERSION = 2
+    
+    def __init__(self, input_file: Path, output_dir: Path, verbose: bool = True,
+                 cache: Optional[ExtractionCache] = None):
         """
         Inicializa el procesador de vacantes.
         
@@ -41,35 +65,53 @@ class VacancyProcessor:
             input_file: Ruta al archivo vacantes.txt
             output_dir: Directorio de salida para archivos .yaml individuales
             verbose: Si debe imprimir información detallada
+            cache: Caché de bloques ya procesados (opcional)
         """
         self.input_file = Path(input_file)
         self.output_dir = Path(output_dir)
         self.verbose = verbose
+        self.cache = cache
         self.stats = {
             'total': 0,
             'valid': 0,
             'invalid': 0,
+            'cache_hits': 0,
+            # Archivos escritos nuevos / modificados y sin cambios (no reescritos)
+            'output_files': new_output_counts(),
             'errors': []
         }
+    
+    @classmethod
+    def fingerprint(cls) -> str:
+        """Huella del procesador para la caché de bloques."""
+        return fingerprint_of(cls.__name__, cls.PROCESSOR_VERSION, cls.REQUIRED_FIELDS)
         
-    def read_vacantes_file(self) -> List[str]:
+    def iter_vacantes_blocks(self) -> Iterator[Tuple[int, str]]:
         """
-        Lee el archivo de vacantes y lo divide por el delimitador '---'.
+        Itera los documentos YAML del archivo de vacantes (divididos por
+        las líneas '---'), leyendo en streaming (sin cargar el archivo completo).
         
-        Returns:
-            Lista de bloques YAML como strings
+        Yields:
+            Tuplas (offset_en_bytes, bloque YAML como string)
         """
         if not self.input_file.exists():
             raise FileNotFoundError(f"El archivo {self.input_file} no existe")
         
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if self.verbose:
+            print(f"📄 Archivo leído: {self.input_file}")
         
-        # Dividir por '---' y filtrar bloques vacíos
-        blocks = [block.strip() for block in content.split('---') if block.strip()]
+        yield from iter_blocks(self.input_file, separator=SEPARATOR_YAML)
+    
+    def read_vacantes_file(self) -> List[str]:
+        """
+        Lee el archivo de vacantes y lo divide por las líneas '---'.
+        
+        Returns:
+            Lista de bloques YAML como strings
+        """
+        blocks = [block for _, block in self.iter_vacantes_blocks()]
         
         if self.verbose:
-            print(f"📄 Archivo leído: {self.input_file}")
             print(f"📊 Bloques encontrados: {len(blocks)}")
         
         return blocks
@@ -166,6 +208,48 @@ class VacancyProcessor:
         
         return f"{fecha}_{cargo}_{empresa}.yaml"
     
+    def analyze_block(self, block: str, block_num: int) -> Tuple:
+        """
+        Parsea y valida un bloque y, si la vacante es válida, genera su nombre
+        de archivo y su YAML. No escribe nada, así que puede ejecutarse en un
+        proceso del pool.
+        
+        Args:
+            block: Bloque YAML
+            block_num: Número de bloque para reportar errores
+        
+        Returns:
+            Tupla (vacante, errores, filename, contenido): errores es None si el
+            bloque no es un diccionario y filename/contenido son None si la
+            vacante no es válida
+        
+        Raises:
+            yaml.YAMLError: Si el bloque no es YAML válido
+        """
+        vacancy = load_document(block)
+        if not isinstance(vacancy, dict):
+            return vacancy, None, None, None
+        is_valid, errors = self.validate_vacancy(vacancy, block_num)
+        if not is_valid:
+            return vacancy, errors, None, None
+        return vacancy, errors, self.generate_filename(vacancy), dump_document(vacancy)
+    
+    def write_yaml_file(self, filename: str, content: str) -> Path:
+        """
+        Escribe un YAML ya generado en el directorio de salida (en un temporal
+        que luego se renombra, nunca queda un archivo a medio escribir).
+        
+        Args:
+            filename: Nombre del archivo de salida
+            content: Contenido YAML
+        
+        Returns:
+            Ruta del archivo escrito
+        """
+        filepath = self.output_dir / filename
+        atomic_write(filepath, content.encode('utf-8'))
+        return filepath
+    
     def save_yaml_file(self, vacancy: Dict, filename: str) -> bool:
         """
         Guarda una vacante en un archivo YAML individual.
@@ -173,105 +257,158 @@ class VacancyProcessor:
         Args:
             vacancy: Diccionario con los datos de la vacante
             filename: Nombre del archivo de salida
-            
+        
         Returns:
             True si se guardó exitosamente
         """
         try:
-            filepath = self.output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                yaml.dump(vacancy, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            self.write_yaml_file(filename, dump_document(vacancy))
             return True
         except Exception as e:
             if self.verbose:
                 print(f"❌ Error al guardar {filename}: {e}")
             return False
     
-    def process_all(self) -> Dict:
+    def iter_analyzed(self, blocks: Iterable[Tuple[int, str]], workers: int = 1,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple]:
+        """
+        Recorre los bloques con su análisis (ver analyze_block), hecho en un
+        pool de procesos si workers > 1. El orden de salida es siempre el orden
+        de entrada. Los bloques presentes en la caché cuyo YAML ya existe no se
+        analizan.
+        
+        Args:
+            blocks: Iterador de tuplas (offset, bloque)
+            workers: Número de procesos (1 = el análisis queda para quien consume)
+            chunk_size: Bloques por tarea enviada a cada proceso
+        
+        Yields:
+            Tuplas (numero_de_bloque, offset, bloque, hash_del_bloque, hit, análisis)
+            donde hit es la entrada de la caché o None, y análisis es None si
+            el bloque no se analizó (en serie, desde la caché o porque falló
+            en el pool: se repite en este proceso para reportar el error)
+        """
+        def candidates():
+            for i, (offset, block) in enumerate(blocks, start=1):
+                key = block_hash(block)
+                hit = self.cache.get(key) if self.cache is not None else None
+                if hit and not (self.output_dir / hit[0]).exists():
+                    hit = None
+                yield i, offset, block, key, hit
+        
+        if workers <= 1:
+            for i, offset, block, key, hit in candidates():
+                yield i, offset, block, key, hit, None
+            return
+        
+        def chunks():
+            chunk = []
+            for item in candidates():
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        # Se limita el número de tareas en vuelo para no materializar toda la entrada
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks():
+                to_analyze = [(i, block) for i, _, block, _, hit in chunk if not hit]
+                future = executor.submit(_analyze_chunk, to_analyze, type(self)) if to_analyze else None
+                pending.append((chunk, future))
+                if len(pending) < workers * 2:
+                    continue
+                yield from self._collect_chunk(*pending.popleft())
+            while pending:
+                yield from self._collect_chunk(*pending.popleft())
+    
+    def _collect_chunk(self, chunk: List[Tuple], future) -> Iterator[Tuple]:
+        """Espera el análisis de un chunk y lo entrega en orden."""
+        analyzed = iter(future.result() if future is not None else ())
+        for i, offset, block, key, hit in chunk:
+            yield i, offset, block, key, hit, None if hit else next(analyzed)
+    
+    def process_all(self, blocks: Optional[Iterable[Tuple[int, str]]] = None, workers: int = 1,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    write_workers: int = DEFAULT_WRITER_WORKERS, sink: Optional[JsonlSink] = None) -> Dict:
         """
         Procesa todas las vacantes del archivo.
         
+        El análisis de cada bloque (parseo, validación, nombre y YAML) se hace
+        en serie o en un pool de procesos, y las escrituras en un pool de
+        hilos. Estadísticas, errores y mensajes se registran en el orden de
+        entrada, igual que en serie.
+        
+        Los archivos cuyo contenido no cambió no se reescriben (ver
+        output_manifest); el manifiesto del directorio se actualiza al final.
+        
+        Con sink (ver jsonl_sink), cada vacante válida se escribe como
+        registro JSON en cuanto se valida, en orden de entrada, y no se
+        acumula en 'valid_vacancies'.
+        
+        Args:
+            blocks: Bloques (offset, texto) a procesar; por defecto todos los
+                    del archivo (el modo watch pasa solo los nuevos)
+            workers: Número de procesos para el análisis (1 = en serie)
+            chunk_size: Bloques por tarea en modo paralelo
+            write_workers: Hilos de escritura de archivos (0 = en este hilo)
+            sink: Destino de los registros JSON de las vacantes válidas (opcional)
+        
         Returns:
             Diccionario con estadísticas del procesamiento
         """
         # Crear directorio de salida si no existe
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Leer bloques YAML
-        blocks = self.read_vacantes_file()
-        self.stats['total'] = len(blocks)
-        
         valid_vacancies = []
+        # Línea de inicio de cada bloque, calculada solo para reportar errores
+        lines = LineCounter(self.input_file)
+        manifest = OutputManifest(self.output_dir)
         
         if self.verbose:
             print("\n" + "="*70)
             print("PROCESAMIENTO DE VACANTES")
             print("="*70 + "\n")
+            print(f"⚙️  Parser YAML: {'libyaml' if LIBYAML else 'Python puro'}")
         
-        # Procesar cada bloque
-        for i, block in enumerate(blocks, start=1):
-            if self.verbose:
-                print(f"\n📋 Procesando bloque {i}/{len(blocks)}...")
-            
-            try:
-                # Parsear YAML
-                vacancy = yaml.safe_load(block)
-                
-                if not isinstance(vacancy, dict):
-                    error_msg = f"Bloque {i}: No es un diccionario YAML válido"
-                    self.stats['errors'].append({'bloque': i, 'error': error_msg})
-                    self.stats['invalid'] += 1
-                    if self.verbose:
-                        print(f"   ❌ {error_msg}")
-                    continue
-                
-                # Validar campos
-                is_valid, errors = self.validate_vacancy(vacancy, i)
-                
-                if is_valid:
-                    # Generar nombre de archivo
-                    filename = self.generate_filename(vacancy)
-                    
-                    # Guardar archivo YAML
-                    if self.save_yaml_file(vacancy, filename):
-                        self.stats['valid'] += 1
-                        valid_vacancies.append(vacancy)
-                        if self.verbose:
-                            print(f"   ✅ Guardado: {filename}")
-                    else:
-                        self.stats['invalid'] += 1
-                        error_msg = f"Error al guardar archivo"
-                        self.stats['errors'].append({'bloque': i, 'error': error_msg})
-                else:
-                    self.stats['invalid'] += 1
-                    error_detail = {
-                        'bloque': i,
-                        'errores': errors,
-                        'cargo': vacancy.get('cargo', 'N/A'),
-                        'empresa': vacancy.get('empresa', 'N/A')
-                    }
-                    self.stats['errors'].append(error_detail)
-                    
-                    if self.verbose:
-                        print(f"   ❌ Vacante inválida:")
-                        for error in errors:
-                            print(f"      • {error}")
-                        print(f"      Cargo: {vacancy.get('cargo', 'N/A')}")
-                        print(f"      Empresa: {vacancy.get('empresa', 'N/A')}")
-            
-            except yaml.YAMLError as e:
-                error_msg = f"Error al parsear YAML: {str(e)}"
-                self.stats['errors'].append({'bloque': i, 'error': error_msg})
-                self.stats['invalid'] += 1
-                if self.verbose:
-                    print(f"   ❌ {error_msg}")
-            
-            except Exception as e:
-                error_msg = f"Error inesperado: {str(e)}"
-                self.stats['errors'].append({'bloque': i, 'error': error_msg})
-                self.stats['invalid'] += 1
-                if self.verbose:
-                    print(f"   ❌ {error_msg}")
+        # Procesar cada bloque a medida que se lee
+        if blocks is None:
+            blocks = self.iter_vacantes_blocks()
+        
+        # Bloques ya analizados cuya escritura puede seguir en curso, en orden de entrada
+        pending = deque()
+        # Última escritura encolada por archivo: un mismo nombre se escribe en orden
+        last_write: Dict[str, Future] = {}
+        max_pending = max(1, write_workers) * MAX_PENDING_PER_WORKER
+        writer = (ThreadPoolExecutor(max_workers=write_workers, thread_name_prefix='writer')
+                  if write_workers > 0 else InlineExecutor())
+        with writer, manifest:
+            for i, offset, block, key, hit, analysis in self.iter_analyzed(blocks, workers, chunk_size):
+                error = status = future = None
+                if not hit:
+                    try:
+                        if analysis is None:
+                            analysis = self.analyze_block(block, i)
+                        filename, content = analysis[2], analysis[3]
+                        if filename is not None:
+                            previous = last_write.get(filename)
+                            if previous is not None:
+                                wait([previous])
+                            # Contenido idéntico al del archivo existente: no se reescribe
+                            status = manifest.classify(filename, content)
+                            if status != STATUS_UNCHANGED:
+                                future = writer.submit(self.write_yaml_file, filename, content)
+                                last_write[filename] = future
+                    except Exception as e:
+                        error = e
+                pending.append((i, offset, key, hit, analysis, error, status, future))
+                while pending and (len(pending) > max_pending or pending[0][-1] is None
+                                   or pending[0][-1].done()):
+                    self._report_block(*pending.popleft(), lines, manifest, valid_vacancies, sink)
+            while pending:
+                self._report_block(*pending.popleft(), lines, manifest, valid_vacancies, sink)
         
         # Mostrar resumen
         if self.verbose:
@@ -282,6 +419,102 @@ class VacancyProcessor:
             'valid_vacancies': valid_vacancies
         }
     
+    def _report_block(self, i: int, offset: int, key: str, hit: Optional[Tuple],
+                      analysis: Optional[Tuple], error: Optional[Exception], status: Optional[str],
+                      future: Optional[Future], lines: LineCounter, manifest: OutputManifest,
+                      valid_vacancies: List[Dict], sink: Optional[JsonlSink] = None):
+        """Registra el resultado de un bloque (espera su escritura si sigue en curso)."""
+        self.stats['total'] += 1
+        if self.verbose:
+            print(f"\n📋 Procesando bloque {i} (byte {offset})...")
+        
+        # Bloque sin cambios cuyo YAML ya existe: no se vuelve a procesar
+        if hit:
+            self.stats['valid'] += 1
+            self.stats['cache_hits'] += 1
+            if sink is not None:
+                sink.write(hit[1])
+            else:
+                valid_vacancies.append(hit[1])
+            if self.verbose:
+                print(f"   ♻️  Sin cambios (caché): {hit[0]}")
+            return
+        
+        if isinstance(error, yaml.YAMLError):
+            # Las marcas del error pasan a referirse a líneas de input_file
+            first_line = lines.line_at(offset)
+            line = locate_error(error, self.input_file, first_line) or first_line
+            error_msg = f"Error al parsear YAML: {str(error)}"
+            self.stats['errors'].append({'bloque': i, 'linea': line, 'error': error_msg})
+            self.stats['invalid'] += 1
+            if self.verbose:
+                print(f"   ❌ {error_msg}")
+            return
+        
+        if error is not None:
+            error_msg = f"Error inesperado: {str(error)}"
+            self.stats['errors'].append({'bloque': i, 'linea': lines.line_at(offset), 'error': error_msg})
+            self.stats['invalid'] += 1
+            if self.verbose:
+                print(f"   ❌ {error_msg}")
+            return
+        
+        vacancy, errors, filename, content = analysis
+        if errors is None:
+            line = lines.line_at(offset)
+            error_msg = f"Bloque {i} (línea {line}): No es un diccionario YAML válido"
+            self.stats['errors'].append({'bloque': i, 'linea': line, 'error': error_msg})
+            self.stats['invalid'] += 1
+            if self.verbose:
+                print(f"   ❌ {error_msg}")
+            return
+        
+        if errors:
+            self.stats['invalid'] += 1
+            error_detail = {
+                'bloque': i,
+                'linea': lines.line_at(offset),
+                'errores': errors,
+                'cargo': vacancy.get('cargo', 'N/A'),
+                'empresa': vacancy.get('empresa', 'N/A')
+            }
+            self.stats['errors'].append(error_detail)
+            
+            if self.verbose:
+                print(f"   ❌ Vacante inválida (línea {error_detail['linea']}):")
+                for error in errors:
+                    print(f"      • {error}")
+                print(f"      Cargo: {vacancy.get('cargo', 'N/A')}")
+                print(f"      Empresa: {vacancy.get('empresa', 'N/A')}")
+            return
+        
+        try:
+            if future is not None:
+                future.result()
+            manifest.record(filename, content, source_hash=key)
+        except Exception as e:
+            if self.verbose:
+                print(f"❌ Error al guardar {filename}: {e}")
+            self.stats['invalid'] += 1
+            error_msg = f"Error al guardar archivo"
+            self.stats['errors'].append({'bloque': i, 'linea': lines.line_at(offset), 'error': error_msg})
+            return
+        
+        self.stats['valid'] += 1
+        self.stats['output_files'][status] += 1
+        record = self._to_json_record(vacancy) if sink is not None or self.cache is not None else None
+        if sink is not None:
+            sink.write(record)
+        else:
+            valid_vacancies.append(vacancy)
+        if self.cache is not None:
+            self.cache.put(key, filename, record)
+        if self.verbose:
+            if status == STATUS_UNCHANGED:
+                print(f"   ⏸️  Sin cambios (contenido idéntico): {filename}")
+            else:
+                print(f"   ✅ Guardado: {filename}")
+    
     def _print_summary(self):
         """Imprime un resumen del procesamiento."""
         print("\n" + "="*70)
@@ -290,12 +523,18 @@ class VacancyProcessor:
         print(f"📊 Total de bloques procesados: {self.stats['total']}")
         print(f"✅ Vacantes válidas: {self.stats['valid']}")
         print(f"❌ Vacantes inválidas: {self.stats['invalid']}")
+        if self.stats['cache_hits']:
+            print(f"♻️  Vacantes sin cambios (caché): {self.stats['cache_hits']}")
+        files = self.stats['output_files']
+        print(f"📁 Archivos: {files['new']} nuevos, {files['changed']} modificados, "
+              f"{files['unchanged']} sin cambios (no reescritos)")
         
         if self.stats['errors']:
             print(f"\n⚠️  ERRORES DETECTADOS ({len(self.stats['errors'])}):")
             print("-"*70)
             for i, error in enumerate(self.stats['errors'], start=1):
-                print(f"\n{i}. Bloque {error.get('bloque', 'N/A')}:")
+                line = f" (línea {error['linea']})" if error.get('linea') else ''
+                print(f"\n{i}. Bloque {error.get('bloque', 'N/A')}{line}:")
                 if 'errores' in error:
                     for err in error['errores']:
                         print(f"   • {err}")
@@ -308,37 +547,74 @@ class VacancyProcessor:
         print(f"💾 Archivos guardados en: {self.output_dir.absolute()}")
         print("="*70 + "\n")
     
-    def convert_to_jsonl(self, valid_vacancies: List[Dict], output_file: Path):
+    def _to_json_record(self, vacancy: Dict) -> Dict:
+        """
+        Copia de la vacante lista para JSON (fecha como string YYYY-MM-DD).
+        
+        Args:
+            vacancy: Diccionario con los datos de la vacante
+            
+        Returns:
+            Copia serializable de la vacante
+        """
+        # Convertir objetos date a string para JSON
+        vacancy_copy = vacancy.copy()
+        if 'fecha' in vacancy_copy and isinstance(vacancy_copy['fecha'], (datetime, date)):
+            vacancy_copy['fecha'] = vacancy_copy['fecha'].strftime('%Y-%m-%d')
+        return vacancy_copy
+    
+    def convert_to_jsonl(self, valid_vacancies: Iterable[Dict], output_file: Path):
         """
         Convierte las vacantes válidas a formato JSONL.
         
+        Para no retener el lote completo, process_all(sink=JsonlSink(...))
+        escribe los registros a medida que se validan.
+        
         Args:
-            valid_vacancies: Lista de vacantes válidas
+            valid_vacancies: Vacantes válidas (cualquier iterable)
             output_file: Ruta del archivo JSONL de salida
         """
-        if not valid_vacancies:
-            if self.verbose:
-                print("⚠️  No hay vacantes válidas para convertir a JSONL")
-            return
-        
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with JsonlSink(output_file) as sink:
                 for vacancy in valid_vacancies:
-                    # Convertir objetos date a string para JSON
-                    vacancy_copy = vacancy.copy()
-                    if 'fecha' in vacancy_copy and isinstance(vacancy_copy['fecha'], (datetime, date)):
-                        vacancy_copy['fecha'] = vacancy_copy['fecha'].strftime('%Y-%m-%d')
-                    
-                    json_line = json.dumps(vacancy_copy, ensure_ascii=False)
-                    f.write(json_line + '\n')
-            
-            if self.verbose:
-                print(f"\n✅ Archivo JSONL creado: {output_file.absolute()}")
-                print(f"   Vacantes exportadas: {len(valid_vacancies)}")
-        
+                    sink.write(self._to_json_record(vacancy))
         except Exception as e:
             if self.verbose:
                 print(f"\n❌ Error al crear archivo JSONL: {e}")
+            return
+        self.report_jsonl(sink)
+    
+    def report_jsonl(self, sink: JsonlSink):
+        """Informa el resultado de un sink JSONL ya cerrado."""
+        if not self.verbose:
+            return
+        if not sink.count:
+            print("⚠️  No hay vacantes válidas para convertir a JSONL")
+            return
+        print(f"\n✅ Archivo JSONL creado: {sink.path.absolute()}")
+        print(f"   Vacantes exportadas: {sink.count}")
+
+
+def _analyze_chunk(items: List[Tuple[int, str]], processor_class: type) -> List[Optional[Tuple]]:
+    """
+    Tarea de un worker: analiza un chunk de bloques (ver VacancyProcessor.analyze_block).
+    
+    Args:
+        items: Tuplas (numero_de_bloque, bloque)
+        processor_class: VacancyProcessor o una subclase
+        
+    Returns:
+        Lista de análisis en el mismo orden; None para los bloques que
+        fallaron (el proceso principal los repite para reportar el error)
+    """
+    processor = processor_class(Path(), Path(), verbose=False)
+    results = []
+    for block_num, block in items:
+        try:
+            results.append(processor.analyze_block(block, block_num))
+        except Exception:
+            results.append(None)
+    return results
 
 
 def main():
@@ -357,6 +633,15 @@ Ejemplos de uso:
   # Especificar nombre del archivo JSONL
   python scripts/process_vacantes.py --input vacantes.txt --output output/vacantes --to-jsonl --jsonl-file mis_vacantes.jsonl
   
+  # Reutilizar bloques ya procesados (caché SQLite)
+  python scripts/process_vacantes.py --input vacantes.txt --output output/vacantes --cache .cache/process_cache.sqlite
+  
+  # Parsear y validar con 4 procesos (las escrituras van en un pool de hilos)
+  python scripts/process_vacantes.py --input vacantes.txt --output output/vacantes --workers 4
+  
+  # Procesar solo lo agregado a vacantes.txt, vigilando el archivo
+  python scripts/process_vacantes.py --input vacantes.txt --output output/vacantes --watch
+  
   # Modo silencioso (sin output detallado)
   python scripts/process_vacantes.py --input vacantes.txt --output output/vacantes --quiet
         """
@@ -366,7 +651,7 @@ Ejemplos de uso:
         '--input', '-i',
         type=str,
         default='vacantes.txt',
-        help='Archivo de entrada con vacantes en formato YAML separadas por ---'
+        help='Archivo de entrada con vacantes en formato YAML separadas por líneas ---'
     )
     
     parser.add_argument(
@@ -389,6 +674,52 @@ Ejemplos de uso:
         help='Nombre del archivo JSONL de salida (solo si --to-jsonl está activo)'
     )
     
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default=None,
+        help='Archivo SQLite de caché; los bloques sin cambios no se vuelven a procesar'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Vigilar el archivo de entrada y procesar solo los bloques agregados desde el último checkpoint'
+    )
+    
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Con --watch: procesar lo pendiente desde el checkpoint y terminar'
+    )
+    
+    parser.add_argument(
+        '--checkpoint',
+        default='.cache/process_watch_checkpoint.json',
+        help='Archivo de checkpoint del modo watch (default: .cache/process_watch_checkpoint.json)'
+    )
+    
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f'Segundos entre revisiones del archivo en modo watch (default: {DEFAULT_POLL_INTERVAL})'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Número de procesos para parsear y validar en paralelo (default: 1, en serie)'
+    )
+    
+    parser.add_argument(
+        '--write-workers',
+        type=int,
+        default=DEFAULT_WRITER_WORKERS,
+        help=f'Hilos de escritura de archivos YAML; 0 escribe en el hilo principal (default: {DEFAULT_WRITER_WORKERS})'
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
@@ -397,20 +728,44 @@ Ejemplos de uso:
     
     args = parser.parse_args()
     
+    cache = ExtractionCache(args.cache, VacancyProcessor.fingerprint()) if args.cache else None
+    
     # Crear procesador
     processor = VacancyProcessor(
         input_file=Path(args.input),
         output_dir=Path(args.output),
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        cache=cache
     )
     
+    # Con --to-jsonl los registros se escriben a medida que se validan
+    sink = JsonlSink(Path(args.output) / args.jsonl_file) if args.to_jsonl else None
+    
     # Procesar vacantes
-    result = processor.process_all()
+    try:
+        if args.watch:
+            # Solo se procesan los bloques agregados desde el último checkpoint
+            result = {'stats': processor.stats}
+            watcher = BlockWatcher(args.input, args.checkpoint, separator=SEPARATOR_YAML)
+            watch(
+                watcher,
+                lambda blocks: processor.process_all(
+                    blocks, workers=args.workers, write_workers=args.write_workers, sink=sink),
+                poll_interval=args.poll_interval,
+                once=args.once,
+                verbose=not args.quiet
+            )
+        else:
+            result = processor.process_all(workers=args.workers, write_workers=args.write_workers,
+                                           sink=sink)
+    finally:
+        if cache is not None:
+            cache.close()
+        if sink is not None:
+            sink.close()
     
-    # Convertir a JSONL si se solicita
-    if args.to_jsonl:
-        jsonl_path = Path(args.output) / args.jsonl_file
-        processor.convert_to_jsonl(result['valid_vacancies'], jsonl_path)
+    if sink is not None:
+        processor.report_jsonl(sink)
     
     # Retornar código de salida apropiado
     if result['stats']['invalid'] > 0:
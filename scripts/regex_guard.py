@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+scripts/regex_guard.py
+
+Capa de ejecución protegida para las regex de extracción. Cada bloque tiene
+un presupuesto de tiempo; los patrones propensos a backtracking (cuantificadores
+perezosos como .+? o repeticiones acotadas amplias como {2,40}) solo se
+ejecutan sobre el bloque completo si ninguna de sus líneas supera un largo
+máximo y si el bloque no agotó su presupuesto.
+
+Cuando no se cumple alguna de esas condiciones el patrón no se ejecuta sobre
+el bloque y se usa la estrategia por líneas: el mismo patrón se busca sobre
+ventanas de dos líneas consecutivas truncadas a un largo máximo, con costo
+lineal en el tamaño del bloque. Cada recurso a la estrategia por líneas queda
+registrado con el nombre del patrón.
+
+El módulo `re` no permite interrumpir una búsqueda en curso, por eso el
+presupuesto se verifica antes de cada búsqueda (no durante ella) y la
+protección real frente a entradas patológicas la dan los límites de largo.
+
+Con profile=True además registra, por patrón, coincidencias, fallos, veces
+omitido (disparador ausente) y tiempo acumulado.
+
+Uso:
+  guard = RegexGuard(profile=True)
+  guard.begin(texto)
+  match = guard.search('cargo[0]', pattern, texto)
+  guard.fallbacks       # {'cargo[0]': 1, ...}
+  guard.pattern_stats   # {'cargo[0]': {'hits': 1, 'misses': 0, 'skipped': 0, 'seconds': 0.0001}}
+"""
+import re
+import time
+from typing import Dict, Iterator, Optional, Pattern
+
+# Presupuesto de tiempo de regex por bloque (segundos)
+DEFAULT_BLOCK_BUDGET = 0.25
+
+# Largo máximo de línea sobre el que se ejecuta un patrón propenso a backtracking
+DEFAULT_MAX_LINE_CHARS = 2000
+
+# Cuantificadores perezosos (*?, +?, }?) o repeticiones acotadas amplias ({2,40})
+BACKTRACK_PRONE_RE = re.compile(r'[*+}]\?|\{\d+,\d{2,}\}')
+
+
+def is_backtrack_prone(pattern: Pattern) -> bool:
+    """Indica si el patrón contiene construcciones que pueden volverse superlineales."""
+    return BACKTRACK_PRONE_RE.search(pattern.pattern) is not None
+
+
+class RegexGuard:
+    """
+    Ejecuta búsquedas regex dentro del presupuesto de un bloque y recurre a
+    la estrategia por líneas cuando el patrón no puede ejecutarse con seguridad.
+    """
+
+    def __init__(self, block_budget: float = DEFAULT_BLOCK_BUDGET,
+                 max_line_chars: int = DEFAULT_MAX_LINE_CHARS, profile: bool = False):
+        """
+        Args:
+            block_budget: Segundos de regex permitidos por bloque
+            max_line_chars: Largo máximo de línea para patrones propensos a backtracking
+            profile: Si debe registrar coincidencias, fallos y tiempo por patrón
+        """
+        self.block_budget = block_budget
+        self.max_line_chars = max_line_chars
+        self.profile = profile
+        self.fallbacks: Dict[str, int] = {}
+        self.pattern_stats: Dict[str, Dict] = {}
+        self._prone: Dict[Pattern, bool] = {}
+        self._spent = 0.0
+        self._long_lines = False
+        self._lines = None
+        self._text = None
+
+    def begin(self, text: str):
+        """Reinicia el presupuesto para un nuevo bloque."""
+        self._spent = 0.0
+        self._text = text
+        self._lines = None
+        self._long_lines = len(text) > self.max_line_chars and any(
+            len(line) > self.max_line_chars for line in text.split('\n')
+        )
+
+    def ensure_begun(self, text: str):
+        """Llama a begin(text) salvo que el bloque en curso ya sea text."""
+        if text is not self._text:
+            self.begin(text)
+
+    @property
+    def exhausted(self) -> bool:
+        """Si el bloque actual agotó su presupuesto de tiempo."""
+        return self._spent >= self.block_budget
+
+    def _is_prone(self, pattern: Pattern) -> bool:
+        prone = self._prone.get(pattern)
+        if prone is None:
+            prone = self._prone[pattern] = is_backtrack_prone(pattern)
+        return prone
+
+    def _record_fallback(self, name: str):
+        self.fallbacks[name] = self.fallbacks.get(name, 0) + 1
+
+    def _entry(self, name: str) -> Dict:
+        entry = self.pattern_stats.get(name)
+        if entry is None:
+            entry = self.pattern_stats[name] = {'hits': 0, 'misses': 0, 'skipped': 0, 'seconds': 0.0}
+        return entry
+
+    def _record(self, name: str, hit: bool, seconds: float):
+        if self.profile:
+            entry = self._entry(name)
+            entry['hits' if hit else 'misses'] += 1
+            entry['seconds'] += seconds
+
+    def record_skip(self, name: str):
+        """Registra que un patrón no se ejecutó porque su disparador no aparece."""
+        if self.profile:
+            self._entry(name)['skipped'] += 1
+
+    def search(self, name: str, pattern: Pattern, text: str, pos: int = 0):
+        """
+        Equivalente a pattern.search(text, pos) dentro del presupuesto.
+
+        Args:
+            name: Nombre del patrón (para el registro de recursos a la estrategia por líneas)
+            pattern: Patrón compilado
+            text: Texto del bloque (el mismo pasado a begin)
+            pos: Posición inicial de la búsqueda
+
+        Returns:
+            Match o None
+        """
+        started = time.perf_counter()
+        if self.exhausted or (self._long_lines and self._is_prone(pattern)):
+            self._record_fallback(name)
+            match = self.line_search(pattern, text, pos)
+        else:
+            match = pattern.search(text, pos)
+        elapsed = time.perf_counter() - started
+        self._spent += elapsed
+        self._record(name, match is not None, elapsed)
+        return match
+
+    def findall(self, name: str, pattern: Pattern, text: str) -> list:
+        """Equivalente a pattern.findall(text) dentro del presupuesto."""
+        started = time.perf_counter()
+        if self.exhausted or (self._long_lines and self._is_prone(pattern)):
+            self._record_fallback(name)
+            result = [item for window in self._windows(text, 0, pairs=False)
+                      for item in pattern.findall(window)]
+        else:
+            result = pattern.findall(text)
+        elapsed = time.perf_counter() - started
+        self._spent += elapsed
+        self._record(name, bool(result), elapsed)
+        return result
+
+    def line_search(self, pattern: Pattern, text: str, pos: int = 0):
+        """
+        Estrategia por líneas: busca el patrón en ventanas de dos líneas
+        consecutivas (truncadas a max_line_chars) a partir de la línea de pos.
+        """
+        for window in self._windows(text, pos, pairs=True):
+            match = pattern.search(window)
+            if match:
+                return match
+        return None
+
+    def _windows(self, text: str, pos: int, pairs: bool) -> Iterator[str]:
+        if self._lines is None or text is not self._text:
+            self._text = text
+            self._lines = []
+            start = 0
+            for line in text.split('\n'):
+                self._lines.append((start, line[:self.max_line_chars]))
+                start += len(line) + 1
+        lines = self._lines
+        for i, (start, line) in enumerate(lines):
+            if start + len(line) < pos:
+                continue
+            if start < pos:
+                line = line[pos - start:]
+            if pairs and i + 1 < len(lines):
+                yield f'{line}\n{lines[i + 1][1]}'
+            else:
+                yield line
+
+
+def merge_fallbacks(target: Dict[str, int], other: Optional[Dict[str, int]]):
+    """Suma los contadores de recursos a la estrategia por líneas de otro guard."""
+    for name, count in (other or {}).items():
+        target[name] = target.get(name, 0) + count
+
+
+def merge_pattern_stats(target: Dict[str, Dict], other: Optional[Dict[str, Dict]]):
+    """Suma las estadísticas por patrón (pattern_stats) de otro guard."""
+    for name, entry in (other or {}).items():
+        current = target.setdefault(name, {'hits': 0, 'misses': 0, 'skipped': 0, 'seconds': 0.0})
+        for key, value in entry.items():
+            current[key] = current.get(key, 0) + value
+
+
+def summarize_pattern_stats(pattern_stats: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Resumen por patrón para reportes: contadores, tasa de acierto sobre las
+    ejecuciones y tiempo medio por ejecución, ordenado por tiempo total.
+    """
+    summary = {}
+    for name, entry in sorted(pattern_stats.items(), key=lambda item: -item[1]['seconds']):
+        runs = entry['hits'] + entry['misses']
+        summary[name] = {
+            'hits': entry['hits'],
+            'misses': entry['misses'],
+            'skipped': entry['skipped'],
+            'seconds': round(entry['seconds'], 6),
+            'hit_rate': round(entry['hits'] / runs, 4) if runs else None,
+            'avg_ms': round(entry['seconds'] * 1000 / runs, 4) if runs else None,
+        }
+    return summary
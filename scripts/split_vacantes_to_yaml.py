@@ -1,6 +1,12 @@
-import os
 import re
 from datetime import datetime
+from functools import lru_cache
+
+from batch_writer import DEFAULT_WRITER_WORKERS, BatchWriter
+from block_scanner import HeadingIndex, Section, paragraph_end, skip_heading_separator
+from extraction_pipeline import (STRATEGY_LINKEDIN, ExtractionStrategy, FieldValue,
+                                 build_pipeline, parse_strategy_names)
+from keyword_matcher import CATEGORY_CARGO, MODALIDAD_CATEGORIES, VACANCY_KEYWORDS, modalidad_of
 
 IGNORE_LINES = {
     "easy apply","save","share","show more options","logo","apply",
@@ -13,6 +19,9 @@ IGNORE_LINES = {
     "people you can reach out to","meet the hiring team","message","show all",
     "job poster"
 }
+# Largo máximo del nombre de archivo (NAME_MAX en la mayoría de sistemas de archivos)
+MAX_FILENAME_LENGTH = 255
+
 IGNORE_PATTERNS = [
     r"\d+\s+(applicants|people clicked apply)",
     r".*logo$",
@@ -21,6 +30,11 @@ IGNORE_PATTERNS = [
     r"^\s*$",
     r"^[A-Z][a-z]+\slogo$"
 ]
+# Todos los IGNORE_PATTERNS en una sola alternancia (se aplica con match, como cada uno por separado)
+IGNORE_RE = re.compile("|".join(f"(?:{pat})" for pat in IGNORE_PATTERNS))
+
+# Líneas distintas recordadas por is_valid (el texto repetitivo de LinkedIn cuesta una búsqueda en el dict)
+IS_VALID_CACHE_SIZE = 65536
 
 def normalize_filename(s):
     s = s.lower()
@@ -30,29 +44,38 @@ def normalize_filename(s):
     return s
 
 def detect_modalidad(text):
-    for modalidad in ["remoto", "remote", "híbrido", "hybrid", "presencial", "on-site"]:
-        if modalidad.lower() in text.lower():
-            if "remote" in modalidad.lower():
-                return "remoto"
-            elif "hybrid" in modalidad.lower() or "híbrido" in modalidad.lower():
-                return "híbrido"
-            elif "on-site" in modalidad.lower() or "presencial" in modalidad.lower():
-                return "presencial"
-    return ""
+    return modalidad_of(VACANCY_KEYWORDS.categories(text, MODALIDAD_CATEGORIES))
 
 def is_valid(line):
-    l = line.strip().lower()
+    return _is_valid_stripped(line.strip())
+
+@lru_cache(maxsize=IS_VALID_CACHE_SIZE)
+def _is_valid_stripped(line):
+    l = line.lower()
     if l in IGNORE_LINES:
         return False
-    for pat in IGNORE_PATTERNS:
-        if re.match(pat, l):
-            return False
+    if IGNORE_RE.match(l):
+        return False
     return bool(l)
 
+# Rutas de layout_cargo_empresa que cuentan como resultado confiable en el pipeline
+CONFIDENT_LAYOUT_PATHS = ('logo', 'separador')
+
 def extract_cargo_empresa(text):
-    lines = [l.strip() for l in text.splitlines()]
+    cargo, empresa, _, _ = layout_cargo_empresa([l.strip() for l in text.splitlines()])
+    return cargo, empresa
+
+def layout_cargo_empresa(lines):
+    """
+    Heurísticas del layout de LinkedIn sobre las líneas (con strip) de una vacante.
+
+    Devuelve (cargo, empresa, ruta_cargo, ruta_empresa); la ruta es la heurística
+    que decidió el campo: 'logo', 'separador', 'primera_valida', 'palabras_cargo'
+    o 'ninguno'.
+    """
     lines_filtered = [l for l in lines if is_valid(l)]
     cargo, empresa = "", ""
+    cargo_path = empresa_path = "ninguno"
     # 1. Busca el patrón "Empresa logo" seguido de la empresa real y luego el cargo principal
     for i in range(len(lines_filtered)-2):
         if "logo" in lines_filtered[i].lower() and is_valid(lines_filtered[i+1]) and is_valid(lines_filtered[i+2]):
@@ -62,6 +85,7 @@ def extract_cargo_empresa(text):
             if empresa_candidate.lower() != "job poster" and is_valid(empresa_candidate):
                 empresa = empresa_candidate
                 cargo = cargo_candidate
+                cargo_path = empresa_path = "logo"
                 break
     # 2. Busca "Cargo\nEmpresa · Ubicación"
     if not empresa or not cargo:
@@ -72,83 +96,198 @@ def extract_cargo_empresa(text):
                 if is_valid(empresa_candidate) and empresa_candidate.lower() != "job poster":
                     cargo = l1
                     empresa = empresa_candidate
+                    cargo_path = empresa_path = "separador"
                     break
     # 3. Fallback: primer línea válida no ubicación ni acción para empresa
     if not empresa:
         for line in lines_filtered:
             if is_valid(line) and line.lower() != "job poster":
                 empresa = line
+                empresa_path = "primera_valida"
                 break
     # 4. Fallback para cargo
     if not cargo:
         for line in lines_filtered:
-            if is_valid(line) and any(x in line.lower() for x in [
-                "analista","business","developer","specialist","coordinator","manager",
-                "consultant","support","administration","data management","power bi","bi",
-                "desarrollador","funcional","calypso","back office","freight","administrador",
-                "procesos comerciales","analyst"]):
+            if is_valid(line) and VACANCY_KEYWORDS.hits(line, [CATEGORY_CARGO]):
                 cargo = line
+                cargo_path = "palabras_cargo"
                 break
     cargo = cargo.replace("·", "").strip()
     empresa = empresa.replace("·", "").strip()
     # Si empresa es ubicación, ignora
     if empresa.lower() in IGNORE_LINES or not empresa or empresa == cargo:
         empresa = ""
-    return cargo, empresa
+    if not cargo:
+        cargo_path = "ninguno"
+    if not empresa:
+        empresa_path = "ninguno"
+    return cargo, empresa, cargo_path, empresa_path
+
+class LinkedInLayoutStrategy(ExtractionStrategy):
+    """
+    Estrategia 'linkedin' del pipeline de extracción: layout_cargo_empresa sobre
+    las líneas del escaneo compartido. Las rutas 'logo' y 'separador' son
+    confiables; 'primera_valida' y 'palabras_cargo' son respaldos.
+    """
 
-def extract_requerimientos(text):
+    name = STRATEGY_LINKEDIN
+
+    def extract(self, scan, fields):
+        cargo, empresa, cargo_path, empresa_path = layout_cargo_empresa(scan.stripped_lines())
+        values = {
+            'cargo': FieldValue(cargo or None, cargo_path in CONFIDENT_LAYOUT_PATHS, cargo_path),
+            'empresa': FieldValue(empresa or None, empresa_path in CONFIDENT_LAYOUT_PATHS, empresa_path),
+        }
+        return {field: values[field] for field in fields}
+
+# Encabezados de sección (en el orden de prioridad de la alternancia original) y su tipo
+SECTION_HEADINGS = [
+    (r'Requerimientos', 'requerimientos'),
+    (r'Requirements', 'requerimientos'),
+    (r'Responsabilidades Clave', 'responsabilidades'),
+    (r'Key Responsibilities', 'responsabilidades'),
+    (r'Qualifications', 'requerimientos'),
+    (r'Responsabilidades', 'responsabilidades'),
+    (r'Responsabilidades principales', 'responsabilidades'),
+    (r'What We’re Looking For', 'requerimientos'),
+    (r'Lo que buscamos en ti', 'requerimientos'),
+    (r'Condiciones de trabajo', 'condiciones'),
+    (r'Skills', 'requerimientos'),
+    (r'Required Skills', 'requerimientos'),
+    (r'Responsabilidades:', 'responsabilidades'),
+    (r'Requisitos:', 'requerimientos'),
+    (r'Requisitos y conocimientos del Rol:', 'requerimientos'),
+    (r'Qué buscamos en ti:', 'requerimientos'),
+    (r'Lo que harás:', 'responsabilidades'),
+    (r'What You’ll Do:', 'responsabilidades'),
+]
+SECTION_INDEX = HeadingIndex(SECTION_HEADINGS, re.IGNORECASE)
+
+def extract_sections(text):
+    """
+    Secciones de requerimientos/responsabilidades del texto. Cada cuerpo va
+    desde el encabezado hasta la siguiente línea en blanco; los encabezados
+    que caen dentro del cuerpo de una sección anterior se ignoran.
+    """
+    sections = []
+    end = 0
+    for heading in SECTION_INDEX.find(text):
+        if heading.start < end:
+            continue
+        body_start = skip_heading_separator(text, heading.end)
+        body_end, end = paragraph_end(text, body_start)
+        sections.append(Section(heading, body_start, body_end, text[body_start:body_end]))
+    return sections
+
+def extract_requerimientos(text, sections=None):
+    if sections is None:
+        sections = extract_sections(text)
     requerimientos = []
-    req_match = re.findall(
-        r'(?:Requerimientos|Requirements|Responsabilidades Clave|Key Responsibilities|Qualifications|Responsabilidades|Responsabilidades principales|What We’re Looking For|Lo que buscamos en ti|Condiciones de trabajo|Skills|Required Skills|Responsabilidades:|Requisitos:|Requisitos y conocimientos del Rol:|Qué buscamos en ti:|Lo que harás:|What You’ll Do:)\s*[\n:]*([\s\S]*?)(?:\n{2,}|$)',
-        text, re.IGNORECASE)
-    for req_block in req_match:
-        for line in req_block.splitlines():
+    for section in sections:
+        for line in section.body.splitlines():
             line = line.strip('-• \n\t')
             if line and len(line) > 4 and is_valid(line):
                 requerimientos.append(line)
     return requerimientos
 
-def split_vacantes(input_file, output_dir):
+def split_vacantes(input_file, output_dir, classifier=None, min_score=None,
+                   writer_workers=DEFAULT_WRITER_WORKERS, strategies=(STRATEGY_LINKEDIN,)):
+    """
+    Divide vacantes.txt en un YAML por vacante.
+
+    Cargo y empresa se deciden con el pipeline de extracción (ver
+    extraction_pipeline) con las estrategias indicadas, en ese orden.
+
+    Si se pasa classifier (ml_extractor.LineClassifier), cargo y empresa se
+    eligen con el modelo en una sola predicción para todo el archivo; los que
+    no alcanzan min_score se extraen con las estrategias.
+
+    Los archivos se escriben con BatchWriter: si dos vacantes distintas dan el
+    mismo nombre, la segunda recibe un sufijo con el hash de su contenido.
+    """
     with open(input_file, encoding='utf-8') as f:
         content = f.read()
 
     vacantes = content.split('---')
-    for idx, vacante in enumerate(vacantes):
-        vacante = vacante.strip()
-        if not vacante:
-            continue
+    picks = {}
+    if classifier is not None:
+        from ml_extractor import DEFAULT_MIN_SCORE, pick_cargo_empresa
+        indexed = [(idx, v.strip()) for idx, v in enumerate(vacantes) if v.strip()]
+        scores = pick_cargo_empresa(classifier, [v for _, v in indexed],
+                                    DEFAULT_MIN_SCORE if min_score is None else min_score)
+        picks = {idx: pick for (idx, _), pick in zip(indexed, scores)}
+
+    pipeline = build_pipeline(strategies)
+    with BatchWriter(output_dir, writer_workers) as writer:
+        for idx, vacante in enumerate(vacantes):
+            vacante = vacante.strip()
+            if not vacante:
+                continue
+            write_vacante(writer, pipeline, idx, vacante, picks.get(idx, (None, None)))
+    if writer.stats['renamed']:
+        print(f"⚠️  {writer.stats['renamed']} nombre(s) repetido(s): se agregó el hash del contenido al nombre")
 
-        cargo, empresa = extract_cargo_empresa(vacante)
-        fecha = datetime.now().strftime('%Y-%m-%d')
-        modalidad = detect_modalidad(vacante)
-        requerimientos = extract_requerimientos(vacante)
-        descripcion = vacante.replace('\r', '')  # Todo el texto plano
+def write_vacante(writer, pipeline, idx, vacante, ml_pick):
+    """Extrae los campos de una vacante y encola su YAML en el writer."""
+    ml_cargo, ml_empresa = ml_pick
+    scan = pipeline.scan(vacante)
+    results = pipeline.run(scan, {'cargo': ml_cargo, 'empresa': ml_empresa})
+    cargo = results['cargo'].value or ""
+    empresa = results['empresa'].value or ""
+    fecha = datetime.now().strftime('%Y-%m-%d')
+    modalidad = detect_modalidad(vacante)
+    requerimientos = extract_requerimientos(vacante)
+    descripcion = vacante.replace('\r', '')  # Todo el texto plano
 
-        cargo_norm = normalize_filename(cargo) if cargo else f"vacante_{idx+1}"
-        empresa_norm = normalize_filename(empresa) if empresa else "empresa"
-        filename = f"{cargo_norm}_{empresa_norm}_{fecha}.yaml"
-        filepath = os.path.join(output_dir, filename)
-        os.makedirs(output_dir, exist_ok=True)
+    cargo_norm = normalize_filename(cargo) if cargo else f"vacante_{idx+1}"
+    empresa_norm = normalize_filename(empresa) if empresa else "empresa"
+    filename = f"{cargo_norm}_{empresa_norm}_{fecha}.yaml"
+    if len(filename) > MAX_FILENAME_LENGTH:
+        # Un párrafo tomado como cargo o empresa no cabe como nombre de archivo
+        filename = f"{cargo_norm[:120].strip('_')}_{empresa_norm[:80].strip('_')}_{fecha}.yaml"
 
-        yaml_content = f'''cargo: "{cargo}"
+    descripcion_indentada = descripcion.replace("\n", "\n  ")
+    yaml_content = f'''cargo: "{cargo}"
 empresa: "{empresa}"
 fecha: "{fecha}"
 modalidad: "{modalidad}"
 descripcion: |
-  {descripcion.replace("\n", "\n  ")}
+  {descripcion_indentada}
 requerimientos:
 '''
-        for req in requerimientos:
-            yaml_content += f"  - {req}\n"
-        with open(filepath, 'w', encoding='utf-8') as out:
-            out.write(yaml_content)
+    yaml_content += ''.join(f"  - {req}\n" for req in requerimientos)
+    filepath = writer.submit(filename, yaml_content)
+    if filepath is None:
+        print(f'Duplicada (mismo contenido): {filename}')
+    else:
         print(f'Escribiendo: {filepath}')
 
 if __name__ == '__main__':
+    import argparse
     import sys
-    if len(sys.argv) < 3:
-        print("Uso: python scripts/split_vacantes_to_yaml.py vacantes.txt vacantes_yaml")
-        sys.exit(1)
-    input_file = sys.argv[1]
-    output_dir = sys.argv[2]
-    split_vacantes(input_file, output_dir)
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        usage="python scripts/split_vacantes_to_yaml.py vacantes.txt vacantes_yaml [--extractor ml]"
+    )
+    parser.add_argument('input_file')
+    parser.add_argument('output_dir')
+    parser.add_argument('--extractor', choices=['regex', 'ml'], default='regex',
+                        help='Estrategia para cargo/empresa (ml: clasificador de líneas con regex de respaldo)')
+    parser.add_argument('--model-dir', default='models',
+                        help='Directorio con tfidf_vectorizer.pkl y tfidf_baseline_model.pkl')
+    parser.add_argument('--strategies', type=parse_strategy_names, default=[STRATEGY_LINKEDIN],
+                        help='Estrategias de cargo/empresa en orden de prioridad, separadas por coma: '
+                             'linkedin (default), etiquetas')
+    parser.add_argument('--write-workers', type=int, default=DEFAULT_WRITER_WORKERS,
+                        help=f'Hilos de escritura de los YAML (default: {DEFAULT_WRITER_WORKERS})')
+    args = parser.parse_args()
+
+    classifier = None
+    if args.extractor == 'ml':
+        from ml_extractor import LineClassifier, ModelUnavailableError
+        try:
+            classifier = LineClassifier.load(args.model_dir)
+        except ModelUnavailableError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+    split_vacantes(args.input_file, args.output_dir, classifier, writer_workers=args.write_workers,
+                   strategies=args.strategies)
\ No newline at end of file
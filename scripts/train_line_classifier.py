@@ -21,7 +21,8 @@ Requisitos:
     python -m pip install transformers datasets accelerate scikit-learn evaluate
 
 El script:
- - carga el JSONL en datasets
+ - carga el JSONL en datasets (o, si existen y están al día, las columnas
+   data/line_dataset.columns/ de convert_to_line_dataset.py --columnar, con memory-map)
  - mapea labels a integers
  - tokeniza con el tokenizer del modelo base
  - entrena con Trainer y guarda el modelo/tokenizer al final
@@ -31,7 +32,7 @@ import argparse
 import os
 from pathlib import Path
 import numpy as np
-from datasets import load_dataset, ClassLabel
+from datasets import Dataset, load_dataset, ClassLabel
 from transformers import (
     AutoTokenizer,
     AutoModelForSequenceClassification,
@@ -41,12 +42,14 @@ from transformers import (
 )
 import evaluate
 
+from line_columns import open_columns
+
 LABELS = ["role", "company", "other"]
 
 def parse_args():
     p = argparse.ArgumentParser(description="Train line-level classifier")
     p.add_argument("--data-file", type=str, default="data/line_dataset.jsonl",
-                   help="Path to line-level JSONL produced by convert_to_line_dataset.py")
+                   help="Path to line-level JSONL produced by convert_to_line_dataset.py (or its .columns directory)")
     p.add_argument("--model", type=str, default="distilbert-base-uncased",
                    help="Pretrained model to fine-tune")
     p.add_argument("--output-dir", type=str, default="models/line-classifier",
@@ -97,10 +100,15 @@ def main():
     if not data_path.exists():
         raise FileNotFoundError(f"Data file not found: {data_path}")
 
-    # load dataset (JSON lines)
-    ds = load_dataset("json", data_files=str(data_path), field=None)
-    # dataset comes as ds['train']
-    ds = ds["train"]
+    columns = open_columns(data_path)
+    if columns is not None:
+        # formato columnar: solo se decodifican las columnas line y label
+        ds = Dataset.from_dict({"line": columns.texts(), "label": columns.label_values()})
+    else:
+        # load dataset (JSON lines)
+        ds = load_dataset("json", data_files=str(data_path), field=None)
+        # dataset comes as ds['train']
+        ds = ds["train"]
     # quick info
     print("Loaded dataset examples:", len(ds))
 
@@ -1,46 +1,14 @@
 #!/usr/bin/env python3
 """
-<<<<<<< HEAD
-Entrena un clasificador TF-IDF + LogisticRegression rápido como baseline.
-Salida: model.pkl (joblib) y imprime métricas.
-Uso:
-  python scripts/train_tfidf_baseline.py data/line_dataset.jsonl
-"""
-import sys, json
-from pathlib import Path
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
-import joblib
-
-def load(path):
-    X=[]; y=[]
-    with open(path,encoding='utf-8') as f:
-        for l in f:
-            obj=json.loads(l)
-            X.append(obj.get('line',''))
-            y.append(obj.get('label','other'))
-    return X,y
-
-if __name__ == '__main__':
-    path = sys.argv[1] if len(sys.argv)>1 else 'data/line_dataset.jsonl'
-    X,y = load(path)
-    X_train, X_test, y_train, y_test = train_test_split(X,y,test_size=0.1, random_state=42, stratify=y)
-    v = TfidfVectorizer(ngram_range=(1,2), max_features=20000)
-    Xt = v.fit_transform(X_train)
-    clf = LogisticRegression(max_iter=200, class_weight='balanced')
-    clf.fit(Xt, y_train)
-    Xtst = v.transform(X_test)
-    preds = clf.predict(Xtst)
-    print(classification_report(y_test, preds))
-    joblib.dump({'vect':v, 'clf':clf}, 'models/tfidf_baseline.joblib')
-    print("Saved models/tfidf_baseline.joblib")
-=======
 train_tfidf_baseline.py
 
 Baseline classifier using TF-IDF features for line classification.
 Trains a model to classify lines into role/company/other categories.
+
+The dataset can be the JSONL or its columnar form (line_dataset.columns/,
+written by convert_to_line_dataset.py --columnar or line_columns.py); if the
+JSONL has up-to-date columns next to it, they are memory-mapped instead of
+parsing the JSONL.
 """
 
 import argparse
@@ -59,17 +27,51 @@ except ImportError:
     print("Error: scikit-learn is required. Install with: pip install scikit-learn")
     exit(1)
 
+from line_columns import open_columns
+
+
+def load_columnar_dataset(columns):
+    """
+    Load labeled examples from a memory-mapped columnar dataset.
+    
+    Args:
+        columns: line_columns.LineColumns
+        
+    Returns:
+        Tuple of (texts, labels)
+    """
+    print(f"Loading columnar dataset from: {columns.columns_dir}")
+    
+    # Skip unlabeled or skipped entries (empty label = missing in the JSONL)
+    rows = columns.rows_with_labels([l for l in columns.labels if l not in ['unlabeled', 'skip', '']])
+    texts = []
+    labels = []
+    for text, label in zip(columns.texts(rows), columns.label_values(rows)):
+        text = text.strip()
+        if text:
+            texts.append(text)
+            labels.append(label)
+    
+    print(f"Loaded {len(texts)} labeled examples")
+    print(f"Label distribution: {dict(Counter(labels))}")
+    
+    return texts, labels
+
 
 def load_dataset(file_path):
     """
-    Load line dataset from JSONL file.
+    Load line dataset from JSONL file (or its columnar form, see line_columns.py).
     
     Args:
-        file_path: Path to JSONL file
+        file_path: Path to JSONL file or columns directory
         
     Returns:
         Tuple of (texts, labels)
     """
+    columns = open_columns(file_path)
+    if columns is not None:
+        return load_columnar_dataset(columns)
+    
     texts = []
     labels = []
     
@@ -85,7 +87,8 @@ def load_dataset(file_path):
                 if label in ['unlabeled', 'skip']:
                     continue
                 
-                text = data.get('text', '').strip()
+                # convert_to_line_dataset.py escribe la línea en 'line'; los JSONL revisados usan 'text'
+                text = (data.get('line') or data.get('text') or '').strip()
                 if text:
                     texts.append(text)
                     labels.append(label)
@@ -190,7 +193,7 @@ def main():
     )
     parser.add_argument(
         'dataset',
-        help='Path to labeled line dataset JSONL file'
+        help='Path to labeled line dataset JSONL file (or its .columns directory)'
     )
     parser.add_argument(
         '--output-dir',
@@ -209,4 +212,3 @@ def main():
 
 if __name__ == '__main__':
     exit(main())
->>>>>>> 210276b2453f1fc928334d884ab3dcffaf3fc69a
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+scripts/vacancy_blocks.py
+
+Divisor de bloques de vacantes en streaming. Lee el archivo de entrada con
+mmap (sin cargarlo completo en memoria) y entrega los bloques uno a uno junto
+con su offset en bytes, para que las etapas siguientes empiecen a trabajar
+sobre la primera vacante sin esperar al resto del archivo.
+
+Reglas de división (las mismas que usaban los scripts con f.read()):
+  - Si el archivo contiene '---', se divide por esa subcadena.
+  - Si no, se divide por dos o más líneas en blanco consecutivas
+    (equivalente a re.split(r'\\n\\s*\\n\\s*\\n', contenido)).
+
+Para archivos YAML multi-documento (SEPARATOR_YAML) se divide solo por los
+marcadores de inicio de documento: '---' al comienzo de una línea seguido de
+espacio o fin de línea. Un '---' dentro de un texto no divide el bloque.
+
+Los saltos de línea '\\r\\n' y '\\r' se traducen a '\\n' como en el modo texto
+de open(), y cada bloque se entrega sin espacios al inicio ni al final.
+
+Uso:
+  from vacancy_blocks import iter_blocks
+  for offset, block in iter_blocks('vacantes.txt'):
+      ...
+
+  # Desde un offset (p. ej. el inicio del último bloque ya procesado),
+  # con el fin en bytes de cada bloque
+  with open_buffer(path) as buf:
+      for start, end, block in iter_block_spans(buf, SEPARATOR_DASHES, start=offset):
+          ...
+"""
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+SEPARATOR_DASHES = 'dashes'
+SEPARATOR_BLANK_LINES = 'blank_lines'
+SEPARATOR_YAML = 'yaml_documents'
+
+DASHES = b'---'
+
+# Marcador de inicio de documento YAML: '---' al comienzo de línea
+DOCUMENT_MARKER_RE = re.compile(rb'(?<![^\r\n])---(?=[ \t\r\n]|\Z)')
+
+# Una línea con cualquier terminador universal (\r\n, \r, \n) o la última sin terminador
+LINE_RE = re.compile(rb'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+@contextmanager
+def open_buffer(path: Path):
+    """
+    Abre el archivo como buffer de solo lectura (mmap). Si el archivo está
+    vacío entrega b''; si no admite mmap (pipes, sistemas especiales) lo lee
+    completo como respaldo.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no admite archivos vacíos
+            yield b''
+            return
+        except OSError:
+            yield f.read()
+            return
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def _decode(raw: bytes, encoding: str) -> str:
+    """Decodifica y traduce saltos de línea al estilo del modo texto."""
+    text = raw.decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _leading_bytes(raw: bytes, encoding: str) -> int:
+    """Número de bytes de espacio en blanco al inicio de raw."""
+    text = raw.decode(encoding)
+    lead = len(text) - len(text.lstrip())
+    return len(text[:lead].encode(encoding)) if lead else 0
+
+
+def detect_separator(buf) -> str:
+    """Devuelve el modo de división para el contenido del buffer."""
+    return SEPARATOR_DASHES if buf.find(DASHES) != -1 else SEPARATOR_BLANK_LINES
+
+
+def _iter_dash_blocks(buf, encoding: str, start: int = 0) -> Iterator[Tuple[int, int, str]]:
+    size = len(buf)
+    while start <= size:
+        end = buf.find(DASHES, start)
+        if end == -1:
+            end = size
+        raw = buf[start:end]
+        block = _decode(raw, encoding).strip()
+        if block:
+            yield start + _leading_bytes(raw, encoding), end, block
+        start = end + len(DASHES)
+
+
+def _iter_yaml_document_blocks(buf, encoding: str, start: int = 0) -> Iterator[Tuple[int, int, str]]:
+    size = len(buf)
+    while start <= size:
+        marker = DOCUMENT_MARKER_RE.search(buf, start)
+        end = marker.start() if marker else size
+        raw = buf[start:end]
+        block = _decode(raw, encoding).strip()
+        if block:
+            yield start + _leading_bytes(raw, encoding), end, block
+        start = end + len(DASHES)
+
+
+def _iter_blank_line_blocks(buf, encoding: str, start: int = 0) -> Iterator[Tuple[int, int, str]]:
+    lines = []
+    block_offset = block_end = start
+    blank_run = 0
+    for match in LINE_RE.finditer(buf, start):
+        line = _decode(match.group(0), encoding)
+        if not line.strip():
+            blank_run += 1
+            if lines:
+                lines.append(line)
+            continue
+        if blank_run >= 2 and lines:
+            yield block_offset, block_end, ''.join(lines).strip()
+            lines = []
+        if not lines:
+            block_offset = match.start() + _leading_bytes(match.group(0), encoding)
+        blank_run = 0
+        lines.append(line)
+        block_end = match.end()
+    if lines:
+        block = ''.join(lines).strip()
+        if block:
+            yield block_offset, block_end, block
+
+
+def iter_block_spans(buf, separator: str, encoding: str = 'utf-8',
+                     start: int = 0) -> Iterator[Tuple[int, int, str]]:
+    """
+    Itera los bloques de un buffer ya abierto a partir de un offset.
+
+    Args:
+        buf: Buffer (ver open_buffer)
+        separator: SEPARATOR_DASHES, SEPARATOR_YAML o SEPARATOR_BLANK_LINES
+        encoding: Codificación del archivo
+        start: Offset en bytes donde empieza un bloque
+
+    Yields:
+        Tuplas (offset_inicio, offset_fin, texto_del_bloque); offset_fin es
+        el fin en bytes del segmento del bloque (antes del separador)
+    """
+    if separator == SEPARATOR_DASHES:
+        return _iter_dash_blocks(buf, encoding, start)
+    if separator == SEPARATOR_YAML:
+        return _iter_yaml_document_blocks(buf, encoding, start)
+    return _iter_blank_line_blocks(buf, encoding, start)
+
+
+def iter_blocks(path, separator: Optional[str] = None,
+                encoding: str = 'utf-8') -> Iterator[Tuple[int, str]]:
+    """
+    Itera los bloques de vacantes de un archivo.
+
+    Args:
+        path: Ruta del archivo de entrada
+        separator: SEPARATOR_DASHES, SEPARATOR_YAML, SEPARATOR_BLANK_LINES o
+                   None para detectarlo (entre dashes y líneas en blanco)
+        encoding: Codificación del archivo
+
+    Yields:
+        Tuplas (offset_en_bytes, texto_del_bloque)
+    """
+    with open_buffer(Path(path)) as buf:
+        mode = separator or detect_separator(buf)
+        for start, _, block in iter_block_spans(buf, mode, encoding):
+            yield start, block
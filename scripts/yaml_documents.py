@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+scripts/yaml_documents.py
+
+Carga y emisión de documentos YAML con libyaml. Usa CSafeLoader/CSafeDumper
+cuando PyYAML se compiló con libyaml y, si no, los SafeLoader/SafeDumper de
+Python puro, con la misma salida.
+
+El emisor de libyaml escapa los caracteres fuera del plano básico de Unicode
+(emojis: "\\U0001F680") aunque se pida allow_unicode; los documentos con esos
+caracteres se emiten con el emisor de Python para que los YAML sigan siendo
+legibles y no cambien respecto de versiones anteriores.
+
+Los errores de parseo de un bloque se reubican en el archivo de origen con
+LineCounter (línea del inicio del bloque a partir de su offset en bytes).
+
+Uso:
+  vacancy = load_document(block)
+  texto = dump_document(vacancy)
+
+  lines = LineCounter('vacantes.txt')
+  try:
+      load_document(block)
+  except yaml.YAMLError as e:
+      locate_error(e, 'vacantes.txt', lines.line_at(offset))   # str(e): 'in "vacantes.txt", line 57'
+"""
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+LIBYAML = SafeLoader is not yaml.SafeLoader
+
+# Opciones de emisión de los YAML de vacantes
+DUMP_OPTIONS = {'allow_unicode': True, 'default_flow_style': False, 'sort_keys': False}
+
+
+def load_document(text: str):
+    """Equivalente a yaml.safe_load(text) con libyaml si está disponible."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def dump_document(data, **options) -> str:
+    """
+    Equivalente a yaml.safe_dump(data, **DUMP_OPTIONS) con libyaml si está
+    disponible (ver la nota del módulo sobre caracteres fuera del plano básico).
+    """
+    options = {**DUMP_OPTIONS, **options}
+    text = yaml.dump(data, Dumper=SafeDumper, **options)
+    if SafeDumper is not yaml.SafeDumper and '\\U' in text:
+        text = yaml.dump(data, Dumper=yaml.SafeDumper, **options)
+    return text
+
+
+class LineCounter:
+    """
+    Número de línea de offsets en bytes de un archivo. Lee solo el tramo
+    entre el offset anterior y el pedido, así que recorrer offsets crecientes
+    cuesta una lectura del archivo en total; el archivo se abre solo al
+    consultar una línea.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Archivo de origen de los offsets
+        """
+        self.path = Path(path)
+        self._offset = 0
+        self._line = 1
+        self._after_cr = False
+
+    def line_at(self, offset: int) -> int:
+        """Línea (desde 1) del byte `offset`; acepta saltos '\\n', '\\r\\n' y '\\r'."""
+        if offset < self._offset:
+            self._offset, self._line, self._after_cr = 0, 1, False
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read(offset - self._offset)
+        if chunk:
+            breaks = chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+            if self._after_cr and chunk.startswith(b'\n'):
+                breaks -= 1
+            self._line += breaks
+            self._after_cr = chunk.endswith(b'\r')
+        self._offset += len(chunk)
+        return self._line
+
+
+def locate_error(error: yaml.YAMLError, source, first_line: int) -> Optional[int]:
+    """
+    Reubica las marcas de un error de parseo de un bloque en el archivo de
+    origen (nombre y línea), de modo que str(error) apunte a la línea real.
+
+    Args:
+        error: Error de PyYAML al cargar el bloque
+        source: Archivo de origen
+        first_line: Línea del archivo donde empieza el bloque
+
+    Returns:
+        Línea del archivo donde se detectó el error, o None si el error no tiene marcas
+    """
+    located = None
+    for attr in ('context_mark', 'problem_mark'):
+        mark = getattr(error, attr, None)
+        if mark is not None:
+            # Las marcas de libyaml son de solo lectura: se reemplazan
+            located = yaml.error.Mark(str(source), mark.index, mark.line + first_line - 1,
+                                      mark.column, None, None)
+            setattr(error, attr, located)
+    return located.line + 1 if located is not None else None
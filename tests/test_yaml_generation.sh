@@ -190,6 +190,169 @@ if [ -f "vacantes.txt" ] && [ -s "vacantes.txt" ]; then
 fi
 echo ""
 
+# Test 9: Watch mode checkpoint (block_watcher.py)
+echo -e "${YELLOW}Test 9: Testing watch mode checkpoint...${NC}"
+rm -rf /tmp/watch_test
+mkdir -p /tmp/watch_test/out
+WATCH_INPUT=/tmp/watch_test/vacantes.txt
+WATCH_CMD="python scripts/extract_vacantes_from_text.py --input $WATCH_INPUT --output /tmp/watch_test/out --watch --once --checkpoint /tmp/watch_test/checkpoint.json"
+
+# Cantidad de YAML que no estaban en la lista guardada con snapshot_yamls
+snapshot_yamls() {
+    find /tmp/watch_test/out -name "*.yaml" | sort > /tmp/watch_test/before.txt
+}
+new_yamls() {
+    find /tmp/watch_test/out -name "*.yaml" | sort | comm -13 /tmp/watch_test/before.txt - | wc -l
+}
+
+cat > $WATCH_INPUT << 'EOF'
+Cargo: Data Analyst
+Empresa: Acme Corp
+Fecha: 2025-01-10
+Requerimientos: SQL y Python avanzado
+
+---
+
+Cargo: Backend Developer
+Empresa: Globex Solutions
+Fecha: 2025-01-11
+Requerimientos: Go, Kubernetes y AWS
+EOF
+snapshot_yamls
+$WATCH_CMD > /tmp/watch_test/run1.log 2>&1
+[ $(new_yamls) -eq 2 ] && [ -f /tmp/watch_test/checkpoint.json ]
+test_result $? "First watch run extracts every posting and writes the checkpoint"
+
+cat >> $WATCH_INPUT << 'EOF'
+
+---
+
+Cargo: QA Automation Engineer
+Empresa: Initech Group
+Fecha: 2025-01-12
+Requerimientos: Selenium, Cypress y CI/CD
+EOF
+snapshot_yamls
+$WATCH_CMD > /tmp/watch_test/run2.log 2>&1
+grep -q "🆕 1 bloque(s) nuevo(s)" /tmp/watch_test/run2.log && [ $(new_yamls) -eq 1 ]
+test_result $? "Appending one posting extracts exactly one new YAML"
+
+snapshot_yamls
+$WATCH_CMD > /tmp/watch_test/run3.log 2>&1
+! grep -q "bloque(s) nuevo(s)" /tmp/watch_test/run3.log && [ $(new_yamls) -eq 0 ]
+test_result $? "Rerun without changes extracts nothing"
+
+# Truncado: el archivo queda más corto que el checkpoint
+head -n 4 $WATCH_INPUT > /tmp/watch_test/truncated.txt
+cat /tmp/watch_test/truncated.txt > $WATCH_INPUT
+$WATCH_CMD > /tmp/watch_test/run4.log 2>&1
+grep -q "🔁" /tmp/watch_test/run4.log && grep -q "🆕 1 bloque(s) nuevo(s) desde el byte 0" /tmp/watch_test/run4.log
+test_result $? "Truncating the file reprocesses it from the start"
+
+# Reescritura del mismo tamaño: cambian los bytes del último bloque procesado
+sed 's/Acme Corp/Acme Labs/' $WATCH_INPUT > /tmp/watch_test/rewritten.txt
+cat /tmp/watch_test/rewritten.txt > $WATCH_INPUT
+snapshot_yamls
+$WATCH_CMD > /tmp/watch_test/run5.log 2>&1
+grep -q "🔁" /tmp/watch_test/run5.log && grep -q "🆕 1 bloque(s) nuevo(s) desde el byte 0" /tmp/watch_test/run5.log && \
+    [ -f /tmp/watch_test/out/data_analyst_acme_labs_2025-01-10.yaml ]
+test_result $? "Rewriting the file reprocesses it completely"
+echo ""
+
+# Test 10: Output manifest (output_manifest.py): unchanged files are not rewritten
+echo -e "${YELLOW}Test 10: Testing output manifest...${NC}"
+rm -rf /tmp/manifest_test
+mkdir -p /tmp/manifest_test/out
+MANIFEST_OUT=/tmp/manifest_test/out
+MANIFEST_CMD="python scripts/extract_vacantes_from_text.py --input /tmp/manifest_test/vacantes.txt --output $MANIFEST_OUT"
+cat > /tmp/manifest_test/vacantes.txt << 'EOF'
+Cargo: Data Analyst
+Empresa: Acme Corp
+Fecha: 2025-01-10
+Requerimientos: SQL y Python avanzado
+
+---
+
+Cargo: Backend Developer
+Empresa: Globex Solutions
+Fecha: 2025-01-11
+Requerimientos: Go, Kubernetes y AWS
+
+---
+
+Cargo: QA Automation Engineer
+Empresa: Initech Group
+Fecha: 2025-01-12
+Requerimientos: Selenium, Cypress y CI/CD
+EOF
+
+# "nuevos modificados sin_cambios" del último reporte
+output_counts() {
+    python3 -c "import json; f = json.load(open('$MANIFEST_OUT/extraction_report.json'))['output_files']; print(f['new'], f['changed'], f['unchanged'])"
+}
+# Nombre y mtime (ns) de cada YAML
+yaml_mtimes() {
+    python3 -c "import pathlib; [print(p.name, p.stat().st_mtime_ns) for p in sorted(pathlib.Path('$MANIFEST_OUT').glob('*.yaml'))]"
+}
+
+$MANIFEST_CMD > /dev/null 2>&1
+[ "$(output_counts)" = "3 0 0" ] && [ -f $MANIFEST_OUT/.manifest.json ]
+test_result $? "First run writes every YAML as new and saves the manifest"
+
+yaml_mtimes > /tmp/manifest_test/mtimes_before.txt
+cp $MANIFEST_OUT/data_analyst_acme_corp_2025-01-10.yaml /tmp/manifest_test/generated.yaml
+$MANIFEST_CMD > /dev/null 2>&1
+yaml_mtimes | diff -q /tmp/manifest_test/mtimes_before.txt - > /dev/null && [ "$(output_counts)" = "0 0 3" ]
+test_result $? "Second run rewrites nothing (mtimes kept, 0 new / 0 changed)"
+
+# Edición a mano del mismo tamaño: el mtime deja de coincidir con el
+# manifiesto, se compara con el disco y el archivo se regenera desde la entrada
+sed 's/Acme Corp/Acme Labs/' /tmp/manifest_test/generated.yaml > $MANIFEST_OUT/data_analyst_acme_corp_2025-01-10.yaml
+$MANIFEST_CMD > /dev/null 2>&1
+[ "$(output_counts)" = "0 1 2" ] && \
+    cmp -s /tmp/manifest_test/generated.yaml $MANIFEST_OUT/data_analyst_acme_corp_2025-01-10.yaml && \
+    [ "$(yaml_mtimes | grep -v data_analyst)" = "$(grep -v data_analyst /tmp/manifest_test/mtimes_before.txt)" ]
+test_result $? "Hand-edited YAML is detected as changed and regenerated; others untouched"
+
+# El manifiesto es solo una aceleración: sin él el resultado es el mismo
+yaml_mtimes > /tmp/manifest_test/mtimes_before.txt
+rm $MANIFEST_OUT/.manifest.json
+$MANIFEST_CMD > /dev/null 2>&1
+yaml_mtimes | diff -q /tmp/manifest_test/mtimes_before.txt - > /dev/null && [ "$(output_counts)" = "0 0 3" ]
+test_result $? "Without the manifest unchanged files are still not rewritten"
+echo ""
+
+# Test 11: Columnar line dataset (line_columns.py) gives the same candidates as the JSONL
+echo -e "${YELLOW}Test 11: Testing columnar line dataset parity...${NC}"
+if python3 -c "import numpy" 2> /dev/null; then
+    rm -rf /tmp/columns_test
+    mkdir -p /tmp/columns_test
+    # Incluye una línea fusionada con índices null y otra sin label ni source_index
+    cat > /tmp/columns_test/line_dataset.jsonl << 'EOF'
+{"line": "Acme Corp", "line_norm": "acme corp", "label": "company", "source_hash": "h1", "source_index": 3, "line_index": 0}
+{"line": "Globex Corp", "line_norm": "globex corp", "label": "other", "source_hash": "h2", "source_index": null, "line_index": null}
+{"line": "Initech Corp", "line_norm": "initech corp", "source_hash": "h3", "line_index": 2}
+{"line": "Umbrella Corp", "line_norm": "umbrella corp", "label": "company", "source_hash": "h4", "source_index": 0, "line_index": 1}
+EOF
+    python scripts/extract_company_candidates.py -i /tmp/columns_test/line_dataset.jsonl -o /tmp/columns_test/jsonl.csv > /dev/null 2>&1
+    python scripts/check_counts.py -i /tmp/columns_test/line_dataset.jsonl -s 0 > /tmp/columns_test/jsonl_counts.txt 2>&1
+    python scripts/line_columns.py /tmp/columns_test/line_dataset.jsonl > /dev/null 2>&1
+    [ -f /tmp/columns_test/line_dataset.columns/columns.json ]
+    test_result $? "Columns are built next to the JSONL"
+
+    python scripts/extract_company_candidates.py -i /tmp/columns_test/line_dataset.jsonl -o /tmp/columns_test/columns.csv > /dev/null 2>&1
+    cmp -s /tmp/columns_test/jsonl.csv /tmp/columns_test/columns.csv && \
+        grep -q "^Globex Corp,other,h2,,," /tmp/columns_test/columns.csv
+    test_result $? "Candidates from columns match the JSONL (missing label and null indexes included)"
+
+    python scripts/check_counts.py -i /tmp/columns_test/line_dataset.jsonl -s 0 > /tmp/columns_test/columns_counts.txt 2>&1
+    diff -q /tmp/columns_test/jsonl_counts.txt /tmp/columns_test/columns_counts.txt > /dev/null
+    test_result $? "Label counts from columns match the JSONL"
+else
+    echo -e "${YELLOW}⚠️  SKIP: numpy not installed${NC}"
+fi
+echo ""
+
 # Summary
 echo "=== Test Summary ==="
 echo -e "Tests passed: ${GREEN}$TESTS_PASSED${NC}"